@@ -13,21 +13,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
+import sys
 from .version import __version__
 
-from . import log
-from . import collection_managers
-from . import generators
-from . import simulation
-from . import parsers
-from . import task_manager
-from . import transformations
-from . import utils
-from . import visualization
-from .path import Path
+# Submodules are only imported when first accessed, so that importing
+# a single submodule, e.g. `pcg_gazebo.parsers.sdf`, does not load all
+# the others and their dependencies
+_SUBMODULES = [
+    'collection_managers',
+    'log',
+    'generators',
+    'simulation',
+    'parsers',
+    'task_manager',
+    'transformations',
+    'utils',
+    'visualization']
+
+_ATTRIBUTES = dict(Path='path')
 
 __all__ = [
-    __version__,
+    '__version__',
     'collection_managers',
     'log',
     'generators',
@@ -38,3 +45,27 @@ __all__ = [
     'utils',
     'visualization',
     'Path']
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module('.' + name, __name__)
+    if name in _ATTRIBUTES:
+        module = importlib.import_module(
+            '.' + _ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        'module {} has no attribute {}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    # Module attributes cannot be resolved lazily before Python 3.7
+    for _name in _SUBMODULES:
+        importlib.import_module('.' + _name, __name__)
+    from .path import Path  # noqa: F401
@@ -98,4 +98,4 @@ class _CollectionManager(object):
 
         * `tag` (*type:* `str`): Tag of the element.
         """
-        return tag in self.tags
+        return tag in self._collection
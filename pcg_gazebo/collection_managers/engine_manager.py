@@ -16,14 +16,13 @@ from ..utils import load_yaml
 from ._collection_manager import _CollectionManager
 from .constraints_manager import ConstraintsManager
 from .assets_manager import AssetsManager
-from ..generators.engines import create_engine, Engine
-from ..generators import CollisionChecker
 from ..log import PCG_ROOT_LOGGER
 from ..utils import generate_random_string
 
 
 class EngineManager(_CollectionManager):
     def __init__(self):
+        from ..generators import CollisionChecker
         super(EngineManager, self).__init__()
         print("line 101.")
 
@@ -58,6 +57,8 @@ class EngineManager(_CollectionManager):
         * `kwargs` (*type:* `dict`): Input arguments to the
         created engine.
         """
+        from ..generators import CollisionChecker
+        from ..generators.engines import create_engine, Engine
         if self.has_element(tag):
             PCG_ROOT_LOGGER.warning(
                 'Engine with tag <{}> already exists'.format(tag))
@@ -13,17 +13,49 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import hashlib
+import weakref
 import numpy as np
+from collections import OrderedDict
 from ._collection_manager import _CollectionManager
 from ..path import Path
 from ..log import PCG_ROOT_LOGGER
 from ..utils import is_array, is_scalar
 import trimesh
 
+_MESH_CACHE_VERSION = 1
+
 
 class MeshManager(_CollectionManager):
+    """Collection of the meshes used by the simulation entities.
+    The meshes loaded from files are kept in a least recently used store
+    limited by `memory_budget` and reloaded when needed, from a binary
+    cache of their vertices and faces in `cache_dir` if `use_disk_cache`
+    is enabled. Evicted meshes that are still referenced elsewhere are
+    reused instead of being loaded again.
+    """
+    _PRIMITIVES = ['box', 'cylinder', 'capsule', 'sphere']
+
     def __init__(self):
         super(MeshManager, self).__init__()
+        # Tags of the meshes indexed by filename, both as provided and
+        # as the resolved absolute path
+        self._filename_index = dict()
+        # Tags of the primitives indexed by their parameters key
+        self._parameters_index = dict()
+        # Index keys of each tag, used to clean up the indexes
+        self._index_keys = dict()
+        # Primitive meshes by parameters key, only copies are returned
+        self._primitive_meshes = dict()
+        self._tag_counter = 0
+        # Meshes loaded from files, in least recently used order
+        self._mesh_store = OrderedDict()
+        # Weak references to the evicted meshes, indexed by tag
+        self._evicted_meshes = weakref.WeakValueDictionary()
+        self._memory_usage = 0
+        self._memory_budget = 512 * 1024 ** 2
+        self._use_disk_cache = True
+        self._cache_dir = None
 
     @staticmethod
     def get_instance():
@@ -31,129 +63,358 @@ class MeshManager(_CollectionManager):
             MeshManager._INSTANCE = MeshManager()
         return MeshManager._INSTANCE
 
+    @staticmethod
+    def get_parameters_key(**kwargs):
+        """Return a hashable key of the parameters of a primitive mesh.
+        Scalars and arrays are converted to floats, so that equal
+        parameters given as integers, floats, lists or `numpy` arrays
+        have the same key.
+
+        > *Returns*
+
+        `tuple`: Sorted pairs of parameter name and value.
+        """
+        key = list()
+        for name in sorted(kwargs.keys()):
+            value = kwargs[name]
+            if is_scalar(value) and not isinstance(value, bool):
+                value = float(value)
+            elif is_array(value):
+                value = tuple(
+                    float(x) if is_scalar(x) else x for x in value)
+            try:
+                hash(value)
+            except TypeError:
+                value = repr(value)
+            key.append((name, value))
+        return tuple(key)
+
+    @property
+    def memory_budget(self):
+        """`int`: Maximum number of bytes of vertex and face arrays of
+        the meshes loaded from files kept in memory, `None` for no limit.
+        """
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, value):
+        assert value is None or (is_scalar(value) and value >= 0), \
+            'Memory budget must be None or a non-negative number of ' \
+            'bytes, value={}'.format(value)
+        self._memory_budget = value
+        self._evict_meshes()
+
+    @property
+    def memory_usage(self):
+        """`int`: Number of bytes of vertex and face arrays of the meshes
+        loaded from files currently kept in memory.
+        """
+        return self._memory_usage
+
+    @property
+    def use_disk_cache(self):
+        """`bool`: Store and load the meshes loaded from files in the
+        binary cache in `cache_dir`.
+        """
+        return self._use_disk_cache
+
+    @use_disk_cache.setter
+    def use_disk_cache(self, value):
+        assert isinstance(value, bool), 'Input must be a boolean'
+        self._use_disk_cache = value
+
+    @property
+    def cache_dir(self):
+        """`str`: Folder of the binary mesh cache, by default
+        `cache/meshes` in the resources root folder (`~/.pcg`).
+        """
+        if self._cache_dir is None:
+            from ..utils import PCG_RESOURCES_ROOT_DIR
+            return os.path.join(PCG_RESOURCES_ROOT_DIR, 'cache', 'meshes')
+        return self._cache_dir
+
+    @cache_dir.setter
+    def cache_dir(self, value):
+        self._cache_dir = value
+
+    def clear_disk_cache(self):
+        """Remove all files from the binary mesh cache."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith('.npz'):
+                os.remove(os.path.join(self.cache_dir, filename))
+
+    @staticmethod
+    def _get_mesh_nbytes(mesh):
+        if isinstance(mesh, trimesh.Scene):
+            return sum(
+                MeshManager._get_mesh_nbytes(geo)
+                for geo in mesh.geometry.values())
+        elif isinstance(mesh, trimesh.Trimesh):
+            return mesh.vertices.nbytes + mesh.faces.nbytes
+        return 0
+
+    def _get_cache_filename(self, filename):
+        hasher = hashlib.sha1(str(_MESH_CACHE_VERSION).encode('utf-8'))
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(block)
+        return os.path.join(
+            self.cache_dir, '{}.npz'.format(hasher.hexdigest()))
+
+    @staticmethod
+    def _read_cache_file(cache_filename):
+        with np.load(cache_filename) as data:
+            meshes = [
+                trimesh.Trimesh(
+                    vertices=data['vertices_{}'.format(i)],
+                    faces=data['faces_{}'.format(i)],
+                    process=False)
+                for i in range(int(data['n_meshes']))]
+            is_scene = bool(data['is_scene'])
+        if is_scene:
+            return trimesh.Scene(meshes)
+        return meshes[0]
+
+    @staticmethod
+    def _write_cache_file(cache_filename, meshes, is_scene):
+        if not all(isinstance(mesh, trimesh.Trimesh) for mesh in meshes):
+            return
+        arrays = dict(n_meshes=len(meshes), is_scene=is_scene)
+        for i, mesh in enumerate(meshes):
+            arrays['vertices_{}'.format(i)] = mesh.vertices
+            arrays['faces_{}'.format(i)] = mesh.faces
+        # Write to a temporary file first so that concurrent processes
+        # never read a partial cache file
+        tmp_filename = '{}.{}.tmp'.format(cache_filename, os.getpid())
+        try:
+            if not os.path.isdir(os.path.dirname(cache_filename)):
+                os.makedirs(os.path.dirname(cache_filename))
+            with open(tmp_filename, 'wb') as f:
+                np.savez(f, **arrays)
+            os.rename(tmp_filename, cache_filename)
+        except (IOError, OSError) as ex:
+            PCG_ROOT_LOGGER.warning(
+                'Could not store mesh cache file {}, message={}'.format(
+                    cache_filename, ex))
+            if os.path.isfile(tmp_filename):
+                os.remove(tmp_filename)
+
+    def _load_mesh(self, filename):
+        cache_filename = None
+        if self._use_disk_cache:
+            cache_filename = self._get_cache_filename(filename)
+            if os.path.isfile(cache_filename):
+                try:
+                    return self._read_cache_file(cache_filename)
+                except Exception as ex:
+                    PCG_ROOT_LOGGER.warning(
+                        'Invalid mesh cache file {}, reloading {}, '
+                        'message={}'.format(cache_filename, filename, ex))
+
+        mesh = trimesh.load_mesh(filename)
+        is_scene = isinstance(mesh, trimesh.Scene)
+        if is_scene:
+            meshes = list(mesh.dump())
+            PCG_ROOT_LOGGER.info('# meshes={}, filename={}'.format(
+                len(meshes), filename))
+            if len(meshes) == 1:
+                mesh = meshes[0]
+                is_scene = False
+        else:
+            meshes = [mesh]
+
+        if cache_filename is not None:
+            self._write_cache_file(cache_filename, meshes, is_scene)
+        return mesh
+
+    def _evict_meshes(self):
+        if self._memory_budget is None:
+            return
+        # The most recently used mesh is always kept
+        while self._memory_usage > self._memory_budget and \
+                len(self._mesh_store) > 1:
+            tag, (mesh, nbytes) = self._mesh_store.popitem(last=False)
+            self._evicted_meshes[tag] = mesh
+            self._memory_usage -= nbytes
+
+    def _get_file_mesh(self, tag):
+        if tag in self._mesh_store:
+            self._mesh_store.move_to_end(tag)
+            return self._mesh_store[tag][0]
+        mesh = self._evicted_meshes.pop(tag, None)
+        if mesh is None:
+            mesh = self._load_mesh(
+                self._collection[tag]['filename'].absolute_uri)
+        nbytes = self._get_mesh_nbytes(mesh)
+        self._mesh_store[tag] = (mesh, nbytes)
+        self._memory_usage += nbytes
+        self._evict_meshes()
+        return mesh
+
     def get_unique_tag(self, length=5):
-        i = 0
-        label = 'mesh_{}'.format(i)
+        label = 'mesh_{}'.format(self._tag_counter)
         while self.has_element(label):
-            i += 1
-            label = 'mesh_{}'.format(i)
+            self._tag_counter += 1
+            label = 'mesh_{}'.format(self._tag_counter)
+        self._tag_counter += 1
         return label
 
+    def reset(self):
+        super(MeshManager, self).reset()
+        self._filename_index.clear()
+        self._parameters_index.clear()
+        self._index_keys.clear()
+        self._primitive_meshes.clear()
+        self._mesh_store.clear()
+        self._evicted_meshes.clear()
+        self._memory_usage = 0
+        self._tag_counter = 0
+
+    def remove(self, tag):
+        if not super(MeshManager, self).remove(tag):
+            return False
+        if tag in self._mesh_store:
+            self._memory_usage -= self._mesh_store.pop(tag)[1]
+        self._evicted_meshes.pop(tag, None)
+        filenames, parameters_key = self._index_keys.pop(
+            tag, (list(), None))
+        for filename in filenames:
+            if self._filename_index.get(filename) == tag:
+                del self._filename_index[filename]
+        if self._parameters_index.get(parameters_key) == tag:
+            del self._parameters_index[parameters_key]
+        return True
+
     def add(self, tag=None, **kwargs):
-        if tag is None:
-            tag = self.get_unique_tag()
-        if self.has_element(tag):
+        if tag is not None and self.has_element(tag):
             return None
-        self._collection[tag] = dict(filename=None)
+        filenames = list()
+        parameters_key = None
         if 'filename' in kwargs:
             assert os.path.isfile(kwargs['filename']), \
                 'Invalid mesh filename, value={}'.format(kwargs['filename'])
             cur_tag = self.find_by_filename(kwargs['filename'])
             if cur_tag is not None:
                 return cur_tag
-            self._collection[tag]['filename'] = Path(kwargs['filename'])
-            self._collection[tag]['mesh'] = trimesh.load_mesh(
-                kwargs['filename'])
-            if isinstance(self._collection[tag]['mesh'], trimesh.Scene):
-                meshes = list(self._collection[tag]['mesh'].dump())
-                PCG_ROOT_LOGGER.info('# meshes={}, filename={}'.format(
-                    len(meshes), self._collection[tag]['filename']))
-                if len(meshes) == 1:
-                    self._collection[tag]['mesh'] = meshes[0]
+            # The mesh is loaded into the mesh store when requested
+            element = dict(filename=Path(kwargs['filename']))
+            filenames = [kwargs['filename'], element['filename'].absolute_uri]
         elif 'mesh' in kwargs:
-            self._collection[tag]['mesh'] = kwargs['mesh']
-            if isinstance(self._collection[tag]['mesh'], trimesh.Scene):
-                meshes = list(self._collection[tag]['mesh'].dump())
+            element = dict(filename=None, mesh=kwargs['mesh'])
+            if isinstance(element['mesh'], trimesh.Scene):
+                meshes = list(element['mesh'].dump())
                 PCG_ROOT_LOGGER.info('# meshes={}'.format(
                     len(meshes)))
                 if len(meshes) == 1:
-                    self._collection[tag]['mesh'] = meshes[0]
+                    element['mesh'] = meshes[0]
         elif 'type' in kwargs:
             mesh_tag = self.find_by_parameters(**kwargs)
             if mesh_tag is not None:
-                print(
-                    'find_by_parameters=', mesh_tag, kwargs,
-                    self._collection[mesh_tag])
-                tag = mesh_tag
-                return tag
-            if kwargs['type'] not in ['box', 'cylinder', 'capsule', 'sphere']:
+                return mesh_tag
+            if kwargs['type'] not in self._PRIMITIVES:
                 return None
-            else:
-                if kwargs['type'] == 'box' and 'size' in kwargs:
-                    assert is_array(kwargs['size']), \
-                        'Size is not an array'
-                    vec = list(kwargs['size'])
-                    assert len(vec) == 3, \
-                        'Input size array must have 3 elements'
-                    for elem in vec:
-                        assert is_scalar(elem), \
-                            'Vector element must be a scalar'
-                        assert elem > 0, \
-                            'Size vector components must be greater than zero'
-                elif kwargs['type'] == 'cylinder' and \
-                        'radius' in kwargs and \
-                        'height' in kwargs:
-                    assert is_scalar(kwargs['radius']), \
-                        'Radius must be a scalar'
-                    assert kwargs['radius'] > 0, \
-                        'Cylinder radius must be greater than zero'
-                    assert is_scalar(kwargs['height']), \
-                        'Height must be a scalar'
-                    assert kwargs['height'] > 0, \
-                        'Cylinder height must be greater than zero'
-                elif kwargs['type'] == 'capsule' and \
-                        'radius' in kwargs and \
-                        'height' in kwargs:
-                    assert is_scalar(kwargs['radius']), \
-                        'Radius must be a scalar'
-                    assert kwargs['radius'] > 0, \
-                        'Capsule radius must be greater than zero'
-                    assert is_scalar(kwargs['height']), \
-                        'Height must be a scalar'
-                    assert kwargs['height'] > 0, \
-                        'Capsule height must be greater than zero'
-                elif kwargs['type'] == 'sphere' and \
-                        'radius' in kwargs:
-                    assert is_scalar(kwargs['radius']), \
-                        'Radius must be a scalar'
-                    assert kwargs['radius'] > 0, \
-                        'Sphere radius must be greater than zero'
-                self._collection[tag].update(kwargs)
+            if kwargs['type'] == 'box' and 'size' in kwargs:
+                assert is_array(kwargs['size']), \
+                    'Size is not an array'
+                vec = list(kwargs['size'])
+                assert len(vec) == 3, \
+                    'Input size array must have 3 elements'
+                for elem in vec:
+                    assert is_scalar(elem), \
+                        'Vector element must be a scalar'
+                    assert elem > 0, \
+                        'Size vector components must be greater than zero'
+            elif kwargs['type'] == 'cylinder' and \
+                    'radius' in kwargs and \
+                    'height' in kwargs:
+                assert is_scalar(kwargs['radius']), \
+                    'Radius must be a scalar'
+                assert kwargs['radius'] > 0, \
+                    'Cylinder radius must be greater than zero'
+                assert is_scalar(kwargs['height']), \
+                    'Height must be a scalar'
+                assert kwargs['height'] > 0, \
+                    'Cylinder height must be greater than zero'
+            elif kwargs['type'] == 'capsule' and \
+                    'radius' in kwargs and \
+                    'height' in kwargs:
+                assert is_scalar(kwargs['radius']), \
+                    'Radius must be a scalar'
+                assert kwargs['radius'] > 0, \
+                    'Capsule radius must be greater than zero'
+                assert is_scalar(kwargs['height']), \
+                    'Height must be a scalar'
+                assert kwargs['height'] > 0, \
+                    'Capsule height must be greater than zero'
+            elif kwargs['type'] == 'sphere' and \
+                    'radius' in kwargs:
+                assert is_scalar(kwargs['radius']), \
+                    'Radius must be a scalar'
+                assert kwargs['radius'] > 0, \
+                    'Sphere radius must be greater than zero'
+            element = dict(filename=None)
+            element.update(kwargs)
+            parameters_key = self.get_parameters_key(**kwargs)
         else:
-            del self._collection[tag]
             return None
+
+        if tag is None:
+            tag = self.get_unique_tag()
+        self._collection[tag] = element
+        for filename in filenames:
+            self._filename_index[filename] = tag
+        if parameters_key is not None:
+            self._parameters_index[parameters_key] = tag
+        self._index_keys[tag] = (filenames, parameters_key)
         return tag
 
+    def _get_primitive_mesh(self, **kwargs):
+        """Return a copy of the primitive mesh described by the input
+        parameters, the mesh is only generated once for each set of
+        parameters.
+        """
+        key = self.get_parameters_key(**kwargs)
+        if key not in self._primitive_meshes:
+            if kwargs['type'] == 'box':
+                mesh = trimesh.creation.box(extents=kwargs['size'])
+            elif kwargs['type'] == 'cylinder':
+                mesh = trimesh.creation.cylinder(
+                    radius=kwargs['radius'],
+                    height=kwargs['height'])
+            elif kwargs['type'] == 'capsule':
+                mesh = trimesh.creation.capsule(
+                    radius=kwargs['radius'],
+                    height=kwargs['height'])
+            elif kwargs['type'] == 'sphere':
+                mesh = trimesh.creation.icosphere(
+                    radius=kwargs['radius'])
+            else:
+                return None
+            self._primitive_meshes[key] = mesh
+        return self._primitive_meshes[key].copy()
+
     def get(self, **kwargs):
         if 'filename' in kwargs:
-            mesh_filename = Path(kwargs['filename'])
-
-            for tag in self._collection:
-                if self._collection[tag]['filename']._uri == mesh_filename:
-                    return self._collection[tag]['mesh']
+            tag = self.find_by_filename(kwargs['filename'])
+            if tag is not None:
+                return self._get_file_mesh(tag)
         elif 'tag' in kwargs:
             if not self.has_element(kwargs['tag']):
                 PCG_ROOT_LOGGER.error(
                     'No element with tag <{}> was found'.format(
                         kwargs['tag']))
                 return None
-            if 'type' in self._collection[kwargs['tag']]:
-                if self._collection[kwargs['tag']]['type'] == 'box':
-                    return trimesh.creation.box(
-                        extents=self._collection[kwargs['tag']]['size'])
-                elif self._collection[kwargs['tag']]['type'] == 'cylinder':
-                    return trimesh.creation.cylinder(
-                        radius=self._collection[kwargs['tag']]['radius'],
-                        height=self._collection[kwargs['tag']]['height'])
-                elif self._collection[kwargs['tag']]['type'] == 'capsule':
-                    return trimesh.creation.capsule(
-                        radius=self._collection[kwargs['tag']]['radius'],
-                        height=self._collection[kwargs['tag']]['height'])
-                elif self._collection[kwargs['tag']]['type'] == 'sphere':
-                    return trimesh.creation.icosphere(
-                        radius=self._collection[kwargs['tag']]['radius'])
+            element = self._collection[kwargs['tag']]
+            if 'type' in element:
+                return self._get_primitive_mesh(
+                    **{key: element[key] for key in element
+                       if key != 'filename'})
+            elif element['filename'] is not None:
+                return self._get_file_mesh(kwargs['tag'])
             else:
-                return self._collection[kwargs['tag']]['mesh']
+                return element['mesh']
         elif 'type' in kwargs:
             if kwargs['type'] == 'box':
                 assert 'size' in kwargs, \
@@ -168,8 +429,7 @@ class MeshManager(_CollectionManager):
                         'Vector element must be a scalar'
                     assert elem > 0, \
                         'Size vector components must be greater than zero'
-                return trimesh.creation.box(
-                    extents=kwargs['size'])
+                return self._get_primitive_mesh(**kwargs)
             elif kwargs['type'] == 'cylinder':
                 assert 'radius' in kwargs and 'height' in kwargs, \
                     'Radius and height not provided'
@@ -181,9 +441,7 @@ class MeshManager(_CollectionManager):
                     'Height must be a scalar'
                 assert kwargs['height'] > 0, \
                     'Cylinder height must be greater than zero'
-                return trimesh.creation.cylinder(
-                    radius=kwargs['radius'],
-                    height=kwargs['height'])
+                return self._get_primitive_mesh(**kwargs)
             elif kwargs['type'] == 'capsule':
                 assert 'radius' in kwargs and 'height' in kwargs, \
                     'Radius and height not provided'
@@ -195,59 +453,30 @@ class MeshManager(_CollectionManager):
                     'Height must be a scalar'
                 assert kwargs['height'] > 0, \
                     'Capsule height must be greater than zero'
-                return trimesh.creation.capsule(
-                    radius=kwargs['radius'],
-                    height=kwargs['height'])
+                return self._get_primitive_mesh(**kwargs)
             elif kwargs['type'] == 'sphere':
                 assert 'radius' in kwargs, 'No radius provided'
                 assert is_scalar(kwargs['radius']), \
                     'Radius must be a scalar'
                 assert kwargs['radius'] > 0, \
                     'Sphere radius must be greater than zero'
-                return trimesh.creation.icosphere(
-                    radius=kwargs['radius'])
+                return self._get_primitive_mesh(**kwargs)
 
         return None
 
     def find_by_filename(self, filename):
+        if filename in self._filename_index:
+            return self._filename_index[filename]
         mesh_filename = Path(filename)
-        if mesh_filename is None:
+        if mesh_filename.absolute_uri is None:
             return None
-        for tag in self._collection:
-            if self._collection[tag]['filename'] is not None:
-                if self._collection[tag]['filename'] == mesh_filename:
-                    return tag
-        return None
+        return self._filename_index.get(mesh_filename.absolute_uri, None)
 
     def find_by_parameters(self, **kwargs):
+        """Return the tag of the primitive mesh with the same parameters
+        as the input, see `get_parameters_key`.
+        """
         if 'type' not in kwargs:
             return None
-        for tag in self._collection:
-            found_mesh = False
-            for param_tag in kwargs:
-                if param_tag not in self._collection[tag]:
-                    found_mesh = False
-                    break
-                if (is_array(self._collection[tag][param_tag]) and
-                    not is_array(kwargs[param_tag])) or \
-                        (not is_array(self._collection[tag][param_tag]) and
-                         is_array(kwargs[param_tag])):
-                    found_mesh = False
-                    break
-                if is_array(self._collection[tag][param_tag]) and \
-                        is_array(kwargs[param_tag]):
-                    if len(self._collection[tag][param_tag]) != \
-                            len(kwargs[param_tag]):
-                        found_mesh = False
-                        break
-                    if np.sum(np.array(self._collection[tag][param_tag]) -
-                              np.array(kwargs[param_tag])) != 0:
-                        found_mesh = False
-                        break
-                elif self._collection[tag][param_tag] != kwargs[param_tag]:
-                    found_mesh = False
-                    break
-                found_mesh = True
-            if found_mesh:
-                return tag
-        return None
+        return self._parameters_index.get(
+            self.get_parameters_key(**kwargs), None)
@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from ._collection_manager import _CollectionManager
-from ..generators.rules import create_rule, Rule
 from ..utils import load_yaml, generate_random_string
 from ..log import PCG_ROOT_LOGGER
 
@@ -39,6 +38,7 @@ class RulesManager(_CollectionManager):
         * `kwargs` (*type:* `dict`): Input arguments for the rule class
         to be created
         """
+        from ..generators.rules import create_rule, Rule
         new_role = create_rule(type, **kwargs)
         if name is None:
             name = generate_random_string(5)
@@ -15,7 +15,6 @@
 import os
 import numpy as np
 from tabulate import tabulate
-from skimage.io import imread, imsave
 from ...log import PCG_ROOT_LOGGER
 from ...utils import is_string, is_array, is_integer, \
     PCG_RESOURCES_ROOT_DIR
@@ -116,6 +115,7 @@ class Biome(object):
         return image
 
     def _load_image(self, image):
+        from skimage.io import imread
         if is_string(image):
             image_path = Path(image)
             assert image_path.absolute_uri is not None, \
@@ -129,6 +129,7 @@ class Biome(object):
 
     def save_image(self, folder=None, moisture_zone=0,
                    elevation_zone=0):
+        from skimage.io import imsave
         if folder is None:
             output_folder = os.path.join(
                 PCG_RESOURCES_ROOT_DIR,
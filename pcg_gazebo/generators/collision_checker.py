@@ -12,9 +12,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import fcl
+import numpy as np
 import trimesh
+from rtree import index
 from ..log import PCG_ROOT_LOGGER
-from ..visualization import create_scene
+from ..simulation.properties import Pose
 
 
 class CollisionChecker(object):
@@ -22,6 +25,18 @@ class CollisionChecker(object):
     added to the collision check scene and used to check any
     other object for collisions.
 
+    The collision meshes of each model are computed and inserted
+    in a persistent broad-phase collision manager once, when the
+    model is added to the scene, so the cost of each collision check
+    does not depend on rebuilding the scene. The meshes reflect the
+    pose of the model at the moment it was added. The meshes are kept
+    in their local frames with their transforms, no vertex arrays are
+    copied to place them in the scene or to test a model.
+
+    The world-space bounding boxes of the scene meshes are stored in
+    an R-tree, so only the scene meshes whose bounds overlap the tested
+    mesh are checked for containment.
+
     > *Input arguments*
 
     * `ignore_ground_plane` (*type:* `bool`, *value:* `True`):
@@ -29,9 +44,28 @@ class CollisionChecker(object):
     collision checks.
     """
 
+    _MAX_CACHED_FCL_GEOMETRIES = 1000
+
     def __init__(self, ignore_ground_plane=True):
         self._fixed_models = list()
         self._scene_models = list()
+        # Collision objects in the manager per scene model, stored as
+        # a list of dictionaries with the model, its collision meshes,
+        # the names of the objects in the manager and the fixed flag
+        self._scene_entries = list()
+        self._collision_manager = trimesh.collision.CollisionManager()
+        # FCL manager with the same objects as the collision manager,
+        # used for the batched queries where only the transform of
+        # the tested objects is updated
+        self._fcl_manager = fcl.DynamicAABBTreeCollisionManager()
+        self._fcl_objects = dict()
+        self._object_counter = 0
+        self._spatial_index = self._create_spatial_index()
+        # Cached bounds and watertight flag of each scene mesh, indexed
+        # by the ID of the mesh in the spatial index
+        self._scene_meshes = dict()
+        # FCL geometries of the tested meshes, indexed by the mesh's ID
+        self._fcl_geometries = dict()
         self._simulation_scenario = trimesh.scene.Scene()
         self._ignore_ground_plane = ignore_ground_plane
         PCG_ROOT_LOGGER.info('Collision checker created')
@@ -53,33 +87,143 @@ class CollisionChecker(object):
     def n_meshes(self):
         return len(self._scene_models)
 
+    @property
+    def n_collision_objects(self):
+        """`int`: Number of collision objects in the collision manager"""
+        return sum([len(entry['names']) for entry in self._scene_entries])
+
+    def _is_ignored(self, model):
+        return (model.is_ground_plane or model.name == 'ground_plane') and \
+            self._ignore_ground_plane
+
+    @staticmethod
+    def _get_transformed_bounds(mesh, transform):
+        points = trimesh.transformations.transform_points(
+            trimesh.bounds.corners(mesh.bounds), transform)
+        return np.concatenate((points.min(axis=0), points.max(axis=0)))
+
+    @staticmethod
+    def _create_spatial_index():
+        properties = index.Property()
+        properties.dimension = 3
+        return index.Index(properties=properties)
+
+    def _find_entry(self, model):
+        for entry in self._scene_entries:
+            if entry['model'] is model:
+                return entry
+        return None
+
+    def _insert_model(self, model, is_fixed=False):
+        mesh_transforms = model.get_mesh_transforms(mesh_type='collision')
+        names = list()
+        mesh_ids = list()
+        for mesh, transform in mesh_transforms:
+            mesh_id = self._object_counter
+            name = 'object_{}'.format(mesh_id)
+            self._object_counter += 1
+            self._collision_manager.add_object(name, mesh, transform)
+            self._fcl_objects[name] = fcl.CollisionObject(
+                self._get_fcl_geometry(mesh),
+                fcl.Transform(transform[0:3, 0:3], transform[0:3, 3]))
+            self._fcl_manager.registerObject(self._fcl_objects[name])
+            names.append(name)
+
+            bounds = self._get_transformed_bounds(mesh, transform)
+            self._spatial_index.insert(mesh_id, bounds)
+            self._scene_meshes[mesh_id] = dict(
+                mesh=mesh,
+                transform=transform,
+                inv_transform=np.linalg.inv(transform),
+                vertex=trimesh.transformations.transform_points(
+                    mesh.vertices[0:1], transform),
+                bounds=bounds,
+                is_watertight=mesh.is_watertight)
+            mesh_ids.append(mesh_id)
+
+        self._fcl_manager.setup()
+        self._scene_models.append(model)
+        self._scene_entries.append(
+            dict(model=model, names=names, mesh_ids=mesh_ids,
+                 fixed=is_fixed))
+
+    def _remove_entry(self, entry):
+        for name in entry['names']:
+            self._collision_manager.remove_object(name)
+            self._fcl_manager.unregisterObject(self._fcl_objects.pop(name))
+        for mesh_id in entry['mesh_ids']:
+            self._spatial_index.delete(
+                mesh_id, self._scene_meshes[mesh_id]['bounds'])
+            del self._scene_meshes[mesh_id]
+        # Compare by identity, model equality is a structural comparison
+        self._scene_entries = [
+            e for e in self._scene_entries if e is not entry]
+        self._scene_models = [e['model'] for e in self._scene_entries]
+
+    def _reset_scene(self):
+        self._simulation_scenario = trimesh.scene.Scene()
+        self._scene_models = list()
+        self._scene_entries = list()
+        self._collision_manager = trimesh.collision.CollisionManager()
+        self._fcl_manager = fcl.DynamicAABBTreeCollisionManager()
+        self._fcl_objects = dict()
+        self._spatial_index = self._create_spatial_index()
+        self._scene_meshes = dict()
+
+    def get_scene_meshes_in_bounds(self, bounds):
+        """Return the scene meshes whose axis-aligned bounding boxes
+        overlap the input bounds.
+
+        > *Input arguments*
+
+        * `bounds` (*type:* `numpy.ndarray`): Bounds as
+        `[[x_min, y_min, z_min], [x_max, y_max, z_max]]`
+
+        > *Returns*
+
+        List of `(trimesh.Trimesh, numpy.ndarray)` tuples with the
+        mesh in its local frame and its 4x4 homogeneous transform.
+        """
+        return [(self._scene_meshes[i]['mesh'],
+                 self._scene_meshes[i]['transform']) for i in
+                self._spatial_index.intersection(
+                    np.array(bounds).flatten())]
+
     def get_scenario(self):
+        from ..visualization import create_scene
         self._simulation_scenario = create_scene(self._scene_models)
         return self._simulation_scenario
 
     def get_collision_manager(self):
-        manager, obj = trimesh.collision.scene_to_collision(
-            self.get_scenario())
-        return manager
+        """Return the collision manager with the meshes of all
+        models in the current scene.
+
+        > *Returns*
+
+        `trimesh.collision.CollisionManager`
+        """
+        return self._collision_manager
 
     def reset_all(self):
-        self._simulation_scenario = trimesh.scene.Scene()
-        self._scene_models = list()
+        self._reset_scene()
         self._fixed_models = list()
 
     def reset_scenario(self):
         """Remove all meshes from collision check scene."""
-        self._simulation_scenario = trimesh.scene.Scene()
-        self._scene_models = list()
+        self._reset_scene()
         PCG_ROOT_LOGGER.info('Collision checker scenario is now empty')
 
     def reset_to_fixed_model_scenario(self):
         """Remove all meshes that were not generated by a fixed-pose engine."""
-        self.reset_scenario()
-        self._simulation_scenario = create_scene(self._fixed_models)
+        self._simulation_scenario = trimesh.scene.Scene()
+        for entry in [e for e in self._scene_entries if not e['fixed']]:
+            self._remove_entry(entry)
 
+        # Fixed models removed by a previous scenario reset
+        # must be inserted again
         for item in self._fixed_models:
-            self._scene_models.append(item)
+            if self._find_entry(item) is None:
+                self._insert_model(item, is_fixed=True)
         PCG_ROOT_LOGGER.info(
             'Collision checker scenario restarted with all'
             ' fixed-models={}'.format(
@@ -93,15 +237,19 @@ class CollisionChecker(object):
         * `model` (*type:* `pcg_gazebo.simulation.SimulationModel`):
         Simulation model structure
         """
-        if (model.is_ground_plane or model.name == 'ground_plane') and \
-                self._ignore_ground_plane:
+        if self._is_ignored(model):
             PCG_ROOT_LOGGER.info(
                 'Model <{}> is a ground plane,'
                 ' ignoring it for collision checking'.format(model.name))
             return
 
         self._fixed_models.append(model)
-        self.add_model(model)
+        entry = self._find_entry(model)
+        if entry is not None:
+            # Model already in the scene, only flag it as fixed
+            entry['fixed'] = True
+        else:
+            self._insert_model(model, is_fixed=True)
 
     def add_model(self, model):
         """Add model to collision checking scene.
@@ -111,24 +259,138 @@ class CollisionChecker(object):
         * `model` (*type:* `pcg_gazebo.simulation.SimulationModel`):
         Simulation model structure
         """
-        if (model.is_ground_plane or model.name == 'ground_plane') and \
-                self._ignore_ground_plane:
+        if self._is_ignored(model):
             return
-        self._scene_models.append(model)
+        self._insert_model(model)
 
     def show(self):
         """Display the current collision check scenario using `pyglet`."""
-        if not self._simulation_scenario.is_empty:
+        if len(self._scene_models) > 0:
             from trimesh.viewer.notebook import in_notebook
             if not in_notebook():
                 self.get_scenario().show()
             else:
                 from trimesh.viewer import SceneViewer
-                return SceneViewer(self._simulation_scenario)
-            self.get_scenario().show()
+                return SceneViewer(self.get_scenario())
         else:
             PCG_ROOT_LOGGER.warning('Collision scene is empty')
 
+    def _get_fcl_geometry(self, mesh):
+        # The local meshes are shared by the model instances, so the
+        # geometries can be reused across checks
+        if id(mesh) in self._fcl_geometries:
+            cached_mesh, geometry = self._fcl_geometries[id(mesh)]
+            if cached_mesh is mesh:
+                return geometry
+        if len(self._fcl_geometries) >= self._MAX_CACHED_FCL_GEOMETRIES:
+            self._fcl_geometries = dict()
+        if mesh.is_convex and hasattr(trimesh.collision, 'mesh_to_convex'):
+            geometry = trimesh.collision.mesh_to_convex(mesh)
+        else:
+            geometry = trimesh.collision.mesh_to_BVH(mesh)
+        self._fcl_geometries[id(mesh)] = (mesh, geometry)
+        return geometry
+
+    @staticmethod
+    def _get_pose_transform(pose):
+        if isinstance(pose, Pose):
+            transform = pose.rotation_matrix
+            transform[0:3, 3] = pose.position
+            return transform
+        transform = np.array(pose, dtype=float)
+        if transform.shape != (4, 4):
+            msg = 'Pose must be a Pose object or a 4x4 homogeneous' \
+                ' transform, provided={}'.format(pose)
+            PCG_ROOT_LOGGER.error(msg)
+            raise ValueError(msg)
+        return transform
+
+    def _check_meshes(self, mesh_transforms, transforms, min_distance=0.0):
+        """Check the meshes for collisions with the scene after applying
+        each of the input transforms to them. One FCL collision object
+        is created per mesh and only its transform is updated for
+        each query.
+        """
+        results = np.zeros(len(transforms), dtype=bool)
+        if len(self._scene_entries) == 0 or len(mesh_transforms) == 0:
+            return results
+
+        fcl_manager = self._fcl_manager
+        # The collision objects are only created once a mesh has any
+        # candidate scene meshes nearby
+        objects = [None for _ in mesh_transforms]
+        corners = [trimesh.bounds.corners(mesh.bounds)
+                   for mesh, _ in mesh_transforms]
+        is_watertight = [None for _ in mesh_transforms]
+
+        for i, transform in enumerate(transforms):
+            for k, (mesh, mesh_transform) in enumerate(mesh_transforms):
+                cur_transform = np.dot(transform, mesh_transform)
+                # Only the scene meshes whose bounding boxes overlap
+                # the mesh's can collide with or contain it
+                points = trimesh.transformations.transform_points(
+                    corners[k], cur_transform)
+                candidates = list(self._spatial_index.intersection(
+                    np.concatenate((points.min(axis=0),
+                                    points.max(axis=0)))))
+                if len(candidates) == 0 and min_distance == 0:
+                    continue
+
+                if objects[k] is None:
+                    objects[k] = fcl.CollisionObject(
+                        self._get_fcl_geometry(mesh))
+                objects[k].setTransform(fcl.Transform(
+                    cur_transform[0:3, 0:3], cur_transform[0:3, 3]))
+                cdata = fcl.CollisionData()
+                fcl_manager.collide(
+                    objects[k], cdata, fcl.defaultCollisionCallback)
+                if cdata.result.is_collision:
+                    results[i] = True
+                    break
+                # Check for minimum distance to any object
+                if min_distance > 0:
+                    ddata = fcl.DistanceData()
+                    fcl_manager.distance(
+                        objects[k], ddata, fcl.defaultDistanceCallback)
+                    if ddata.result.min_distance < min_distance:
+                        results[i] = True
+                        break
+                # Test if mesh in inside another mesh in the collision
+                # manager scene
+                # It will only work for scene meshes that are watertight
+                # The test points are transformed into the local frame
+                # of the mesh that should contain them
+                vertex = trimesh.transformations.transform_points(
+                    mesh.vertices[0:1], cur_transform)
+                if is_watertight[k] is None:
+                    is_watertight[k] = mesh.is_watertight
+                inv_transform = None
+                for mesh_id in candidates:
+                    scene_mesh = self._scene_meshes[mesh_id]
+                    # Check if a scene mesh contains the model mesh
+                    # to be tested
+                    if scene_mesh['is_watertight']:
+                        if scene_mesh['mesh'].contains(
+                                trimesh.transformations.transform_points(
+                                    vertex,
+                                    scene_mesh['inv_transform'])).any():
+                            results[i] = True
+                            break
+                    # Check if the model mesh being tested contains
+                    # any of the scene meshes
+                    if is_watertight[k]:
+                        if inv_transform is None:
+                            inv_transform = np.linalg.inv(cur_transform)
+                        if mesh.contains(
+                                trimesh.transformations.transform_points(
+                                    scene_mesh['vertex'],
+                                    inv_transform)).any():
+                            results[i] = True
+                            break
+                if results[i]:
+                    break
+        return results
+
     def check_collision_with_current_scene(self, model, min_distance=0.0):
         """Check if there are any collisions between `model` and
         the meshes in the scene.
@@ -149,34 +411,52 @@ class CollisionChecker(object):
             'Checking model <{}> for collision with scene'.format(
                 model.name))
 
-        manager = self.get_collision_manager()
-
-        meshes = model.get_meshes(mesh_type='collision')
-        for mesh in meshes:
-            if manager.in_collision_single(mesh):
-                return True
-            # Check for minimum distance to any object
-            if manager.min_distance_single(mesh) < min_distance:
-                return True
-            # Test if mesh in inside another mesh in the collision
-            # manager scene
-            # It will only work for scene meshes that are watertight
-            for scene_model in self._scene_models:
-                for scene_mesh in scene_model.get_meshes():
-                    # Check if a scene mesh contains the model mesh
-                    # to be tested
-                    if scene_mesh.is_watertight:
-                        if scene_mesh.contains([mesh.vertices[0]]).any():
-                            return True
-                    # Check if the model mesh being tested contains
-                    # any of the scene meshes
-                    if mesh.is_watertight:
-                        if mesh.contains([scene_mesh.vertices[0]]).any():
-                            return True
+        mesh_transforms = model.get_mesh_transforms(mesh_type='collision')
+        if self._check_meshes(
+                mesh_transforms, [np.eye(4)], min_distance)[0]:
+            return True
 
         PCG_ROOT_LOGGER.info('No collisions for model <{}>'.format(model.name))
         return False
 
+    def check_poses(self, model, poses, min_distance=0.0):
+        """Check the model for collisions with the scene for each of
+        the candidate poses. The meshes of the model are computed only
+        once and the same collision objects are reused for all poses.
+
+        > *Input arguments*
+
+        * `model` (*type:* `pcg_gazebo.simulation.SimulationModel`):
+        Simulation model structure
+        * `poses` (*type:* `list`): List of candidate poses for the
+        model as `pcg_gazebo.simulation.properties.Pose` objects or
+        4x4 homogeneous transforms
+        * `min_distance` (*type:* `float`, *default:* `0`): Minimum
+        distance to the meshes in the scene
+
+        > *Returns*
+
+        `numpy.ndarray`: Boolean vector with `True` for each pose for
+        which a collision was detected.
+        """
+        assert min_distance >= 0.0, \
+            'Min. distance to other objects must be equal or ' \
+            'greater than 0, provided={}'.format(min_distance)
+        PCG_ROOT_LOGGER.info(
+            'Checking {} poses of model <{}> for collision'
+            ' with scene'.format(len(poses), model.name))
+
+        # The mesh transforms are computed for the current pose of the
+        # model, each candidate pose is applied as a transform relative to it
+        inv_model_transform = np.linalg.inv(
+            self._get_pose_transform(model.pose))
+        transforms = [
+            np.dot(self._get_pose_transform(pose), inv_model_transform)
+            for pose in poses]
+
+        mesh_transforms = model.get_mesh_transforms(mesh_type='collision')
+        return self._check_meshes(mesh_transforms, transforms, min_distance)
+
     def check_for_collisions(self):
         """Check if there are any collisions amongst the meshes in the scene.
 
@@ -184,9 +464,7 @@ class CollisionChecker(object):
 
         `True`, if any collision is detected. `False`, otherwise.
         """
-        manager, objects = trimesh.collision.scene_to_collision(
-            self._simulation_scenario)
-        return manager.in_collision_internal()
+        return self._collision_manager.in_collision_internal()
 
 
 class SingletonCollisionChecker(CollisionChecker):
@@ -14,7 +14,6 @@
 # limitations under the License.
 import numpy as np
 import trimesh
-from copy import deepcopy
 from .constraint import Constraint
 from ... import random
 from .. import shapes
@@ -27,6 +26,12 @@ import collections
 from shapely.geometry import Polygon, LineString, Point, \
     MultiPoint, MultiPolygon, MultiLineString
 from shapely.affinity import affine_transform
+from shapely.prepared import prep
+try:
+    from shapely import contains_xy, intersects_xy
+    SHAPELY_XY_PREDICATES_AVAILABLE = True
+except ImportError:
+    SHAPELY_XY_PREDICATES_AVAILABLE = False
 
 
 class WorkspaceConstraint(Constraint):
@@ -111,6 +116,8 @@ class WorkspaceConstraint(Constraint):
         self._geometry_type = geometry_type
         self._holes = list()
         self._geometry = None
+        # Workspace geometry with the holes and pose already applied
+        self._resolved_geometry = None
         self._geometry = self.generate_geometry(
             self._geometry_type, **kwargs)
 
@@ -145,6 +152,12 @@ class WorkspaceConstraint(Constraint):
         msg += '\t - Type of geometry: {}\n'.format(self._geometry_type)
         return msg
 
+    def __getstate__(self):
+        # Prepared geometries cannot be pickled or copied
+        state = self.__dict__.copy()
+        state['_resolved_geometry'] = None
+        return state
+
     @property
     def pose(self):
         return self._pose
@@ -165,6 +178,7 @@ class WorkspaceConstraint(Constraint):
                     'All elements in pose vector must be a float or an integer'
 
             self._pose = Pose(pos=vec[0:3], rot=vec[3::])
+        self._resolved_geometry = None
 
     def generate_geometry(self, type, **kwargs):
         """Generate a `shapely` entity according to the geometry description
@@ -393,17 +407,34 @@ class WorkspaceConstraint(Constraint):
         assert isinstance(point, collections.Iterable), \
             'Invalid list of points'
         point = list(point)
-        geo = self.get_geometry()
         # Only planar points are checked now
         pnt = Point(point[0], point[1])
-        return geo.contains(pnt)
+        return self.get_prepared_geometry().contains(pnt)
 
     def contains_points(self, points):
+        """Return True if all `points` are part of the workspace.
+
+        > *Input arguments*
+
+        * `points` (*type:* `list` or `numpy.ndarray`): List of 2D points
+        """
         assert isinstance(points, collections.Iterable), \
             'Invalid list of points'
-        points = MultiPoint(points)
         geo = self.get_geometry()
-        return geo.contains(points)
+        if not SHAPELY_XY_PREDICATES_AVAILABLE or \
+                isinstance(geo, trimesh.base.Trimesh):
+            return self.get_prepared_geometry().contains(MultiPoint(points))
+
+        xy = [pnt.coords[0] if isinstance(pnt, Point) else pnt
+              for pnt in points]
+        if len(xy) == 0:
+            return False
+        xy = np.array(xy, dtype=float)[:, 0:2]
+        # Same result as testing a MultiPoint, the points can be on the
+        # boundary as long as one of them is in the interior
+        return bool(
+            intersects_xy(geo, xy[:, 0], xy[:, 1]).all() and
+            contains_xy(geo, xy[:, 0], xy[:, 1]).any())
 
     def contains_polygons(self, polygons):
         """Return True if polygons in the `polygons` list are part of the workspace.
@@ -414,41 +445,100 @@ class WorkspaceConstraint(Constraint):
         """
         assert isinstance(polygons, collections.Iterable), \
             'Invalid list of polygons'
-        merged_poly = None
-        geo = self.get_geometry()
+        prepared = self.get_prepared_geometry()
         for poly in polygons:
-            if merged_poly is None:
-                merged_poly = geo.union(poly)
-            else:
-                merged_poly = merged_poly.union(poly)
-        return merged_poly.area == geo.area
+            if not prepared.covers(poly):
+                return False
+        return True
 
-    def contains_mesh(self, mesh):
-        vertices = MultiPoint(mesh.vertices[:, 0:2].tolist())
-        geo = self.get_geometry()
+    def contains_mesh(self, mesh, transform=None):
+        """Return True if `mesh` is part of the workspace.
 
+        > *Input arguments*
+
+        * `mesh` (*type:* `trimesh.Trimesh`): Mesh
+        * `transform` (*type:* `numpy.ndarray`, *default:* `None`): 4x4
+        homogeneous transform to be applied to the mesh's vertices
+        """
+        geo = self.get_geometry()
+        if transform is None:
+            points = mesh.vertices
+        elif isinstance(geo, trimesh.base.Trimesh):
+            points = trimesh.transformations.transform_points(
+                mesh.vertices, transform)
+        else:
+            # The planar geometries are tested against the convex hull
+            # of the projected vertices, which is also the projection of
+            # the mesh's convex hull, cached by trimesh
+            try:
+                points = mesh.convex_hull.vertices
+            except (ValueError, RuntimeError):
+                points = mesh.vertices
+            points = trimesh.transformations.transform_points(
+                points, transform)
+
+        if isinstance(geo, trimesh.base.Trimesh):
+            return geo.contains(points).all()
+
+        xy = np.asarray(points)[:, 0:2]
         if isinstance(geo, (Polygon, MultiPolygon)):
-            return geo.contains(vertices.convex_hull)
+            # Reject meshes with vertices outside of the workspace
+            # before computing the convex hull
+            if SHAPELY_XY_PREDICATES_AVAILABLE and \
+                    not intersects_xy(geo, xy[:, 0], xy[:, 1]).all():
+                return False
+            convex_hull = MultiPoint(xy).convex_hull
+            return self.get_prepared_geometry().contains(convex_hull)
         elif isinstance(geo, (LineString, MultiLineString)):
-            convex_hull = vertices.convex_hull
-            return convex_hull.intersects(geo) or convex_hull.contains(geo)
+            convex_hull = MultiPoint(xy).convex_hull
+            return self.get_prepared_geometry().intersects(convex_hull)
         elif isinstance(geo, (MultiPoint)):
-            convex_hull = vertices.convex_hull
+            convex_hull = MultiPoint(xy).convex_hull
             for point in geo.geoms:
                 if convex_hull.contains(point):
                     return True
             return False
-        elif isinstance(geo, trimesh.base.Trimesh):
-            return geo.contains(mesh.vertices).all()
         else:
             raise NotImplementedError()
 
     def add_hole(self, type, **kwargs):
         self._holes.append(self.generate_geometry(type, **kwargs))
+        self._resolved_geometry = None
+
+    def _get_resolved_geometry(self):
+        # The pose can also be changed in place, so its current value
+        # is part of the key of the cached geometry
+        key = tuple(self._pose.position) + tuple(self._pose.quat) + \
+            (len(self._holes),)
+        if self._resolved_geometry is None or \
+                self._resolved_geometry['key'] != key:
+            geometry = self._geometry
+            for geo in self._holes:
+                geometry = geometry.difference(geo)
+            geometry = self._apply_transform(geometry)
+            if isinstance(geometry, trimesh.base.Trimesh):
+                prepared = None
+            else:
+                prepared = prep(geometry)
+            self._resolved_geometry = dict(
+                key=key,
+                geometry=geometry,
+                prepared=prepared)
+        return self._resolved_geometry
 
     def get_geometry(self):
-        """Return the workspace geometry"""
-        geometry = deepcopy(self._geometry)
-        for geo in self._holes:
-            geometry = geometry.difference(geo)
-        return self._apply_transform(geometry)
+        """Return the workspace geometry with the holes and the pose
+        applied. The geometry is computed once and cached until the pose
+        or the holes change, so it should not be modified.
+        """
+        return self._get_resolved_geometry()['geometry']
+
+    def get_prepared_geometry(self):
+        """Return the planar workspace geometry as a
+        `shapely.prepared.PreparedGeometry` for fast repeated
+        predicates. For 3D workspaces the mesh is returned.
+        """
+        resolved = self._get_resolved_geometry()
+        if resolved['prepared'] is None:
+            return resolved['geometry']
+        return resolved['prepared']
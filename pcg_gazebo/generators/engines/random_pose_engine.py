@@ -52,6 +52,10 @@ class RandomPoseEngine(Engine):
     (selecting the models for the biggest to the smallest).
     * `policies` (*type:* `dict`, *default:* `None`): The rules
     for model generation associated with each degree of freedom.
+    * `pose_batch_size` (*type:* `int`, *default:* `1`): Number of
+    candidate poses generated for each placement attempt. The candidates
+    are checked for collisions in one batch and the first collision-free
+    pose is used.
 
     ```yaml
     policies:
@@ -101,7 +105,8 @@ class RandomPoseEngine(Engine):
             policies=None,
             model_picker='random',
             collision_checker=None,
-            min_distance=0.0):
+            min_distance=0.0,
+            pose_batch_size=1):
         Engine.__init__(
             self,
             assets_manager=assets_manager,
@@ -116,7 +121,10 @@ class RandomPoseEngine(Engine):
         assert min_distance >= 0.0, \
             'Min. distance between objects ' \
             'must be equal or greater than 0'
+        assert pose_batch_size > 0, \
+            'Pose batch size must be greater than 0'
         self._no_collision = no_collision
+        self._pose_batch_size = int(pose_batch_size)
         self._max_num = dict()
         self._workspace = None
         self._cached_footprints = dict()
@@ -209,8 +217,8 @@ class RandomPoseEngine(Engine):
         """
         for rule in self.get_rules_for_model(model.name):
             if rule.name == 'workspace':
-                for mesh in model.get_meshes():
-                    if not rule.workspace.contains_mesh(mesh):
+                for mesh, transform in model.get_mesh_transforms():
+                    if not rule.workspace.contains_mesh(mesh, transform):
                         return False
         return True
 
@@ -254,6 +262,31 @@ class RandomPoseEngine(Engine):
                 model, self._min_distance)
         return has_collision
 
+    def get_collision_free_poses(self, model, poses):
+        """Run the collision checker of the input `model` for each
+        of the candidate poses against the current scene of the
+        simulation.
+
+        > *Input arguments*
+
+        * `model` (*type:* `pcg_gazebo.simulation.SimulationModel`):
+        Model instance
+        * `poses` (*type:* `list`): List of candidate
+        `pcg_gazebo.simulation.properties.Pose` objects
+
+        > *Returns*
+
+        List of `pcg_gazebo.simulation.properties.Pose`: Candidate
+        poses with no collisions
+        """
+        if len(poses) == 1:
+            model.pose = poses[0]
+            return list() if self.has_collision(model) else poses
+        collisions = self._collision_checker.check_poses(
+            model, poses, self._min_distance)
+        return [pose for pose, collision in zip(poses, collisions)
+                if not collision]
+
     def run(self):
         """Run the placement engine and generate a list of models placed
         according to the input policies and respecting spatial constraints.
@@ -317,24 +350,26 @@ class RandomPoseEngine(Engine):
                         self._models[0]))
                 return None
             else:
-                pose = self._get_random_pose(model_name)
-
-                model.pose = self._get_random_pose(model_name)
-                self._logger.info('Generated random pose: {}'.format(
-                    model.pose))
-                while not self.is_model_in_workspace(model):
-                    self._logger.info(
-                        'Model outside of the '
-                        'workspace or in collision'
-                        ' with other objects!')
-                    pose = self._get_random_pose(model_name)
-                    self._logger.info(
-                        '\t Generated random pose: {}'.format(pose))
-                    model.pose = pose
-                # Enforce positioning constraints
-                model = self.apply_local_constraints(model)
+                poses = list()
+                for _ in range(self._pose_batch_size):
+                    model.pose = self._get_random_pose(model_name)
+                    self._logger.info('Generated random pose: {}'.format(
+                        model.pose))
+                    while not self.is_model_in_workspace(model):
+                        self._logger.info(
+                            'Model outside of the '
+                            'workspace or in collision'
+                            ' with other objects!')
+                        pose = self._get_random_pose(model_name)
+                        self._logger.info(
+                            '\t Generated random pose: {}'.format(pose))
+                        model.pose = pose
+                    # Enforce positioning constraints
+                    model = self.apply_local_constraints(model)
+                    poses.append(model.pose)
                 if self._no_collision:
-                    if self.has_collision(model):
+                    free_poses = self.get_collision_free_poses(model, poses)
+                    if len(free_poses) == 0:
                         self._logger.info(
                             'Collision for model {} detected, '
                             'increasing collision counter and '
@@ -346,6 +381,7 @@ class RandomPoseEngine(Engine):
                         self.model_picker.counter[model.name] -= 1
                         continue
                     else:
+                        model.pose = free_poses[0]
                         collision_counter = 0
 
             # Increase the counter for this chosen model
@@ -0,0 +1,353 @@
+# Copyright (c) 2020 - The Procedural Generation for Gazebo authors
+# For information on the respective copyright owner see the NOTICE file
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Vectorized 2D gradient noise (Perlin and simplex) and fractal Brownian
+motion, computed on whole arrays of coordinates with `numpy`.
+"""
+import numpy as np
+from multiprocessing.pool import Pool
+from .. import random
+
+NOISE_TYPES = ['perlin', 'simplex']
+
+_GRADIENTS = np.array([
+    [1, 1], [-1, 1], [1, -1], [-1, -1],
+    [1, 0], [-1, 0], [0, 1], [0, -1]], dtype=float)
+
+_SIMPLEX_F2 = 0.5 * (np.sqrt(3.0) - 1.0)
+_SIMPLEX_G2 = (3.0 - np.sqrt(3.0)) / 6.0
+
+
+def get_permutation_table(seed=None):
+    """Return the permutation table of the gradient noise functions.
+
+    > *Input arguments*
+
+    * `seed` (*type:* `int`, *default:* `None`): Seed of the permutation,
+    if `None` the permutation is drawn from `pcg_gazebo.random`.
+
+    > *Returns*
+
+    `numpy.ndarray`: Permutation of `[0, 255]`, repeated twice.
+    """
+    if seed is None:
+        perm = random.choice(256, 256, replace=False)
+    else:
+        perm = np.random.RandomState(seed).permutation(256)
+    return np.concatenate((perm, perm)).astype(np.int64)
+
+
+def _dot_gradient(perm_index, x, y):
+    gradients = _GRADIENTS[perm_index % _GRADIENTS.shape[0]]
+    return gradients[..., 0] * x + gradients[..., 1] * y
+
+
+def perlin_noise(x, y, perm):
+    """Compute the Perlin noise at the coordinates `x` and `y`.
+
+    > *Input arguments*
+
+    * `x` (*type:* `numpy.ndarray`): X coordinates
+    * `y` (*type:* `numpy.ndarray`): Y coordinates, same shape as `x`
+    * `perm` (*type:* `numpy.ndarray`): Permutation table, see
+    `get_permutation_table`
+
+    > *Returns*
+
+    `numpy.ndarray`: Noise values in `[-1, 1]`.
+    """
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    xf = x - x0
+    yf = y - y0
+    xi = x0.astype(np.int64) & 255
+    yi = y0.astype(np.int64) & 255
+
+    # Quintic fade curves
+    u = xf * xf * xf * (xf * (xf * 6 - 15) + 10)
+    v = yf * yf * yf * (yf * (yf * 6 - 15) + 10)
+
+    n00 = _dot_gradient(perm[perm[xi] + yi], xf, yf)
+    n10 = _dot_gradient(perm[perm[xi + 1] + yi], xf - 1, yf)
+    n01 = _dot_gradient(perm[perm[xi] + yi + 1], xf, yf - 1)
+    n11 = _dot_gradient(perm[perm[xi + 1] + yi + 1], xf - 1, yf - 1)
+
+    nx0 = n00 + u * (n10 - n00)
+    nx1 = n01 + u * (n11 - n01)
+    return nx0 + v * (nx1 - nx0)
+
+
+def _perlin_noise_grid(x, y, perm):
+    """Compute the Perlin noise on the grid of coordinates `x` (rows)
+    and `y` (columns). The fade curves and offsets are computed per row
+    and column, and the gradients are read from tables indexed by the
+    permutation, so only the corner lookups use full size arrays.
+    """
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    xf = (x - x0).astype(np.float32)
+    yf = (y - y0).astype(np.float32)
+    xi = x0.astype(np.int64) & 255
+    yi = y0.astype(np.int64) & 255
+
+    u = (xf * xf * xf * (xf * (xf * 6 - 15) + 10)).reshape(-1, 1)
+    v = (yf * yf * yf * (yf * (yf * 6 - 15) + 10)).reshape(1, -1)
+
+    index = perm % _GRADIENTS.shape[0]
+    grad_x = _GRADIENTS[index, 0].astype(np.float32)
+    grad_y = _GRADIENTS[index, 1].astype(np.float32)
+
+    def corner(a, b, dx, dy):
+        h = a.reshape(-1, 1) + b.reshape(1, -1)
+        return grad_x[h] * dx.reshape(-1, 1) + grad_y[h] * dy.reshape(1, -1)
+
+    a0 = perm[xi]
+    a1 = perm[xi + 1]
+    n00 = corner(a0, yi, xf, yf)
+    n10 = corner(a1, yi, xf - 1, yf)
+    nx0 = n00 + u * (n10 - n00)
+    n01 = corner(a0, yi + 1, xf, yf - 1)
+    n11 = corner(a1, yi + 1, xf - 1, yf - 1)
+    nx1 = n01 + u * (n11 - n01)
+    return nx0 + v * (nx1 - nx0)
+
+
+def simplex_noise(x, y, perm):
+    """Compute the simplex noise at the coordinates `x` and `y`.
+
+    > *Input arguments*
+
+    * `x` (*type:* `numpy.ndarray`): X coordinates
+    * `y` (*type:* `numpy.ndarray`): Y coordinates, same shape as `x`
+    * `perm` (*type:* `numpy.ndarray`): Permutation table, see
+    `get_permutation_table`
+
+    > *Returns*
+
+    `numpy.ndarray`: Noise values in `[-1, 1]`.
+    """
+    # Skew the input space to find the simplex cell
+    s = (x + y) * _SIMPLEX_F2
+    i = np.floor(x + s)
+    j = np.floor(y + s)
+    t = (i + j) * _SIMPLEX_G2
+    x0 = x - (i - t)
+    y0 = y - (j - t)
+
+    # Offsets of the middle corner of the simplex
+    i1 = (x0 > y0).astype(np.int64)
+    j1 = 1 - i1
+
+    x1 = x0 - i1 + _SIMPLEX_G2
+    y1 = y0 - j1 + _SIMPLEX_G2
+    x2 = x0 - 1.0 + 2.0 * _SIMPLEX_G2
+    y2 = y0 - 1.0 + 2.0 * _SIMPLEX_G2
+
+    ii = i.astype(np.int64) & 255
+    jj = j.astype(np.int64) & 255
+
+    noise = np.zeros(np.shape(x))
+    for xc, yc, gi in [
+            (x0, y0, perm[ii + perm[jj]]),
+            (x1, y1, perm[ii + i1 + perm[jj + j1]]),
+            (x2, y2, perm[ii + 1 + perm[jj + 1]])]:
+        tc = np.maximum(0.5 - xc * xc - yc * yc, 0)
+        tc *= tc
+        noise += tc * tc * _dot_gradient(gi, xc, yc)
+    return 70.0 * noise
+
+
+def _simplex_noise_grid(x, y, perm):
+    """Compute the simplex noise on the grid of coordinates `x` (rows)
+    and `y` (columns) in single precision, with the gradients read from
+    tables indexed by the permutation.
+    """
+    x = x.astype(np.float32).reshape(-1, 1)
+    y = y.astype(np.float32).reshape(1, -1)
+    f2 = np.float32(_SIMPLEX_F2)
+    g2 = np.float32(_SIMPLEX_G2)
+
+    i = np.floor(x * (1 + f2) + y * f2)
+    j = np.floor(x * f2 + y * (1 + f2))
+    t = (i + j) * g2
+    x0 = x - i + t
+    y0 = y - j + t
+    ii = i.astype(np.int32) & 255
+    jj = j.astype(np.int32) & 255
+    del i, j, t
+
+    index = perm % _GRADIENTS.shape[0]
+    grad_x = _GRADIENTS[index, 0].astype(np.float32)
+    grad_y = _GRADIENTS[index, 1].astype(np.float32)
+
+    def corner(xc, yc, h):
+        tc = np.float32(0.5) - xc * xc - yc * yc
+        np.maximum(tc, 0, out=tc)
+        tc *= tc
+        tc *= tc
+        tc *= grad_x[h] * xc + grad_y[h] * yc
+        return tc
+
+    noise = corner(x0, y0, ii + perm[jj])
+    noise += corner(
+        x0 - 1 + 2 * g2, y0 - 1 + 2 * g2, ii + 1 + perm[jj + 1])
+
+    # Middle corner of the simplex
+    upper = x0 > y0
+    i1 = upper.astype(np.float32)
+    j1 = 1 - i1
+    noise += corner(
+        x0 - i1 + g2,
+        y0 - j1 + g2,
+        ii + upper + perm[jj + np.logical_not(upper)])
+    noise *= 70
+    return noise
+
+
+def fbm_noise(x, y, perm, octaves=1, lacunarity=2.0, persistence=0.5,
+              noise_type='perlin', grid=False):
+    """Compute the fractal Brownian motion of a gradient noise function,
+    the sum of `octaves` layers of noise with increasing frequency and
+    decreasing amplitude.
+
+    > *Input arguments*
+
+    * `x` (*type:* `numpy.ndarray`): X coordinates
+    * `y` (*type:* `numpy.ndarray`): Y coordinates, same shape as `x`
+    * `perm` (*type:* `numpy.ndarray`): Permutation table, see
+    `get_permutation_table`
+    * `octaves` (*type:* `int`, *default:* `1`): Number of noise layers
+    * `lacunarity` (*type:* `float`, *default:* `2.0`): Frequency
+    multiplier between octaves
+    * `persistence` (*type:* `float`, *default:* `0.5`): Amplitude
+    multiplier between octaves
+    * `noise_type` (*type:* `str`, *default:* `perlin`): `perlin` or
+    `simplex`
+    * `grid` (*type:* `bool`, *default:* `False`): If `True`, `x` and `y`
+    are 1D arrays with the coordinates of the rows and columns of a grid
+
+    > *Returns*
+
+    `numpy.ndarray`: Noise values in `[-1, 1]`, with shape
+    `(len(x), len(y))` if `grid` is `True`.
+    """
+    assert octaves > 0, 'Octaves must be greater than 0'
+    assert noise_type in NOISE_TYPES, \
+        'Noise algorithm is invalid, value={}'.format(noise_type)
+    if grid:
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        shape = (x.size, y.size)
+    else:
+        shape = np.shape(x)
+
+    if noise_type == 'perlin':
+        noise_fcn = _perlin_noise_grid if grid else perlin_noise
+    else:
+        noise_fcn = _simplex_noise_grid if grid else simplex_noise
+
+    output = np.zeros(shape, dtype=np.float32 if grid else float)
+    amplitude = 1.0
+    frequency = 1.0
+    total_amplitude = 0.0
+    for _ in range(octaves):
+        output += amplitude * noise_fcn(x * frequency, y * frequency, perm)
+        total_amplitude += amplitude
+        amplitude *= persistence
+        frequency *= lacunarity
+    return output / total_amplitude
+
+
+def _get_noise_tile(args):
+    rows, n_cols, scale, perm, octaves, lacunarity, persistence, \
+        noise_type = args
+    return fbm_noise(
+        np.arange(rows[0], rows[1], dtype=float) / scale,
+        np.arange(n_cols, dtype=float) / scale,
+        perm,
+        octaves=octaves,
+        lacunarity=lacunarity,
+        persistence=persistence,
+        noise_type=noise_type,
+        grid=True).astype(np.float32)
+
+
+def generate_noise_image(image_size, scale=16.0, octaves=1,
+                         lacunarity=2.0, persistence=0.5,
+                         noise_type='perlin', seed=None, tile_size=512,
+                         n_processes=None):
+    """Generate a noise image normalized to `[0, 255]`. The image is
+    computed in tiles of rows, so that large images do not need large
+    temporary arrays, and the tiles can be computed in a process pool.
+    The tiles use the same permutation table and global pixel
+    coordinates, so the output does not depend on the tiling.
+
+    > *Input arguments*
+
+    * `image_size` (*type:* `list`): Number of rows and columns
+    * `scale` (*type:* `float`, *default:* `16.0`): Number of pixels
+    per unit of the noise function
+    * `octaves` (*type:* `int`, *default:* `1`): Number of noise layers
+    * `lacunarity` (*type:* `float`, *default:* `2.0`): Frequency
+    multiplier between octaves
+    * `persistence` (*type:* `float`, *default:* `0.5`): Amplitude
+    multiplier between octaves
+    * `noise_type` (*type:* `str`, *default:* `perlin`): `perlin` or
+    `simplex`
+    * `seed` (*type:* `int`, *default:* `None`): Seed of the noise, if
+    `None` it is drawn from `pcg_gazebo.random`
+    * `tile_size` (*type:* `int`, *default:* `512`): Number of rows in
+    each tile
+    * `n_processes` (*type:* `int`, *default:* `None`): Number of
+    processes used to compute the tiles, if `None` or `1` the tiles
+    are computed in the current process
+
+    > *Returns*
+
+    `numpy.ndarray`: `uint8` image.
+    """
+    assert len(image_size) == 2, 'Image size must have two elements'
+    assert image_size[0] > 0 and image_size[1] > 0, \
+        'Image size coordinates must be greater than zero'
+    assert scale > 0, 'Scale must be greater than 0'
+    assert tile_size > 0, 'Tile size must be greater than 0'
+    assert noise_type in NOISE_TYPES, \
+        'Noise algorithm is invalid, value={}'.format(noise_type)
+
+    n_rows, n_cols = int(image_size[0]), int(image_size[1])
+    perm = get_permutation_table(seed)
+    tasks = [
+        [(start, min(start + tile_size, n_rows)), n_cols, scale, perm,
+         octaves, lacunarity, persistence, noise_type]
+        for start in range(0, n_rows, tile_size)]
+
+    if n_processes is not None and n_processes > 1 and len(tasks) > 1:
+        pool = Pool(min(n_processes, len(tasks)))
+        try:
+            tiles = pool.map(_get_noise_tile, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        tiles = [_get_noise_tile(task) for task in tasks]
+
+    image = np.vstack(tiles)
+    min_value = image.min()
+    max_value = image.max()
+    if max_value == min_value:
+        return np.zeros((n_rows, n_cols), dtype=np.uint8)
+    image -= min_value
+    image *= 255.0 / (max_value - min_value)
+    return np.round(image).astype(np.uint8)
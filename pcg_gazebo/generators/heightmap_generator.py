@@ -15,20 +15,12 @@
 from __future__ import print_function
 import os
 import numpy as np
-from skimage.io import imread, imsave
-from skimage.color import rgb2gray
-from skimage import transform
 from .biomes import Biome
+from .gradient_noise import generate_noise_image
 from ..simulation.properties import Heightmap
 from ..utils import is_array, is_string
 from ..log import PCG_ROOT_LOGGER
 from .. import random
-try:
-    from noise import pnoise2, snoise2
-    HAS_NOISE_SUPPORT = True
-except Exception as ex:
-    print(ex)
-    HAS_NOISE_SUPPORT = False
 
 
 class HeightmapGenerator(object):
@@ -142,10 +134,13 @@ class HeightmapGenerator(object):
             raise ValueError('Invalid biome input')
 
     def _resize(self, image):
+        from skimage import transform
         return transform.resize(
             image, output_shape=self._image_size) * 255
 
     def _open_file(self, filename):
+        from skimage.io import imread
+        from skimage.color import rgb2gray
         assert is_string(filename), \
             'Input filename must be a string'
         assert os.path.isfile(filename), \
@@ -166,6 +161,7 @@ class HeightmapGenerator(object):
         self._masks.append(image)
 
     def add_custom_mask(self, mask):
+        from skimage import transform
         assert isinstance(mask, np.ndarray), \
             'Input image must be a numpy array'
         assert len(mask.shape) == 2, \
@@ -188,41 +184,62 @@ class HeightmapGenerator(object):
         image = self.get_random_noise(scale, min_value, max_value)
         self._layers.append(image)
 
-    def add_perlin_noise_layer(self, freq=16.0, octaves=1):
-        image = self.get_perlin_noise(freq, octaves)
+    def add_perlin_noise_layer(self, freq=16.0, octaves=1, **kwargs):
+        image = self.get_perlin_noise(freq, octaves, **kwargs)
         self._layers.append(image)
 
-    def add_simplex_noise_layer(self, freq=16.0, octaves=1):
-        image = self.get_simplex_noise(freq, octaves)
+    def add_simplex_noise_layer(self, freq=16.0, octaves=1, **kwargs):
+        image = self.get_simplex_noise(freq, octaves, **kwargs)
         self._layers.append(image)
 
-    def _perlin_noise(self, freq=1.0, octaves=1, noise_fcn='perlin'):
-        assert HAS_NOISE_SUPPORT, 'No noise generation support'
+    def _perlin_noise(self, freq=1.0, octaves=1, noise_fcn='perlin',
+                      lacunarity=2.0, persistence=0.5, seed=None,
+                      n_processes=None):
         assert freq > 0, 'Frequency must be greater than 0'
         assert octaves > 0, 'Octaves must be greater than 0'
-        image = np.zeros(self._image_size)
-        if noise_fcn == 'perlin':
-            noise_fcn = pnoise2
-        elif noise_fcn == 'simplex':
-            noise_fcn = snoise2
-        else:
-            raise NotImplementedError(
-                'Noise algorithm is invalid, value={}'.format(
-                    noise_fcn))
-        for i in range(image.shape[0]):
-            for j in range(image.shape[1]):
-                image[i, j] = noise_fcn(
-                    i / (freq * octaves), j / (freq * octaves), octaves)
-
-        image = (image - image.min()) * 256 / (image.max() - image.min())
-        return image.astype(np.uint8)
-
-    def get_simplex_noise(self, freq=1.0, octaves=1):
-        image = self._perlin_noise(freq, octaves, 'simplex')
+        return generate_noise_image(
+            self._image_size,
+            scale=freq * octaves,
+            octaves=octaves,
+            lacunarity=lacunarity,
+            persistence=persistence,
+            noise_type=noise_fcn,
+            seed=seed,
+            n_processes=n_processes)
+
+    def get_simplex_noise(self, freq=1.0, octaves=1, **kwargs):
+        """Return a simplex noise image in `[0, 255]`.
+
+        > *Input arguments*
+
+        * `freq` (*type:* `float`, *default:* `1.0`): Number of pixels
+        per unit of the noise function in the first octave
+        * `octaves` (*type:* `int`, *default:* `1`): Number of octaves
+        * `lacunarity` (*type:* `float`, *default:* `2.0`): Frequency
+        multiplier between octaves
+        * `persistence` (*type:* `float`, *default:* `0.5`): Amplitude
+        multiplier between octaves
+        * `seed` (*type:* `int`, *default:* `None`): Seed of the noise,
+        if `None` it is drawn from `pcg_gazebo.random`
+        * `n_processes` (*type:* `int`, *default:* `None`): Number of
+        processes used to compute large images in tiles
+
+        > *Returns*
+
+        `numpy.ndarray`: `uint8` image.
+        """
+        image = self._perlin_noise(freq, octaves, 'simplex', **kwargs)
         return image
 
-    def get_perlin_noise(self, freq=1.0, octaves=1):
-        image = self._perlin_noise(freq, octaves, 'perlin')
+    def get_perlin_noise(self, freq=1.0, octaves=1, **kwargs):
+        """Return a Perlin noise image in `[0, 255]`, see
+        `get_simplex_noise` for the input arguments.
+
+        > *Returns*
+
+        `numpy.ndarray`: `uint8` image.
+        """
+        image = self._perlin_noise(freq, octaves, 'perlin', **kwargs)
         return image
 
     def get_random_noise(self, scale=1, min_value=0, max_value=1):
@@ -241,6 +258,7 @@ class HeightmapGenerator(object):
             sampling=self._sampling)
 
     def save_image(self, filename, image=None):
+        from skimage.io import imsave
         assert is_string(filename), \
             'Input filename must be a string'
         imsave()
@@ -13,13 +13,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import numpy as np
-import collections
 from ... import random
 from ._picker import _Picker
 
 
 class RouletteWheelPicker(_Picker):
+    """Picker that selects items with a probability proportional to
+    their fitness. Items that reached their maximum number are
+    excluded from the selection.
+
+    > *Input arguments*
+
+    * `items` (*type:* `list`): Tags of the items
+    * `max_num` (*type:* `dict`): Maximum number of selections for each
+    item, `None` for no limit
+    * `fitness` (*type:* `dict`): Fitness of each item, must be greater
+    than zero
+    """
     _LABEL = 'roulette'
+    _BATCH_SIZE = 1024
 
     def __init__(self, items, max_num, fitness):
         super(RouletteWheelPicker, self).__init__(
@@ -32,6 +44,12 @@ class RouletteWheelPicker(_Picker):
             assert fitness[tag] > 0
 
         self._fitness = fitness
+        # Items sorted by fitness with their fitness and availability,
+        # rebuilt when the fitness or the maximum number of any item
+        # changes, and the cumulative fitness of the available items,
+        # updated when any item reaches its maximum number
+        self._table = None
+        self._cumulative = None
 
     @property
     def fitness(self):
@@ -48,31 +66,94 @@ class RouletteWheelPicker(_Picker):
         self._fitness[tag] = fitness
         self._counter[tag] = 0
         self._max_num[tag] = max_num
+        self._table = None
+
+    def is_capped(self, tag):
+        """Return `True` if the item `tag` has been selected its
+        maximum number of times.
+        """
+        max_num = self.get_max_num_items(tag)
+        return max_num is not None and self.get_counter(tag) >= max_num
+
+    def increase_counter(self, tag):
+        super(RouletteWheelPicker, self).increase_counter(tag)
+        if self._table is not None and tag in self._table['index'] and \
+                self.is_capped(tag):
+            self._table['available'][self._table['index'][tag]] = False
+            self._cumulative = None
+
+    def set_max_num(self, tag, value):
+        super(RouletteWheelPicker, self).set_max_num(tag, value)
+        self._table = None
+
+    def reset(self):
+        super(RouletteWheelPicker, self).reset()
+        self._table = None
+
+    def _get_cumulative_fitness(self):
+        if self._table is None:
+            # Items are sorted by fitness so that the same random
+            # samples lead to the same selections
+            tags = [
+                tag for tag, _ in sorted(
+                    self._fitness.items(), key=lambda kv: kv[1])
+                if tag in self._counter]
+            self._table = dict(
+                tags=tags,
+                index={tag: i for i, tag in enumerate(tags)},
+                fitness=np.array(
+                    [self._fitness[tag] for tag in tags], dtype=float),
+                available=np.array(
+                    [not self.is_capped(tag) for tag in tags], dtype=bool))
+            self._cumulative = None
+        if self._cumulative is None:
+            # Items that are not available have zero width in the
+            # wheel and can therefore never be selected
+            self._cumulative = np.cumsum(
+                self._table['fitness'] * self._table['available'])
+        return self._cumulative
+
+    def get_selections(self, n):
+        """Select `n` items. Each selection is made with the
+        probabilities of the items still available after the
+        previous selections.
+
+        > *Input arguments*
+
+        * `n` (*type:* `int`): Number of items to be selected
+
+        > *Returns*
+
+        `list`: Tags of the selected items, with less than `n` items
+        if the maximum number of all items was reached.
+        """
+        assert n >= 0, 'Number of selections cannot be negative'
+        selections = list()
+        while len(selections) < n:
+            cumulative = self._get_cumulative_fitness()
+            if len(cumulative) == 0 or cumulative[-1] <= 0:
+                break
+            tags = self._table['tags']
+            # Samples are drawn in batches, since the samples left when
+            # an item reaches its maximum number are discarded, and kept
+            # below the total fitness in case of rounding, so that they
+            # always fall on an available item
+            samples = np.minimum(
+                random.rand(min(n - len(selections), self._BATCH_SIZE)) *
+                cumulative[-1],
+                np.nextafter(cumulative[-1], 0))
+            indexes = np.searchsorted(cumulative, samples, side='right')
+            for i in indexes:
+                selections.append(tags[i])
+                self.increase_counter(tags[i])
+                # The remaining samples are drawn again if an item
+                # reached its maximum number
+                if self._cumulative is None:
+                    break
+        return selections
 
     def get_selection(self):
-        if self.are_all_counters_max():
+        selections = self.get_selections(1)
+        if len(selections) == 0:
             return None
-        sorted_fitness = collections.OrderedDict(
-            sorted(self._fitness.items(), key=lambda kv: kv[1]))
-
-        total_fitness = np.sum(list(sorted_fitness.values()))
-        previous = 0.0
-        prob = collections.OrderedDict()
-        for tag in sorted_fitness:
-            prob[tag] = previous + sorted_fitness[tag] / total_fitness
-            previous = prob[tag]
-        selected = None
-        while selected is None:
-            sample = random.rand()
-            for tag in prob:
-                if sample < prob[tag]:
-                    if self.get_max_num_items(tag) == self.get_counter(tag):
-                        break
-                    else:
-                        selected = tag
-                        break
-            if selected is not None:
-                break
-        if selected is not None:
-            self.increase_counter(selected)
-        return selected
+        return selections[0]
@@ -12,37 +12,203 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import weakref
 import numpy as np
 import trimesh
+from collections import OrderedDict
 from multiprocessing.pool import Pool
 from shapely.geometry import Polygon, MultiPolygon, \
-    LineString
+    LineString, GeometryCollection
+from shapely import affinity, wkb
 from shapely.ops import unary_union, polygonize, linemerge
 from ..log import PCG_ROOT_LOGGER
-from ..visualization import create_scene
+from .. import random
 from ..simulation import SimulationModel, ModelGroup
 from ..utils import has_string_pattern, get_random_point_from_shape
 
+# Long-lived worker pool used to compute the model footprints. The
+# meshes are sent to the workers through a content-addressed store of
+# vertex and face arrays, so that each worker can keep the meshes it
+# already loaded in memory between calls
+_OCCUPANCY_EXECUTOR = dict(
+    pool=None,
+    n_processes=None,
+    default_n_processes=None,
+    cache_dir=None,
+    mesh_keys=set())
 
-def _get_model_limits(model, mesh_type='collision'):
-    x_limits = None
-    y_limits = None
-    z_limits = None
+# Meshes loaded by the current worker process, indexed by content key
+_OCCUPANCY_WORKER_MESHES = dict(
+    meshes=OrderedDict(),
+    max_size=256)
 
-    meshes = list()
+
+# Footprints of the models computed in a frame without the X, Y and yaw
+# components of the model's pose, indexed by the content of the meshes
+_FOOTPRINTS = dict(
+    footprints=OrderedDict(),
+    max_size=1024,
+    hits=0,
+    misses=0,
+    persistent=False,
+    lock=threading.Lock())
+
+# Version of the footprints stored on disk
+_FOOTPRINTS_CACHE_VERSION = 1
+
+# Content keys of the meshes, indexed by the meshes' ids
+_MESH_CONTENT_KEYS = dict()
+
+
+def get_occupancy_executor(n_processes=None):
+    """Return the worker pool used to compute the occupancy grids. The
+    pool is kept alive between calls and it is only restarted if a
+    different number of processes is requested.
+
+    > *Input arguments*
+
+    * `n_processes` (*type:* `int`, *default:* `None`): Number of worker
+    processes. If `None`, the value set with
+    `set_occupancy_executor_processes` is used, or the existing pool is
+    reused if one is already running.
+
+    > *Returns*
+
+    `multiprocessing.pool.Pool`: Worker pool.
+    """
+    if n_processes is None:
+        if _OCCUPANCY_EXECUTOR['pool'] is not None:
+            return _OCCUPANCY_EXECUTOR['pool']
+        n_processes = _OCCUPANCY_EXECUTOR['default_n_processes']
+    else:
+        assert n_processes > 0, 'Number of processes must be greater' \
+            ' than zero, provided={}'.format(n_processes)
+
+    if _OCCUPANCY_EXECUTOR['pool'] is not None:
+        if _OCCUPANCY_EXECUTOR['n_processes'] == n_processes:
+            return _OCCUPANCY_EXECUTOR['pool']
+        _close_occupancy_pool()
+
+    PCG_ROOT_LOGGER.info(
+        'Starting occupancy grid worker pool, n_processes={}'.format(
+            n_processes))
+    _OCCUPANCY_EXECUTOR['pool'] = Pool(n_processes)
+    _OCCUPANCY_EXECUTOR['n_processes'] = n_processes
+    return _OCCUPANCY_EXECUTOR['pool']
+
+
+def set_occupancy_executor_processes(n_processes=None):
+    """Set the default number of worker processes used to compute the
+    occupancy grids. A running pool with a different size is closed and
+    restarted on the next call.
+
+    > *Input arguments*
+
+    * `n_processes` (*type:* `int`, *default:* `None`): Number of worker
+    processes. If `None`, the number of CPUs is used.
+    """
+    if n_processes is not None:
+        assert n_processes > 0, 'Number of processes must be greater' \
+            ' than zero, provided={}'.format(n_processes)
+    _OCCUPANCY_EXECUTOR['default_n_processes'] = n_processes
+    if _OCCUPANCY_EXECUTOR['pool'] is not None and \
+            _OCCUPANCY_EXECUTOR['n_processes'] != n_processes:
+        _close_occupancy_pool()
+
+
+def close_occupancy_executor():
+    """Terminate the occupancy grid worker pool and remove its
+    mesh store.
+    """
+    _close_occupancy_pool()
+    if _OCCUPANCY_EXECUTOR['cache_dir'] is not None:
+        shutil.rmtree(_OCCUPANCY_EXECUTOR['cache_dir'], ignore_errors=True)
+    _OCCUPANCY_EXECUTOR['cache_dir'] = None
+    _OCCUPANCY_EXECUTOR['mesh_keys'] = set()
+
+
+def _close_occupancy_pool():
+    if _OCCUPANCY_EXECUTOR['pool'] is not None:
+        _OCCUPANCY_EXECUTOR['pool'].terminate()
+        _OCCUPANCY_EXECUTOR['pool'].join()
+    _OCCUPANCY_EXECUTOR['pool'] = None
+    _OCCUPANCY_EXECUTOR['n_processes'] = None
+
+
+atexit.register(close_occupancy_executor)
+
+
+def _store_occupancy_mesh(mesh):
+    # Store the vertices and faces of the mesh in the executor's
+    # content-addressed store and return the key and filename
+    key = _get_mesh_content_key(mesh)
+
+    if _OCCUPANCY_EXECUTOR['cache_dir'] is None or \
+            not os.path.isdir(_OCCUPANCY_EXECUTOR['cache_dir']):
+        _OCCUPANCY_EXECUTOR['cache_dir'] = tempfile.mkdtemp(
+            prefix='pcg_occupancy_')
+        _OCCUPANCY_EXECUTOR['mesh_keys'] = set()
+
+    filename = os.path.join(
+        _OCCUPANCY_EXECUTOR['cache_dir'], key + '.npz')
+    if key not in _OCCUPANCY_EXECUTOR['mesh_keys']:
+        np.savez(
+            filename,
+            vertices=np.ascontiguousarray(mesh.vertices, dtype=np.float64),
+            faces=np.ascontiguousarray(mesh.faces, dtype=np.int64))
+        _OCCUPANCY_EXECUTOR['mesh_keys'].add(key)
+    return key, filename
+
+
+def _load_occupancy_mesh(key, filename):
+    # Load a mesh from the content-addressed store, reusing the
+    # meshes already loaded by this process
+    meshes = _OCCUPANCY_WORKER_MESHES['meshes']
+    if key in meshes:
+        meshes.move_to_end(key)
+        return meshes[key]
+    with np.load(filename) as data:
+        mesh = trimesh.Trimesh(
+            vertices=data['vertices'],
+            faces=data['faces'],
+            process=False)
+    meshes[key] = mesh
+    while len(meshes) > _OCCUPANCY_WORKER_MESHES['max_size']:
+        meshes.popitem(last=False)
+    return mesh
+
+
+def _get_meshes(model, mesh_type='collision'):
     if isinstance(model, SimulationModel) or isinstance(model, ModelGroup):
         PCG_ROOT_LOGGER.info(
             'Processing the bounds of simulation model={}'.format(
                 model.name))
-        meshes = model.get_meshes(mesh_type)
+        return model.get_meshes(mesh_type)
     elif isinstance(model, trimesh.Trimesh):
-        meshes = [model]
+        return [model]
+    elif isinstance(model, (list, tuple)) and \
+            all([isinstance(m, trimesh.Trimesh) for m in model]):
+        return list(model)
     else:
         msg = 'Input is neither of SimulationModel' \
             ' or Trimesh type, provided={}'.format(type(model))
         PCG_ROOT_LOGGER.error(msg)
         raise ValueError(msg)
 
+
+def _get_model_limits(model, mesh_type='collision'):
+    x_limits = None
+    y_limits = None
+    z_limits = None
+
+    meshes = _get_meshes(model, mesh_type)
+
     for mesh in meshes:
         bounds = mesh.bounds
         if x_limits is None:
@@ -65,6 +231,97 @@ def _get_model_limits(model, mesh_type='collision'):
     return x_limits, y_limits, z_limits
 
 
+def _get_section_segments(section):
+    # Return the line segments of a planar mesh section as an array
+    # with shape (n_segments, 2, 2)
+    segments = list()
+    for entity in section.entities:
+        points = entity.discrete(section.vertices)
+        if len(points) < 2:
+            continue
+        segments.append(np.stack([points[:-1], points[1:]], axis=1))
+    if len(segments) == 0:
+        return np.zeros((0, 2, 2))
+    return np.concatenate(segments)[:, :, :2]
+
+
+def _count_ray_crossings(point, directions, segments, max_block_size=2**20):
+    # Count how many segments are crossed by each planar ray starting
+    # at the given point, processing the segments in blocks to bound
+    # the memory used for the (n_rays, n_segments) arrays
+    counts = np.zeros(directions.shape[0], dtype=int)
+    block_size = max(1, int(max_block_size / directions.shape[0]))
+    for i in range(0, segments.shape[0], block_size):
+        start = segments[i:i + block_size, 0] - point
+        edges = segments[i:i + block_size, 1] - \
+            segments[i:i + block_size, 0]
+        denom = np.outer(directions[:, 0], edges[:, 1]) - \
+            np.outer(directions[:, 1], edges[:, 0])
+        t_num = start[:, 0] * edges[:, 1] - start[:, 1] * edges[:, 0]
+        u_num = np.outer(directions[:, 1], start[:, 0]) - \
+            np.outer(directions[:, 0], start[:, 1])
+        valid = np.abs(denom) > 1e-12
+        denom = np.where(valid, denom, 1)
+        t = t_num[np.newaxis, :] / denom
+        u = u_num / denom
+        counts += np.sum(
+            valid & (t > 0) & (u >= 0) & (u < 1), axis=1)
+    return counts
+
+
+def _is_interior_polygon(mesh, geos, z_levels, segments, n_rays=360):
+    """Test which of the polygons computed from the mesh sections
+    are inside of the mesh. A point is sampled inside each polygon and
+    tested with vertical rays against the mesh, which are all cast in
+    a single call, and with `n_rays` horizontal rays against the
+    segments of the mesh section at the same height. The point is
+    considered to be inside of the mesh if all horizontal rays hit the
+    section and at least one crosses it an odd number of times.
+
+    > *Input arguments*
+
+    * `mesh` (*type:* `trimesh.Trimesh`): Mesh
+    * `geos` (*type:* `list`): List of `shapely` polygons
+    * `z_levels` (*type:* `list`): Height of the section of each polygon
+    * `segments` (*type:* `list`): Section segments for each polygon
+    as arrays with shape `(n_segments, 2, 2)`
+    * `n_rays` (*type:* `int`, *default:* `360`): Number of horizontal
+    rays tested for each polygon
+
+    > *Returns*
+
+    `numpy.ndarray`: Boolean flags for each polygon.
+    """
+    assert n_rays > 0, 'Number of rays must be greater than zero,' \
+        ' provided={}'.format(n_rays)
+    is_interior = np.zeros(len(geos), dtype=bool)
+    if len(geos) == 0:
+        return is_interior
+
+    points = np.array(
+        [get_random_point_from_shape(geo) for geo in geos])
+    origins = np.hstack(
+        (points, np.array(z_levels).reshape(-1, 1)))
+
+    # Discard the points with no mesh above or below them
+    hits = mesh.ray.intersects_any(
+        ray_origins=np.vstack((origins, origins)),
+        ray_directions=np.vstack((
+            np.tile([0, 0, 1], (len(geos), 1)),
+            np.tile([0, 0, -1], (len(geos), 1)))))
+    has_vertical_hits = np.logical_or(
+        hits[:len(geos)], hits[len(geos):])
+
+    theta = np.linspace(0, 2 * np.pi, n_rays, endpoint=False)
+    directions = np.vstack((np.cos(theta), np.sin(theta))).T
+
+    for i in np.nonzero(has_vertical_hits)[0]:
+        counts = _count_ray_crossings(points[i], directions, segments[i])
+        if np.all(counts > 0):
+            is_interior[i] = np.any(counts % 2 != 0)
+    return is_interior
+
+
 def get_occupied_area(
         model,
         z_levels=None,
@@ -73,11 +330,14 @@ def get_occupied_area(
         z_limits=None,
         model_name=None,
         mesh_type='collision',
-        is_ground_plane=False):
+        is_ground_plane=False,
+        n_rays=360):
     PCG_ROOT_LOGGER.info('get_occupied_area(), model={}'.format(model_name))
     PCG_ROOT_LOGGER.info('get_occupied_area(), mesh_type={}'.format(mesh_type))
 
-    model_x_limits, model_y_limits, model_z_limits = _get_model_limits(model)
+    meshes = _get_meshes(model, mesh_type)
+    model_x_limits, model_y_limits, model_z_limits = \
+        _get_model_limits(meshes)
     PCG_ROOT_LOGGER.info(
         'Model limits calculated, model={}, x_limits={},'
         ' y_limits={}, z_limits={}'.format(
@@ -164,62 +424,8 @@ def get_occupied_area(
         'height range, model={}, # levels before={}, # levels'
         ' after={}'.format(model_name, n_levels, z_levels.size))
 
-    def _is_interior_polygon(current_mesh, current_geo, z=None):
-        if not isinstance(current_geo, (Polygon, MultiPolygon)):
-            return False
-        inside_mesh = False
-        ray_directions = list()
-        ray_origins = list()
-
-        point = get_random_point_from_shape(current_geo)
-
-        ray_directions = [
-            [0, 0, 1],
-            [0, 0, -1]
-        ]
-        ray_origins = \
-            [
-                [point[0], point[1], z]
-                for _ in range(len(ray_directions))
-            ]
-
-        locations = current_mesh.ray.intersects_location(
-            ray_origins=ray_origins,
-            ray_directions=ray_directions)
-
-        if len(locations[1]) == 0:
-            return False
-
-        ray_directions = list()
-        ray_origins = list()
-
-        n_theta = 360
-        for theta in np.linspace(0, 2 * np.pi, n_theta):
-            ray_directions.append(
-                [np.cos(theta), np.sin(theta), 0])
-            ray_origins.append(
-                [point[0], point[1], z]
-            )
-
-        locations = current_mesh.ray.intersects_location(
-            ray_origins=ray_origins,
-            ray_directions=ray_directions)
-
-        unique, counts = np.unique(
-            locations[1], return_counts=True)
-
-        if unique.size != len(ray_directions):
-            return False
-
-        for c in counts:
-            if c % 2 != 0:
-                inside_mesh = True
-                break
-        return inside_mesh
-
     plane_normal = [0, 0, 1]
     occupied_areas = list()
-    meshes = model.get_meshes(mesh_type)
 
     for mesh in meshes:
         if model_z_limits[0] in z_levels:
@@ -239,31 +445,43 @@ def get_occupied_area(
             plane_origin=[0, 0, 0],
             plane_normal=plane_normal,
             heights=z_levels)
-        sections = [s for s in sections if s is not None]
         polys = list()
         section_boundaries = list()
+        candidates = list()
         for section, z in zip(sections, z_levels):
+            if section is None:
+                continue
             lines = list()
             for poly in section.entities:
                 line = LineString(
                     section.vertices[poly.points])
                 lines.append(line)
             boundaries = linemerge(lines)
-            section_boundaries.append(boundaries)
-            p = boundaries.envelope.difference(boundaries.buffer(1e-3))
+            buffered_boundaries = boundaries.buffer(1e-3)
+            section_boundaries.append(buffered_boundaries)
+            p = boundaries.envelope.difference(buffered_boundaries)
 
             if isinstance(p, MultiPolygon):
+                segments = _get_section_segments(section)
                 for geo in p.geoms:
-                    if _is_interior_polygon(mesh, geo, z):
-                        polys.append(geo.buffer(1e-3))
+                    candidates.append([geo, z, segments])
             elif isinstance(p, Polygon):
                 polys.append(p)
 
+        if len(candidates):
+            is_interior = _is_interior_polygon(
+                mesh,
+                [item[0] for item in candidates],
+                [item[1] for item in candidates],
+                [item[2] for item in candidates],
+                n_rays=n_rays)
+            for item, interior in zip(candidates, is_interior):
+                if interior:
+                    polys.append(item[0].buffer(1e-3))
+
         occupied_areas = occupied_areas + polys
 
-        if len(section_boundaries):
-            for item in section_boundaries:
-                occupied_areas.append(item.buffer(1e-3))
+        occupied_areas = occupied_areas + section_boundaries
 
     if len(occupied_areas) > 1:
         occupied_areas = unary_union(
@@ -284,7 +502,7 @@ def get_occupied_area(
         PCG_ROOT_LOGGER.warning(
             'Footprint for model {} could not be '
             'computed for z_levels={}, model Z limits={}'.format(
-                model.name, z_levels, model_z_limits))
+                model_name, z_levels, model_z_limits))
         return None
     # TODO: Set x_limits and y_limits to the occupied area
 
@@ -292,18 +510,30 @@ def get_occupied_area(
 
 
 def _get_occupied_area_proc(args):
-    from ..simulation import SimulationModel
-    model = SimulationModel.from_sdf(args[0])
+    # The worker processes are reused between calls, so the state of
+    # the random generator of the caller, used to sample the points in
+    # the footprints, is restored as a newly forked worker would have it
+    random.set_state(args[5])
+
+    meshes = list()
+    for key, filename, transform in args[0]:
+        mesh = _load_occupancy_mesh(key, filename).copy()
+        mesh.apply_transform(transform)
+        meshes.append(mesh)
+
+    if len(meshes) == 0:
+        return None
 
     occupied_areas = get_occupied_area(
-        model,
+        meshes,
         z_levels=args[1],
         x_limits=None,
         y_limits=None,
         z_limits=None,
         model_name=args[2],
         mesh_type=args[3],
-        is_ground_plane=args[4])
+        is_ground_plane=args[4],
+        n_rays=args[6])
     return occupied_areas
 
 
@@ -315,7 +545,8 @@ def generate_occupancy_grid(
         z_limits=None,
         n_processes=None,
         mesh_type='collision',
-        ground_plane_models=None):
+        ground_plane_models=None,
+        n_rays=360):
     if len(models) == 0:
         PCG_ROOT_LOGGER.warning(
             'List of models is empty, cannot compute occupancy grid')
@@ -332,6 +563,7 @@ def generate_occupancy_grid(
                 return True
         return False
 
+    from ..visualization import create_scene
     scene = create_scene(list(models.values()))
 
     if x_limits is None:
@@ -394,30 +626,37 @@ def generate_occupancy_grid(
         non_static=dict(),
         ground_plane=None)
 
-    pool = Pool(n_processes)
-
     if len(models):
+        random_state = random.get_state()
         non_gp_models = list()
         for tag in models:
             if _is_ground_plane(models[tag]):
                 continue
+            mesh_payload = list()
+            for mesh, transform in models[tag].get_mesh_transforms(
+                    mesh_type):
+                key, filename = _store_occupancy_mesh(mesh)
+                mesh_payload.append([key, filename, transform])
             non_gp_models.append(
                 [
-                    models[tag].to_sdf(),
+                    mesh_payload,
                     z_levels,
                     tag,
                     mesh_type,
-                    False
+                    False,
+                    random_state,
+                    n_rays
                 ]
             )
 
         if len(non_gp_models):
+            pool = get_occupancy_executor(n_processes)
             results = pool.map(
                 _get_occupied_area_proc,
                 non_gp_models)
 
             for model_occupied_area, model_name in zip(
-                    results, [x[0].name for x in non_gp_models]):
+                    results, [x[2] for x in non_gp_models]):
                 if model_occupied_area is None:
                     PCG_ROOT_LOGGER.warning(
                         'No footprint found for model {}'
@@ -460,22 +699,24 @@ def generate_occupancy_grid(
             ground_plane_group,
             z_levels,
             mesh_type=mesh_type,
-            is_ground_plane=False)
+            is_ground_plane=False,
+            n_rays=n_rays)
 
         if ground_plane_group.n_models > 0:
             model_occupied_area = get_occupied_area(
                 ground_plane_group,
                 z_levels,
                 mesh_type=mesh_type,
-                is_ground_plane=True)
+                is_ground_plane=True,
+                n_rays=n_rays)
             # Check if the places occupied by the ground plane models
             # are equal to the computed free space
             diff = model_occupied_area.difference(
                 occupancy_output['static']['ground_plane_models'])
 
-            if model_occupied_area.almost_equals(
+            if model_occupied_area.equals_exact(
                     occupancy_output['static']['ground_plane_models'],
-                    decimal=3) or diff.area < 1e-3:
+                    tolerance=0.5e-3) or diff.area < 1e-3:
                 PCG_ROOT_LOGGER.info(
                     'The areas for free space are equivalent to the '
                     'occupied areas by the ground plane occupied '
@@ -486,3 +727,624 @@ def generate_occupancy_grid(
 
     PCG_ROOT_LOGGER.info('Computation of occupancy grid finished')
     return occupancy_output
+
+
+def _get_polygons(geo):
+    # Flatten a shapely geometry into its list of polygons
+    if isinstance(geo, Polygon):
+        return [geo] if not geo.is_empty else list()
+    elif isinstance(geo, (MultiPolygon, GeometryCollection)):
+        polygons = list()
+        for item in geo.geoms:
+            polygons += _get_polygons(item)
+        return polygons
+    return list()
+
+
+def _rasterize_polygons(polygons, origin, resolution, shape):
+    # Scanline rasterization of the polygons using the even-odd rule
+    # for each polygon, with holes. A pixel is filled if its center
+    # lies inside of a polygon. The row 0 of the output mask is the
+    # top row of the map.
+    n_rows, n_cols = shape
+    top = origin[1] + n_rows * resolution
+
+    all_rows = list()
+    all_starts = list()
+    all_ends = list()
+    for polygon in polygons:
+        cross_rows = list()
+        cross_cols = list()
+        for ring in [polygon.exterior] + list(polygon.interiors):
+            coords = np.asarray(ring.coords)[:, :2]
+            if coords.shape[0] < 3:
+                continue
+            # Coordinates in pixel units, rows counted from the top
+            cols = (coords[:, 0] - origin[0]) / resolution
+            rows = (top - coords[:, 1]) / resolution
+            c0, c1 = cols[:-1], cols[1:]
+            r0, r1 = rows[:-1], rows[1:]
+
+            # Rows with pixel centers in [min(r0, r1), max(r0, r1))
+            row_start = np.ceil(np.minimum(r0, r1) - 0.5).astype(int)
+            row_end = np.ceil(np.maximum(r0, r1) - 0.5).astype(int)
+            n_crossings = np.maximum(row_end - row_start, 0)
+            total = int(n_crossings.sum())
+            if total == 0:
+                continue
+
+            edges = np.repeat(np.arange(n_crossings.size), n_crossings)
+            offsets = np.arange(total) - np.repeat(
+                np.cumsum(n_crossings) - n_crossings, n_crossings)
+            crossing_rows = row_start[edges] + offsets
+            slope = (c1[edges] - c0[edges]) / (r1[edges] - r0[edges])
+            crossing_cols = c0[edges] + \
+                (crossing_rows + 0.5 - r0[edges]) * slope
+
+            cross_rows.append(crossing_rows)
+            cross_cols.append(crossing_cols)
+
+        if len(cross_rows) == 0:
+            continue
+        cross_rows = np.concatenate(cross_rows)
+        cross_cols = np.concatenate(cross_cols)
+
+        # Each row of a closed polygon has an even number of crossings,
+        # so consecutive pairs in the sorted crossings are the spans
+        # inside of the polygon
+        order = np.lexsort((cross_cols, cross_rows))
+        cross_rows = cross_rows[order]
+        cross_cols = cross_cols[order]
+
+        span_rows = cross_rows[0::2]
+        span_starts = np.clip(
+            np.ceil(cross_cols[0::2] - 0.5), 0, n_cols).astype(int)
+        span_ends = np.clip(
+            np.ceil(cross_cols[1::2] - 0.5), 0, n_cols).astype(int)
+        valid = np.logical_and(
+            np.logical_and(span_rows >= 0, span_rows < n_rows),
+            span_ends > span_starts)
+
+        all_rows.append(span_rows[valid])
+        all_starts.append(span_starts[valid])
+        all_ends.append(span_ends[valid])
+
+    mask = np.zeros(shape, dtype=bool)
+    if len(all_rows) == 0:
+        return mask
+    rows = np.concatenate(all_rows)
+    if rows.size == 0:
+        return mask
+
+    diff = np.zeros((n_rows, n_cols + 1), dtype=np.int32)
+    np.add.at(diff, (rows, np.concatenate(all_starts)), 1)
+    np.add.at(diff, (rows, np.concatenate(all_ends)), -1)
+    np.cumsum(diff[:, :-1], axis=1, out=diff[:, :-1])
+    np.greater(diff[:, :-1], 0, out=mask)
+    return mask
+
+
+def rasterize_occupancy_grid(
+        occupancy_output,
+        resolution=0.05,
+        x_limits=None,
+        y_limits=None,
+        static_models_only=True,
+        with_ground_plane=True,
+        occupied_color=0,
+        free_color=1,
+        unavailable_color=0.5,
+        margin=0.1):
+    """Burn the footprints computed by `generate_occupancy_grid` into a
+    gray-scale grid map. No plotting backend is needed.
+
+    > *Input arguments*
+
+    * `occupancy_output` (*type:* `dict`): Output of
+    `generate_occupancy_grid`
+    * `resolution` (*type:* `float`, *default:* `0.05`): Size of a
+    grid cell in meters
+    * `x_limits` (*type:* `list`, *default:* `None`): X limits of the
+    map. If `None`, the bounds of the footprints plus `margin` are used.
+    * `y_limits` (*type:* `list`, *default:* `None`): Y limits of the
+    map. If `None`, the bounds of the footprints plus `margin` are used.
+    * `static_models_only` (*type:* `bool`, *default:* `True`): If
+    `True`, the footprints of non-static models are ignored
+    * `with_ground_plane` (*type:* `bool`, *default:* `True`): If
+    `True`, the cells outside of the ground plane are set as unavailable
+    * `occupied_color` (*type:* `float`, *default:* `0`): Gray-scale
+    color of the occupied cells, between 0 and 1
+    * `free_color` (*type:* `float`, *default:* `1`): Gray-scale color
+    of the free cells, between 0 and 1
+    * `unavailable_color` (*type:* `float`, *default:* `0.5`): Gray-scale
+    color of the unavailable cells, between 0 and 1
+    * `margin` (*type:* `float`, *default:* `0.1`): Margin in meters
+    added to the footprint bounds when the map limits are not provided
+
+    > *Returns*
+
+    `numpy.ndarray` with `uint8` cells, the first row being the top of
+    the map, and the `[x, y]` coordinates of its bottom left corner.
+    """
+    assert resolution > 0, 'Resolution must be greater than zero,' \
+        ' provided={}'.format(resolution)
+    for color in [occupied_color, free_color, unavailable_color]:
+        assert 0 <= color <= 1, 'Colors must be between 0 and 1,' \
+            ' provided={}'.format(color)
+
+    ground_plane = list()
+    occupied = list()
+    if occupancy_output is not None:
+        if with_ground_plane and \
+                occupancy_output['ground_plane'] is not None:
+            ground_plane = _get_polygons(occupancy_output['ground_plane'])
+        for tag in occupancy_output['static']:
+            occupied += _get_polygons(occupancy_output['static'][tag])
+        if not static_models_only:
+            for tag in occupancy_output['non_static']:
+                occupied += _get_polygons(
+                    occupancy_output['non_static'][tag])
+
+    if x_limits is None or y_limits is None:
+        if len(ground_plane + occupied) == 0:
+            msg = 'No footprints available, the map limits' \
+                ' must be provided'
+            PCG_ROOT_LOGGER.error(msg)
+            raise ValueError(msg)
+        bounds = np.array([geo.bounds for geo in ground_plane + occupied])
+        if x_limits is None:
+            x_limits = [
+                bounds[:, 0].min() - margin, bounds[:, 2].max() + margin]
+        if y_limits is None:
+            y_limits = [
+                bounds[:, 1].min() - margin, bounds[:, 3].max() + margin]
+
+    assert x_limits[0] < x_limits[1], \
+        'Invalid X limits, value={}'.format(x_limits)
+    assert y_limits[0] < y_limits[1], \
+        'Invalid Y limits, value={}'.format(y_limits)
+
+    origin = [float(x_limits[0]), float(y_limits[0])]
+    shape = (
+        int(np.ceil((y_limits[1] - y_limits[0]) / resolution)),
+        int(np.ceil((x_limits[1] - x_limits[0]) / resolution)))
+
+    PCG_ROOT_LOGGER.info(
+        'Rasterizing occupancy grid, resolution={}, origin={},'
+        ' shape={}'.format(resolution, origin, shape))
+
+    if len(ground_plane):
+        grid = np.full(
+            shape, int(round(255 * unavailable_color)), dtype=np.uint8)
+        grid[_rasterize_polygons(
+            ground_plane, origin, resolution, shape)] = \
+            int(round(255 * free_color))
+    else:
+        grid = np.full(shape, int(round(255 * free_color)), dtype=np.uint8)
+
+    if len(occupied):
+        grid[_rasterize_polygons(occupied, origin, resolution, shape)] = \
+            int(round(255 * occupied_color))
+    return grid, origin
+
+
+def store_occupancy_grid(
+        grid,
+        origin,
+        resolution,
+        output_folder,
+        output_filename='map.pgm',
+        occupied_thresh=0.65,
+        free_thresh=0.196):
+    """Store a gray-scale grid map as a binary PGM image and the YAML
+    description read by the ROS `map_server`.
+
+    > *Input arguments*
+
+    * `grid` (*type:* `numpy.ndarray`): Grid map with `uint8` cells,
+    the first row being the top of the map
+    * `origin` (*type:* `list`): `[x, y]` coordinates of the bottom
+    left corner of the map
+    * `resolution` (*type:* `float`): Size of a grid cell in meters
+    * `output_folder` (*type:* `str`): Output directory
+    * `output_filename` (*type:* `str`, *default:* `map.pgm`): Name of
+    the PGM file. The YAML file is stored with the same name.
+    * `occupied_thresh` (*type:* `float`, *default:* `0.65`): Occupancy
+    probability threshold for occupied cells
+    * `free_thresh` (*type:* `float`, *default:* `0.196`): Occupancy
+    probability threshold for free cells
+
+    > *Returns*
+
+    `True` if the files were stored.
+    """
+    import yaml
+
+    if not output_filename.endswith('.pgm'):
+        PCG_ROOT_LOGGER.error(
+            'Map filename must have a PGM extension,'
+            ' provided={}'.format(output_filename))
+        return False
+    if not os.path.isdir(output_folder):
+        PCG_ROOT_LOGGER.error(
+            'Invalid output folder, provided={}'.format(output_folder))
+        return False
+
+    write_pgm(os.path.join(output_folder, output_filename), grid)
+
+    with open(os.path.join(
+            output_folder, output_filename.replace(
+                '.pgm', '.yaml')), 'w+') as pgm_info_file:
+        pgm_info = dict(
+            image=str(output_filename),
+            resolution=float(resolution),
+            origin=[float(origin[0]), float(origin[1]), 0.0],
+            negate=0,
+            occupied_thresh=occupied_thresh,
+            free_thresh=free_thresh)
+        yaml.dump(pgm_info, pgm_info_file)
+
+    PCG_ROOT_LOGGER.info('Occupancy grid stored at {}'.format(
+        os.path.join(output_folder, output_filename)))
+    return True
+
+
+def write_pgm(filename, image):
+    """Write a gray-scale image as a binary (P5) PGM file.
+
+    > *Input arguments*
+
+    * `filename` (*type:* `str`): Output filename
+    * `image` (*type:* `numpy.ndarray`): Image with `uint8` pixels
+    """
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    assert image.ndim == 2, 'Image must be a 2D array, provided' \
+        ' shape={}'.format(image.shape)
+    with open(filename, 'wb') as pgm_file:
+        pgm_file.write('P5\n{} {}\n255\n'.format(
+            image.shape[1], image.shape[0]).encode())
+        pgm_file.write(image.tobytes())
+
+
+def filter_occupancy_models(
+        models,
+        static_models_only=True,
+        with_ground_plane=True,
+        exclude_contains=None,
+        ground_plane_models=None):
+    """Select the models used to compute an occupancy grid map.
+
+    > *Input arguments*
+
+    * `models` (*type:* `dict`): Models indexed by name
+    * `static_models_only` (*type:* `bool`, *default:* `True`): If
+    `True`, non-static models are ignored
+    * `with_ground_plane` (*type:* `bool`, *default:* `True`): If
+    `False`, ground plane models are ignored
+    * `exclude_contains` (*type:* `list`, *default:* `None`): Models
+    with names containing any of these keywords are ignored
+    * `ground_plane_models` (*type:* `list`, *default:* `None`): Names
+    of the models considered as ground plane
+
+    > *Returns*
+
+    `dict` with the filtered models.
+    """
+    if exclude_contains is None:
+        exclude_contains = list()
+    if ground_plane_models is None:
+        ground_plane_models = list()
+
+    filtered_models = dict()
+    for tag in models:
+        if any([item in tag for item in exclude_contains]):
+            continue
+        if (models[tag].is_ground_plane or tag in ground_plane_models) \
+                and not with_ground_plane:
+            continue
+        if not models[tag].static and static_models_only:
+            continue
+        filtered_models[tag] = models[tag]
+    return filtered_models
+
+
+def generate_occupancy_grid_map(
+        models,
+        resolution=0.05,
+        output_folder=None,
+        output_filename='map.pgm',
+        occupied_thresh=0.65,
+        free_thresh=0.196,
+        occupied_color=0,
+        free_color=1,
+        unavailable_color=0.5,
+        static_models_only=True,
+        with_ground_plane=True,
+        z_levels=None,
+        x_limits=None,
+        y_limits=None,
+        z_limits=None,
+        map_x_limits=None,
+        map_y_limits=None,
+        n_processes=None,
+        exclude_contains=None,
+        mesh_type='collision',
+        ground_plane_models=None):
+    """Compute the footprints of the models and rasterize them into a
+    grid map, optionally stored as a PGM image and YAML file for the
+    ROS `map_server`.
+
+    > *Input arguments*
+
+    * `models` (*type:* `dict`): Models indexed by name
+    * `resolution` (*type:* `float`, *default:* `0.05`): Size of a
+    grid cell in meters
+    * `output_folder` (*type:* `str`, *default:* `None`): If provided,
+    the map is stored in this directory
+    * `output_filename` (*type:* `str`, *default:* `map.pgm`): Name of
+    the PGM file
+    * `map_x_limits` (*type:* `list`, *default:* `None`): X limits of
+    the map
+    * `map_y_limits` (*type:* `list`, *default:* `None`): Y limits of
+    the map
+
+    The remaining arguments are forwarded to `filter_occupancy_models`,
+    `generate_occupancy_grid`, `rasterize_occupancy_grid` and
+    `store_occupancy_grid`.
+
+    > *Returns*
+
+    `numpy.ndarray` with `uint8` cells and the `[x, y]` coordinates of
+    the bottom left corner of the map.
+    """
+    filtered_models = filter_occupancy_models(
+        models,
+        static_models_only=static_models_only,
+        with_ground_plane=with_ground_plane,
+        exclude_contains=exclude_contains,
+        ground_plane_models=ground_plane_models)
+
+    occupancy_output = generate_occupancy_grid(
+        filtered_models,
+        z_levels=z_levels,
+        x_limits=x_limits,
+        y_limits=y_limits,
+        z_limits=z_limits,
+        n_processes=n_processes,
+        mesh_type=mesh_type,
+        ground_plane_models=ground_plane_models)
+
+    grid, origin = rasterize_occupancy_grid(
+        occupancy_output,
+        resolution=resolution,
+        x_limits=map_x_limits,
+        y_limits=map_y_limits,
+        static_models_only=static_models_only,
+        with_ground_plane=with_ground_plane,
+        occupied_color=occupied_color,
+        free_color=free_color,
+        unavailable_color=unavailable_color)
+
+    if output_folder is not None:
+        store_occupancy_grid(
+            grid,
+            origin,
+            resolution,
+            output_folder,
+            output_filename,
+            occupied_thresh=occupied_thresh,
+            free_thresh=free_thresh)
+    return grid, origin
+
+
+def _get_mesh_content_key(mesh):
+    # Hash of the vertices and faces of a mesh, computed once per mesh
+    # object. Meshes are shared and not modified in place, so the key is
+    # kept until the mesh is garbage collected.
+    mesh_id = id(mesh)
+    if mesh_id in _MESH_CONTENT_KEYS:
+        ref, key = _MESH_CONTENT_KEYS[mesh_id]
+        if ref() is mesh:
+            return key
+    key = hashlib.sha1(
+        np.ascontiguousarray(mesh.vertices, dtype=np.float64).tobytes())
+    key.update(np.ascontiguousarray(mesh.faces, dtype=np.int64).tobytes())
+    key = key.hexdigest()
+    _MESH_CONTENT_KEYS[mesh_id] = (
+        weakref.ref(
+            mesh, lambda _, i=mesh_id: _MESH_CONTENT_KEYS.pop(i, None)),
+        key)
+    return key
+
+
+def _get_footprint_filename(model, key):
+    # Footprints are only stored on disk for models loaded from a
+    # Gazebo model folder
+    from ..simulation import get_gazebo_model_path
+    if not _FOOTPRINTS['persistent'] or not model.is_gazebo_model:
+        return None
+    model_path = get_gazebo_model_path(model.source_model_name)
+    if model_path is None:
+        return None
+    return os.path.join(
+        model_path,
+        '.pcg_footprints',
+        hashlib.sha1(
+            repr((_FOOTPRINTS_CACHE_VERSION, key)).encode()).hexdigest() +
+        '.wkb')
+
+
+def get_model_footprint(
+        model,
+        mesh_type='collision',
+        pose_offset=None,
+        z_limits=None):
+    """Return the footprint of a model at its current pose. The footprint
+    does not depend on the X, Y and yaw components of the model's pose,
+    so it is computed once per geometry, roll and pitch, cached, and
+    then rotated and translated with `shapely` for each pose.
+
+    > *Input arguments*
+
+    * `model` (*type:* `pcg_gazebo.simulation.SimulationModel`): Model
+    * `mesh_type` (*type:* `str`, *default:* `collision`): Type of mesh,
+    options are `visual` or `collision`.
+    * `pose_offset` (*type:* `pcg_gazebo.simulation.properties.Pose`,
+    *default:* `None`): Pose offset applied to the model's pose
+    * `z_limits` (*type:* `list`, *default:* `None`): Minimum and maximum
+    limits in the Z direction in the world frame
+
+    > *Returns*
+
+    `shapely` polygon or multi-polygon, `None` if no footprint could be
+    computed.
+    """
+    from ..transformations import quaternion_matrix, euler_matrix, \
+        inverse_matrix
+
+    pose = model.pose if pose_offset is None else pose_offset + model.pose
+    pose_matrix = quaternion_matrix(pose.quat)
+    pose_matrix[0:3, 3] = pose.position
+
+    # Split the pose into the translation and yaw rotation, applied to
+    # the footprint, and the remaining roll and pitch, applied to the
+    # meshes. The Z levels of the sections follow the height of the
+    # meshes, so the height of the model does not change the footprint
+    # unless Z limits are provided, which are then shifted by the
+    # height of the model to be applied to the meshes.
+    yaw = np.arctan2(pose_matrix[1, 0], pose_matrix[0, 0])
+    frame = np.dot(euler_matrix(0, 0, -yaw), pose_matrix)
+    frame[0:3, 3] = 0
+    to_frame = np.dot(frame, inverse_matrix(pose_matrix))
+
+    if z_limits is not None:
+        z_limits = np.round(
+            np.array(z_limits, dtype=float).flatten() - pose_matrix[2, 3],
+            9) + 0.0
+
+    meshes = list()
+    key = [mesh_type, None if z_limits is None else tuple(z_limits)]
+    for mesh, transform in model.get_mesh_transforms(mesh_type, pose_offset):
+        transform = np.round(np.dot(to_frame, transform), 9) + 0.0
+        meshes.append((mesh, transform))
+        key.append((_get_mesh_content_key(mesh), transform.tobytes()))
+    key = tuple(key)
+
+    if len(meshes) == 0:
+        return None
+
+    cache = _FOOTPRINTS
+    with cache['lock']:
+        found = key in cache['footprints']
+        if found:
+            cache['hits'] += 1
+            cache['footprints'].move_to_end(key)
+            footprint = cache['footprints'][key]
+        else:
+            cache['misses'] += 1
+
+    if not found:
+        footprint = None
+        loaded = False
+        filename = _get_footprint_filename(model, key)
+        if filename is not None and os.path.isfile(filename):
+            try:
+                with open(filename, 'rb') as f:
+                    footprint = wkb.loads(f.read())
+                loaded = True
+            except Exception as ex:
+                PCG_ROOT_LOGGER.warning(
+                    'Could not load footprint from {}, message={}'.format(
+                        filename, ex))
+
+        if not loaded:
+            frame_meshes = list()
+            for mesh, transform in meshes:
+                frame_mesh = mesh.copy()
+                frame_mesh.apply_transform(transform)
+                frame_meshes.append(frame_mesh)
+            footprint = get_occupied_area(
+                frame_meshes,
+                z_limits=z_limits,
+                mesh_type=mesh_type,
+                model_name=model.name)
+
+            if filename is not None and footprint is not None:
+                try:
+                    if not os.path.isdir(os.path.dirname(filename)):
+                        os.makedirs(os.path.dirname(filename))
+                    with open(filename, 'wb') as f:
+                        f.write(wkb.dumps(footprint))
+                except (IOError, OSError) as ex:
+                    PCG_ROOT_LOGGER.warning(
+                        'Could not store footprint in {}, message={}'.format(
+                            filename, ex))
+
+        with cache['lock']:
+            if cache['max_size'] > 0:
+                cache['footprints'][key] = footprint
+                while len(cache['footprints']) > cache['max_size']:
+                    cache['footprints'].popitem(last=False)
+
+    if footprint is None or footprint.is_empty:
+        return footprint
+
+    footprint = affinity.rotate(
+        footprint, yaw, origin=(0, 0), use_radians=True)
+    return affinity.translate(
+        footprint, pose_matrix[0, 3], pose_matrix[1, 3])
+
+
+def set_footprints_cache_size(max_size):
+    """Set the maximum number of footprints kept in the cache, the least
+    recently used footprints are discarded first.
+
+    > *Input arguments*
+
+    * `max_size` (*type:* `int`): Maximum number of footprints, `0`
+    disables the cache.
+    """
+    assert isinstance(max_size, int) and max_size >= 0, \
+        'Cache size must be a non-negative integer, value={}'.format(
+            max_size)
+    with _FOOTPRINTS['lock']:
+        _FOOTPRINTS['max_size'] = max_size
+        while len(_FOOTPRINTS['footprints']) > max_size:
+            _FOOTPRINTS['footprints'].popitem(last=False)
+
+
+def set_footprints_cache_persistence(flag):
+    """Enable or disable storing the footprints of Gazebo models on
+    disk, in a `.pcg_footprints` folder inside of each model's folder.
+
+    > *Input arguments*
+
+    * `flag` (*type:* `bool`): If `True`, footprints are stored and
+    loaded from disk.
+    """
+    assert isinstance(flag, bool), 'Input must be a boolean'
+    _FOOTPRINTS['persistent'] = flag
+
+
+def get_footprints_cache_info():
+    """Return the statistics of the footprints cache.
+
+    > *Returns*
+
+    `dict`: Number of cache `hits` and `misses`, current number
+    of footprints `size` and `max_size`.
+    """
+    with _FOOTPRINTS['lock']:
+        return dict(
+            hits=_FOOTPRINTS['hits'],
+            misses=_FOOTPRINTS['misses'],
+            size=len(_FOOTPRINTS['footprints']),
+            max_size=_FOOTPRINTS['max_size'])
+
+
+def clear_footprints_cache():
+    """Remove all footprints from the cache and reset its statistics."""
+    with _FOOTPRINTS['lock']:
+        _FOOTPRINTS['footprints'] = OrderedDict()
+        _FOOTPRINTS['hits'] = 0
+        _FOOTPRINTS['misses'] = 0
@@ -14,11 +14,9 @@
 # limitations under the License.
 import os
 from time import sleep, time
-from .. import visualization
 from ..log import PCG_ROOT_LOGGER
 from ._generator import _Generator
 from ..utils import load_yaml, is_string, process_jinja_template
-from ..task_manager import GazeboProxy, is_gazebo_running
 from ..parsers import parse_sdf, parse_xacro
 from ..parsers.sdf import create_sdf_element, is_sdf_element
 from ..simulation.physics import ODE, Simbody, Bullet
@@ -40,6 +38,7 @@ class WorldGenerator(_Generator):
                  output_world_dir=None,
                  output_model_dir='/tmp/gazebo_models',
                  **kwargs):
+        from ..task_manager import GazeboProxy
         super(WorldGenerator, self).__init__(name=name, **kwargs)
         if gazebo_proxy is not None:
             assert isinstance(gazebo_proxy, GazeboProxy)
@@ -110,6 +109,7 @@ class WorldGenerator(_Generator):
         * `gazebo_port` (*type:* `int`, *default:* `11345`): Port number of
         the Gazebo server
         """
+        from ..task_manager import GazeboProxy
         if self._gazebo_proxy is not None:
             del self._gazebo_proxy
         self._gazebo_proxy = GazeboProxy(
@@ -134,6 +134,7 @@ class WorldGenerator(_Generator):
 
         `True` if the model could be deleted from the simulation.
         """
+        from ..task_manager import is_gazebo_running
         if self._gazebo_proxy is None:
             PCG_ROOT_LOGGER.error('Gazebo proxy was not initialized')
             return False
@@ -294,6 +295,7 @@ class WorldGenerator(_Generator):
 
         `True` if the model could be spawned.
         """
+        from ..task_manager import is_gazebo_running
         if self._gazebo_proxy is None:
             PCG_ROOT_LOGGER.error('Gazebo proxy was not initialized')
             return False
@@ -428,6 +430,7 @@ class WorldGenerator(_Generator):
 
         Description of return values
         """
+        from .. import visualization
         fig = None
 
         models = self.world.models
@@ -124,15 +124,10 @@ def parse_xml(input_xml, type='sdf'):
         raise Exception(msg)
 
     if os.path.isfile(input_xml):
-        filename = input_xml
-        assert os.path.isfile(filename), 'File does not exist'
-        output = str()
-        with open(filename, 'r') as xml_file:
-            for line in xml_file:
-                output += line
+        name, data = _iterparse_xml(input_xml)
+        return _create_xml_element(name, data, type)
     else:
-        output = input_xml
-    return parse_xml_str(output, type)
+        return parse_xml_str(input_xml, type)
 
 
 def parse_xml_str(xml_str, type='sdf'):
@@ -149,9 +144,9 @@ def parse_xml_str(xml_str, type='sdf'):
 
     `collections.OrderedDict`: Dictionary where the XML tags are the keys.
     """
-    import xmltodict
-    parsed_xml = xmltodict.parse(xml_str)
-    return parse_xml_dict(parsed_xml, type)
+    from io import BytesIO
+    name, data = _iterparse_xml(BytesIO(xml_str.encode('utf-8')))
+    return _create_xml_element(name, data, type)
 
 
 def parse_xml_dict(xml_dict, type='sdf'):
@@ -168,13 +163,16 @@ def parse_xml_dict(xml_dict, type='sdf'):
 
     `pcg_gazebo.parsers.types.XMLBase` object.
     """
+    data = convert_to_dict(xml_dict)
+    name = list(xml_dict.keys())[0]
+    return _create_xml_element(name, data[name], type)
+
+
+def _create_xml_element(name, data, type='sdf'):
     from .sdf import create_sdf_element
     from .urdf import create_urdf_element
     from .sdf_config import create_sdf_config_element
 
-    data = convert_to_dict(xml_dict)
-
-    name = list(xml_dict.keys())[0]
     if type == 'sdf':
         obj = create_sdf_element(name)
     elif type == 'urdf':
@@ -185,10 +183,129 @@ def parse_xml_dict(xml_dict, type='sdf'):
         raise TypeError('File type {} is invalid'.format(type))
     assert obj is not None, 'Element {} does not exist'.format(name)
 
-    obj.from_dict(data[name])
+    obj.from_dict(data)
     return obj
 
 
+def _get_xml_name(elem, name):
+    """Return the qualified name (e.g. `xacro:property`) of an element's
+    tag or attribute name as given in the `lxml` element `elem`."""
+    if name[0] != '{':
+        return name
+    uri, local_name = name[1:].split('}', 1)
+    if uri == 'http://www.w3.org/XML/1998/namespace':
+        return 'xml:' + local_name
+    for prefix in elem.nsmap:
+        if prefix is not None and elem.nsmap[prefix] == uri:
+            return prefix + ':' + local_name
+    return local_name
+
+
+def _iterparse_xml(source):
+    """Convert an XML file into the dictionary that would be returned by
+    `convert_to_dict` for the `xmltodict` representation of the same file,
+    in a single pass over the `lxml` parser events. Elements are released
+    once they have been converted, so the XML tree is never fully stored
+    in memory.
+
+    > *Input arguments*
+
+    * `source` (*type:* `str` or file-like object): Filename or XML
+    content.
+
+    > *Returns*
+
+    `str`: Name of the root element, `dict`: Formatted XML dictionary
+    of the root element.
+    """
+    from lxml import etree
+    custom_elements = ['plugin']
+
+    # Elements being parsed as lists of name, attributes, dictionary of
+    # children items and a flag indicating whether the element is part of
+    # a custom element, in which case the `xmltodict` representation is
+    # kept to be processed by `convert_custom`
+    stack = [[None, None, dict(), False]]
+    for event, elem in etree.iterparse(
+            source, events=('start', 'end'), remove_comments=True,
+            huge_tree=True):
+        if event == 'start':
+            is_custom = stack[-1][3]
+            name = _get_xml_name(elem, elem.tag)
+            if not is_custom and name in custom_elements:
+                is_custom = True
+
+            attributes = list()
+            parent = elem.getparent()
+            parent_nsmap = parent.nsmap if parent is not None else dict()
+            for prefix in elem.nsmap:
+                if parent_nsmap.get(prefix, None) != elem.nsmap[prefix]:
+                    attributes.append((
+                        'xmlns' if prefix is None else 'xmlns:' + prefix,
+                        elem.nsmap[prefix]))
+            for key in elem.attrib:
+                attributes.append((_get_xml_name(elem, key), elem.attrib[key]))
+            stack.append([name, attributes, dict(), is_custom])
+            continue
+
+        name, attributes, children, is_custom = stack.pop()
+
+        text = ''.join(
+            [elem.text or ''] + [child.tail or '' for child in elem])
+        text = text.strip() or None
+        elem.clear(keep_tail=True)
+
+        if len(attributes) == 0 and len(children) == 0:
+            item = text
+        elif is_custom:
+            item = dict()
+            for key, value in attributes:
+                item['@' + key] = value
+            for tag in children:
+                if len(children[tag]) == 1:
+                    item[tag] = children[tag][0]
+                else:
+                    item[tag] = children[tag]
+            if text:
+                item['#text'] = text
+        else:
+            item = dict()
+            if len(attributes):
+                item['attributes'] = dict()
+                for key, value in attributes:
+                    item['attributes'][key] = convert_from_string(value)
+            for tag in children:
+                if tag in custom_elements:
+                    if len(children[tag]) == 1:
+                        item[tag] = convert_custom(children[tag][0])
+                    else:
+                        item[tag] = convert_custom(children[tag])
+                elif len(children[tag]) > 1:
+                    item[tag] = [
+                        elem_item if isinstance(elem_item, dict)
+                        else convert_from_string(elem_item)
+                        for elem_item in children[tag]]
+                elif isinstance(children[tag][0], dict):
+                    item[tag] = children[tag][0]
+                else:
+                    item[tag] = dict(
+                        value=convert_from_string(children[tag][0]))
+            if text:
+                item['value'] = convert_from_string(text)
+
+        if name not in stack[-1][2]:
+            stack[-1][2][name] = list()
+        stack[-1][2][name].append(item)
+
+    root_name = list(stack[0][2].keys())[0]
+    root = stack[0][2][root_name][0]
+    if root_name in custom_elements:
+        root = convert_custom(root)
+    elif not isinstance(root, dict):
+        root = dict(value=convert_from_string(root))
+    return root_name, root
+
+
 def convert_custom(xml_dict):
     import collections
 
@@ -54,16 +54,10 @@ def create_gazebo_element(tag, *args):
     Gazebo element if `tag` refers to a valid Gazebo element.
     `None`, otherwise.
     """
-    import sys
-    import inspect
-    from ..types import XMLBase
-    current_module = sys.modules[__name__]
-    for name, obj in inspect.getmembers(current_module):
-        if inspect.isclass(obj):
-            if issubclass(obj, XMLBase):
-                if tag == obj._NAME and obj._TYPE == 'gazebo':
-                    return obj(*args)
-    return None
+    obj = create_gazebo_type(tag)
+    if obj is None:
+        return None
+    return obj(*args)
 
 
 def create_gazebo_type(tag):
@@ -77,16 +71,8 @@ def create_gazebo_type(tag):
 
     Gazebo element type if `tag` is valid, `None` otherwise`.
     """
-    import sys
-    import inspect
-    from ..types import XMLBase
-    current_module = sys.modules[__name__]
-    for name, obj in inspect.getmembers(current_module):
-        if inspect.isclass(obj):
-            if issubclass(obj, XMLBase):
-                if tag == obj._NAME and obj._TYPE == 'gazebo':
-                    return obj
-    return None
+    from ..types import get_xml_element_classes
+    return get_xml_element_classes(__name__, 'gazebo').get(tag, None)
 
 
 def is_gazebo_element(obj):
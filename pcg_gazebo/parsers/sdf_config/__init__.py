@@ -38,31 +38,15 @@ def get_all_sdf_config_element_classes():
 
 
 def create_sdf_config_element(tag, *args):
-    import sys
-    import inspect
-    from ..types import XMLBase
-
-    current_module = sys.modules[__name__]
-    for name, obj in inspect.getmembers(current_module):
-        if inspect.isclass(obj):
-            if issubclass(obj, XMLBase):
-                if tag == obj._NAME and obj._TYPE == 'sdf_config':
-                    return obj(*args)
-    return None
+    obj = create_sdf_config_type(tag)
+    if obj is None:
+        return None
+    return obj(*args)
 
 
 def create_sdf_config_type(tag):
-    import sys
-    import inspect
-    from ..types import XMLBase
-
-    current_module = sys.modules[__name__]
-    for name, obj in inspect.getmembers(current_module):
-        if inspect.isclass(obj):
-            if issubclass(obj, XMLBase):
-                if tag == obj._NAME and obj._TYPE == 'sdf_config':
-                    return obj
-    return None
+    from ..types import get_xml_element_classes
+    return get_xml_element_classes(__name__, 'sdf_config').get(tag, None)
 
 
 def is_sdf_config_element(obj):
@@ -13,7 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .base import XMLBase
+from .base import XMLBase, get_xml_element_classes
 from .boolean import XMLBoolean
 from .custom import XMLCustom
 from .integer import XMLInteger
@@ -29,5 +29,6 @@ __all__ = [
     'XMLInteger',
     'XMLScalar',
     'XMLString',
-    'XMLVector'
+    'XMLVector',
+    'get_xml_element_classes'
 ]
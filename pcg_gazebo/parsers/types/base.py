@@ -29,6 +29,10 @@ if sys.version_info[0] == 2:
     from io import open
 
 
+# Names of the valid child elements of each XML element class
+_CHILD_ELEMENT_NAMES = dict()
+
+
 class XMLBase(object):
     # Name of this XML block (e.g. joint)
     _NAME = ''
@@ -63,6 +67,9 @@ class XMLBase(object):
         # Flag to indicate this element can have children that
         # are not only in the children creator's list
         self._has_custom_elements = False
+        # Flag to indicate this element can be added as a child
+        # element without being copied
+        self._is_transferable = False
 
         self._n_optional_elems = 0
         for tag in self._CHILDREN_CREATORS:
@@ -235,6 +242,18 @@ class XMLBase(object):
             # class
             return self._NAME
 
+    @classmethod
+    def _get_child_element_names(cls):
+        if cls not in _CHILD_ELEMENT_NAMES:
+            names = set()
+            for tag in cls._CHILDREN_CREATORS:
+                if cls._CHILDREN_CREATORS[tag]['creator'] is not None:
+                    names.add(cls._CHILDREN_CREATORS[tag]['creator']._NAME)
+                else:
+                    names.add(cls._NAME)
+            _CHILD_ELEMENT_NAMES[cls] = names
+        return _CHILD_ELEMENT_NAMES[cls]
+
     def _get_child_element_creator(self, tag):
         if tag not in self._CHILDREN_CREATORS:
             return None
@@ -310,7 +329,13 @@ class XMLBase(object):
                     return creator()
 
             if issubclass(value.__class__, XMLBase):
-                obj = _create_element(tag)
+                if self._get_child_element_name(tag) == 'empty' or \
+                        value.has_value():
+                    obj = _create_element(tag)
+                else:
+                    assert self._get_child_element_creator(tag) is not None, \
+                        'No creator for {} was found'.format(
+                            tag)
                 if self._get_child_element_name(tag) != 'empty':
                     if value.has_value():
                         if len(value.attributes):
@@ -329,25 +354,22 @@ class XMLBase(object):
                                 value._NAME,
                                 self._get_child_element_name(tag))
 
-                        obj = value
-                        data = value.to_dict(False)
-                        # Checking if the element's attributes are consistent
-                        for elem in data:
-                            # Setting attributes, if provided
-                            if elem == 'attributes':
-                                for att in data[elem]:
-                                    assert att in obj.attributes or hasattr(
-                                        obj, att), 'No attribute <{}>' \
-                                        ' for <{}>'.format(elem, tag)
-                            else:
-                                if not obj.is_valid_element(elem):
-                                    PCG_ROOT_LOGGER.warning(
-                                        'No element <{}> for <{}>,'
-                                        ' input={}'.format(
-                                            elem, tag, value))
+                        # Checking if the element's children are consistent
+                        for elem in value.children:
+                            if value.children[elem] is None:
                                 continue
-                        # Copy element
-                        obj = deepcopy(value)
+                            if not value.is_valid_element(elem):
+                                PCG_ROOT_LOGGER.warning(
+                                    'No element <{}> for <{}>,'
+                                    ' input={}'.format(
+                                        elem, tag, value))
+                        if getattr(value, '_is_transferable', False):
+                            # Take ownership of the element
+                            value._is_transferable = False
+                            obj = value
+                        else:
+                            # Copy element
+                            obj = deepcopy(value)
                     _add_element(obj)
             else:
                 obj = _create_element(tag)
@@ -618,6 +640,20 @@ class XMLBase(object):
         else:
             return self._n_mult_child_counter[tag]
 
+    def transfer(self):
+        """Allow this element to be added as a child of another element
+        without being copied, the parent element then takes ownership of
+        this instance. It should only be used for elements that are not
+        referenced anywhere else, e.g. elements that were just created
+        to be added to a parent element.
+
+        > *Returns*
+
+        This element.
+        """
+        self._is_transferable = True
+        return self
+
     def has_element(self, tag):
         return tag in self.children
 
@@ -627,9 +663,8 @@ class XMLBase(object):
         elif self._has_custom_elements:
             return True
         else:
-            for tag in self._CHILDREN_CREATORS:
-                if name == self._get_child_element_name(tag):
-                    return True
+            if name in self._get_child_element_names():
+                return True
             return hasattr(self, name)
 
     def reset(self, mode=None, with_optional_elements=False):
@@ -710,8 +745,11 @@ class XMLBase(object):
         assert version in self._FORMAT_VERSIONS, \
             'Invalid version, options={}'.format(self._FORMAT_VERSIONS)
         assert self.is_valid(), 'XML data is invalid'
+        # The whole tree has been validated, the child elements
+        # are converted without being validated again
+        return self._to_xml(root, version)
 
-        # Adding attributes
+    def _get_xml_attributes(self, version):
         att = self.get_attributes(version)
         for tag in att:
             # Test if the element has both the options to use
@@ -722,7 +760,41 @@ class XMLBase(object):
                         continue
 
             att[tag] = str(att[tag])
+        return att
 
+    def _get_xml_children(self, version):
+        children = list()
+        for child_name in self.children:
+            if isinstance(self.children[child_name], list):
+                if self._child_exists_in_version(child_name, version):
+                    children += self.children[child_name]
+                else:
+                    PCG_ROOT_LOGGER.info(
+                        '<{}> child element not available'
+                        ' for version {}'.format(
+                            child_name, version))
+            else:
+                # Test if the element has both the options to use
+                # an input as attribute or as a child
+                if self.is_child_and_attribute(child_name):
+                    # If that is the case, check if it was
+                    # explicitly defined as a child or an attribute
+                    if hasattr(self, '_use_{}_as'.format(child_name)):
+                        if getattr(self, '_use_{}_as'.format(
+                                child_name)) == 'child':
+                            children.append(self.children[child_name])
+                elif self._child_exists_in_version(
+                        child_name, version):
+                    children.append(self.children[child_name])
+                else:
+                    PCG_ROOT_LOGGER.info(
+                        '<{}> child element not available'
+                        ' for version {}'.format(
+                            child_name, version))
+        return children
+
+    def _to_xml(self, root, version):
+        att = self._get_xml_attributes(version)
         if root is None:
             base = Element(self._NAME, attrib=att)
         else:
@@ -731,39 +803,29 @@ class XMLBase(object):
         if self.has_value():
             base.text = self.get_formatted_value_as_str()
         else:
-            if len(self.children) > 0:
-                for child_name in self.children:
-                    if isinstance(self.children[child_name], list):
-                        if self._child_exists_in_version(child_name, version):
-                            for elem in self.children[child_name]:
-                                elem.to_xml(base, version)
-                        else:
-                            PCG_ROOT_LOGGER.info(
-                                '<{}> child element not available'
-                                ' for version {}'.format(
-                                    child_name, version))
-                    else:
-                        # Test if the element has both the options to use
-                        # an input as attribute or as a child
-                        if self.is_child_and_attribute(child_name):
-                            # If that is the case, check if it was
-                            # explicitly defined as a child or an attribute
-                            if hasattr(self, '_use_{}_as'.format(child_name)):
-                                if getattr(self, '_use_{}_as'.format(
-                                        child_name)) == 'child':
-                                    self.children[child_name].to_xml(
-                                        base, version)
-                                    continue
-                        elif self._child_exists_in_version(
-                                child_name, version):
-                            self.children[child_name].to_xml(base, version)
-                        else:
-                            PCG_ROOT_LOGGER.info(
-                                '<{}> child element not available'
-                                ' for version {}'.format(
-                                    child_name, version))
+            for child in self._get_xml_children(version):
+                child._to_xml(base, version)
         return base
 
+    def _write_xml(self, xml_file, version, level=0):
+        indent = '  '
+        children = list()
+        if not self.has_value():
+            children = self._get_xml_children(version)
+
+        if len(children) == 0:
+            # Leaf elements are converted and written at once
+            elem = self._to_xml(None, version)
+            _indent_xml_element(elem, level, indent)
+            xml_file.write(elem)
+        else:
+            with xml_file.element(
+                    self._NAME, attrib=self._get_xml_attributes(version)):
+                for child in children:
+                    xml_file.write('\n' + indent * (level + 1))
+                    child._write_xml(xml_file, version, level + 1)
+                xml_file.write('\n' + indent * level)
+
     def to_dict(self, root=True):
         output = dict()
 
@@ -845,15 +907,25 @@ class XMLBase(object):
         return etree.tostring(elem, pretty_print=pretty_print).decode('utf-8')
 
     def export_xml(self, filename, version='1.6'):
-        xml_root = self.to_xml(version=version)
-        with open(filename, 'w+', encoding='utf-8') as output_xml:
-            if sys.version_info[0] == 2:
-                output_xml.write(u'<?xml version="1.0" ?>\n')
-            else:
-                output_xml.write('<?xml version="1.0" ?>\n')
-            output_xml.write(
-                etree.tostring(xml_root, pretty_print=True,
-                               encoding='utf-8').decode('utf-8'))
+        """Export the element as an XML file. The element tree is validated
+        once and the XML elements are written to the file while traversing
+        it, so the XML tree is never fully stored in memory.
+
+        > *Input arguments*
+
+        * `filename` (*type:* `str`): Output filename.
+        * `version` (*type:* `str`, *default:* `1.6`): Version of the
+        output XML format.
+        """
+        assert version in self._FORMAT_VERSIONS, \
+            'Invalid version, options={}'.format(self._FORMAT_VERSIONS)
+        assert self.is_valid(), 'XML data is invalid'
+
+        with open(filename, 'wb') as output_xml:
+            output_xml.write(b'<?xml version="1.0" ?>\n')
+            with etree.xmlfile(output_xml, encoding='utf-8') as xml_file:
+                self._write_xml(xml_file, version)
+            output_xml.write(b'\n')
 
     def to_urdf(self):
         raise NotImplementedError(
@@ -896,3 +968,55 @@ class XMLBase(object):
         info_msg = '[{}] {}'.format(
             self.xml_element_name, msg)
         PCG_ROOT_LOGGER.info(info_msg)
+
+
+# Element classes of each parser module, indexed by the module's name and
+# the XML type, built on first use
+_XML_ELEMENT_CLASSES = dict()
+
+
+def get_xml_element_classes(module_name, xml_type):
+    """Return the XML element classes of type `xml_type` defined in
+    the module `module_name` as a dictionary indexed by the elements'
+    names. The dictionary is computed only once per module and type.
+    If more than one class has the same element name, the first class
+    in alphabetical order is used.
+
+    > *Input arguments*
+
+    * `module_name` (*type:* `str`): Name of the parser module
+    (e.g. `pcg_gazebo.parsers.sdf`).
+    * `xml_type` (*type:* `str`): Type of the XML element classes,
+    options are `sdf`, `urdf`, `sdf_config` or `gazebo`.
+
+    > *Returns*
+
+    `dict`: Element classes indexed by their names.
+    """
+    import inspect
+    key = (module_name, xml_type)
+    if key not in _XML_ELEMENT_CLASSES:
+        classes = dict()
+        for _, obj in inspect.getmembers(sys.modules[module_name]):
+            if inspect.isclass(obj) and issubclass(obj, XMLBase) and \
+                    obj._TYPE == xml_type and obj._NAME not in classes:
+                classes[obj._NAME] = obj
+        _XML_ELEMENT_CLASSES[key] = classes
+    return _XML_ELEMENT_CLASSES[key]
+
+
+def _indent_xml_element(elem, level=0, indent='  '):
+    """Add the whitespace of a pretty printed XML file to the text
+    and tail of the children of `elem`, given the `level` of `elem`
+    in the XML tree.
+    """
+    if len(elem) == 0:
+        return
+    if not elem.text or not elem.text.strip():
+        elem.text = '\n' + indent * (level + 1)
+    for child in elem:
+        _indent_xml_element(child, level + 1, indent)
+        if not child.tail or not child.tail.strip():
+            child.tail = '\n' + indent * (level + 1)
+    if not elem[-1].tail.strip():
+        elem[-1].tail = '\n' + indent * level
@@ -64,7 +64,9 @@ class XMLCustom(XMLBase):
 
     def to_xml(self, root=None, version='1.6'):
         assert self.is_valid(), 'XML data is invalid'
+        return self._to_xml(root, version)
 
+    def _to_xml(self, root, version):
         if root is None:
             base = Element(self._NAME, attrib=self.attributes)
         else:
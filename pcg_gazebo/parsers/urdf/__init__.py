@@ -72,16 +72,10 @@ def create_urdf_element(tag, *args):
     URDF element if `tag` refers to a valid URDF element.
     `None`, otherwise.
     """
-    import sys
-    import inspect
-    from ..types import XMLBase
-    current_module = sys.modules[__name__]
-    for name, obj in inspect.getmembers(current_module):
-        if inspect.isclass(obj):
-            if issubclass(obj, XMLBase):
-                if tag == obj._NAME and obj._TYPE == 'urdf':
-                    return obj(*args)
-    return None
+    obj = create_urdf_type(tag)
+    if obj is None:
+        return None
+    return obj(*args)
 
 
 def create_urdf_type(tag):
@@ -95,16 +89,8 @@ def create_urdf_type(tag):
 
     URDF element type if `tag` is valid, `None` otherwise`.
     """
-    import sys
-    import inspect
-    from ..types import XMLBase
-    current_module = sys.modules[__name__]
-    for name, obj in inspect.getmembers(current_module):
-        if inspect.isclass(obj):
-            if issubclass(obj, XMLBase):
-                if tag == obj._NAME and obj._TYPE == 'urdf':
-                    return obj
-    return None
+    from ..types import get_xml_element_classes
+    return get_xml_element_classes(__name__, 'urdf').get(tag, None)
 
 
 def is_urdf_element(obj):
@@ -15,18 +15,36 @@
 import os
 import re
 from .log import PCG_ROOT_LOGGER
-from .utils import is_string
-try:
-    import rospkg
-    ROS1_AVAILABLE = True
-except ImportError:
-    ROS1_AVAILABLE = False
-
-try:
-    import ament_index_python
-    ROS2_AVAILABLE = True
-except ImportError:
-    ROS2_AVAILABLE = False
+from .utils import is_string, get_ros_packages, get_ros_path, \
+    get_ros_package_name
+
+# Resolved URIs stored as (absolute URI, Gazebo model, ROS package)
+# tuples, and the Gazebo model and ROS package found for the folders
+# of the resolved files. The cache is cleared when the Gazebo model or
+# ROS package indexes change.
+_PATH_CACHE = dict(
+    uris=dict(),
+    gazebo_models=dict(),
+    ros_packages=dict(),
+    max_size=100000)
+
+
+def _get_uri_cache_key(uri):
+    # Relative paths are resolved against the current directory
+    if os.path.isabs(uri) or uri.startswith('$') or '://' in uri:
+        return uri
+    return (os.getcwd(), uri)
+
+
+def clear_path_cache():
+    """Discard all resolved URIs. Resolved files that do not exist
+    anymore are detected automatically, but the cache must be cleared
+    if a URI should resolve to a different file after, for example,
+    a Gazebo model or a ROS package has been moved.
+    """
+    _PATH_CACHE['uris'].clear()
+    _PATH_CACHE['gazebo_models'].clear()
+    _PATH_CACHE['ros_packages'].clear()
 
 
 class Path(object):
@@ -48,9 +66,7 @@ class Path(object):
         assert is_string(uri), 'Input URI must be a string'
 
         self._original_uri = uri
-        self._gazebo_model = None
-        self._ros_pkg = None
-        self._absolute_uri = self.resolve_uri(uri)
+        self._set_absolute_uri(uri)
         if self._absolute_uri is None:
             msg = 'URI could not be resolved, uri={}'.format(uri)
             PCG_ROOT_LOGGER.info(msg)
@@ -85,9 +101,7 @@ class Path(object):
     def original_uri(self, value):
         assert is_string(value), 'Input URI must be a string'
         self._original_uri = value
-        self._gazebo_model = None
-        self._ros_pkg = None
-        self._absolute_uri = self.resolve_uri(value)
+        self._set_absolute_uri(value)
         if self._absolute_uri is None:
             msg = 'URI could not be resolved, uri={}'.format(value)
             PCG_ROOT_LOGGER.warning(msg)
@@ -140,7 +154,6 @@ class Path(object):
 
     @property
     def ros_package_uri(self):
-        self.resolve_uri(self._absolute_uri)
         if self._ros_pkg is None:
             return None
         relative_path = self._absolute_uri.replace(
@@ -151,19 +164,32 @@ class Path(object):
             prefix += '/'
         return prefix + relative_path
 
+    def _set_absolute_uri(self, uri):
+        """Resolve `uri` and store the results, reusing the results of
+        a previous resolution of `uri` if the resolved file still
+        exists.
+        """
+        cache = _PATH_CACHE['uris']
+        key = _get_uri_cache_key(uri)
+        if key in cache:
+            if os.path.exists(cache[key][0]):
+                self._absolute_uri, self._gazebo_model, self._ros_pkg = \
+                    cache[key]
+                return
+            del cache[key]
+
+        self._gazebo_model = None
+        self._ros_pkg = None
+        self._absolute_uri = self.resolve_uri(uri)
+        if self._absolute_uri is not None:
+            if len(cache) >= _PATH_CACHE['max_size']:
+                cache.pop(next(iter(cache)))
+            cache[key] = (
+                self._absolute_uri, self._gazebo_model, self._ros_pkg)
+
     def _get_ros_package_name(self, filename):
-        if ROS1_AVAILABLE:
-            finder = rospkg.RosPack()
-            if os.path.isfile(filename):
-                for pkg_name in finder.list():
-                    if finder.get_path(pkg_name) in filename:
-                        return pkg_name
-        else:
-            pkgs = ament_index_python.get_packages_with_prefixes()
-            if os.path.isfile(filename):
-                for pkg_name in pkgs.keys():
-                    if pkgs[pkg_name] in filename:
-                        return pkg_name
+        if os.path.isfile(filename):
+            return get_ros_package_name(filename)
         return None
 
     def resolve_uri(self, uri):
@@ -246,55 +272,36 @@ class Path(object):
             return None
 
     def _find_ros_package_resources_path(self, pkg):
-        if not ROS1_AVAILABLE and not ROS2_AVAILABLE:
-            return None
-
-        ros_package_path = None
-        if ROS1_AVAILABLE:
-            try:
-                ros_package_path = rospkg.RosPack().get_path(pkg)
-            except rospkg.ResourceNotFound:
-                pass
-
-        if ROS2_AVAILABLE:
-            try:
-                ros_package_path = \
-                    ament_index_python.get_package_share_directory(pkg)
-            except ament_index_python.PackageNotFoundError:
-                pass
-        return ros_package_path
+        return get_ros_path(pkg)
 
     def _resolve_gazebo_model(self):
-        from .simulation import get_gazebo_model_names, \
-            get_gazebo_model_path, load_gazebo_models
-
-        load_gazebo_models()
-        for name in get_gazebo_model_names():
-            gazebo_path = get_gazebo_model_path(name)
-            if gazebo_path in os.path.dirname(self.absolute_uri):
-                self._gazebo_model = name
-                return
+        from .simulation import get_gazebo_models
+        if self._absolute_uri is None:
+            return
+        cache = _PATH_CACHE['gazebo_models']
+        folder = os.path.dirname(self._absolute_uri)
+        if folder not in cache:
+            models = get_gazebo_models()
+            cache[folder] = None
+            for name in models:
+                if models[name]['path'] in folder:
+                    cache[folder] = name
+                    break
+        self._gazebo_model = cache[folder]
 
     def _resolve_ros_package(self):
-        pkgs = list()
-        if ROS1_AVAILABLE:
-            pkgs = pkgs + list(rospkg.RosPack().list())
-        elif ROS2_AVAILABLE:
-            pkgs = pkgs + list(
-                ament_index_python.get_packages_with_prefixes().keys())
-
-        for ros_pkg in pkgs:
-            pkg_path = self._find_ros_package_resources_path(ros_pkg)
-            if pkg_path in os.path.dirname(self.absolute_uri):
-                self._ros_pkg = ros_pkg
-                return
+        if self._absolute_uri is None:
+            return
+        cache = _PATH_CACHE['ros_packages']
+        folder = os.path.dirname(self._absolute_uri)
+        if folder not in cache:
+            ros_pkgs = get_ros_packages()
+            cache[folder] = None
+            for ros_pkg in ros_pkgs:
+                if ros_pkgs[ros_pkg] in folder:
+                    cache[folder] = ros_pkg
+                    break
+        self._ros_pkg = cache[folder]
 
     def _is_ros_package(self, pkg):
-        if ROS1_AVAILABLE:
-            if pkg in rospkg.RosPack().list():
-                return True
-        if ROS2_AVAILABLE:
-            if pkg in \
-                    ament_index_python.get_packages_with_prefixes().keys():
-                return True
-        return False
+        return pkg in get_ros_packages()
@@ -52,3 +52,15 @@ def uniform(*args, **kwargs):
     if PCG_RANDOM_STATE is None:
         init_random_state()
     return PCG_RANDOM_STATE.uniform(*args, **kwargs)
+
+
+def get_state():
+    if PCG_RANDOM_STATE is None:
+        init_random_state()
+    return PCG_RANDOM_STATE.get_state()
+
+
+def set_state(state):
+    if PCG_RANDOM_STATE is None:
+        init_random_state()
+    PCG_RANDOM_STATE.set_state(state)
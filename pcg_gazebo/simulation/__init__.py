@@ -15,6 +15,9 @@
 """Simulation interface module, with abstraction classes for all relevant
 entities that form a simulation in Gazebo.
 """
+from collections import OrderedDict
+import json
+import os
 from . import properties
 from . import physics
 from . import components
@@ -37,6 +40,32 @@ GAZEBO_MODELS = dict()
 
 CUSTOM_GAZEBO_RESOURCE_PATHS = list()
 
+# File where the index of Gazebo models is persisted between sessions,
+# set to None to keep the index only in memory
+GAZEBO_MODELS_CACHE_FILE = os.path.join(
+    os.path.expanduser('~'), '.pcg', 'cache', 'gazebo_models.json')
+
+_GAZEBO_MODELS_CACHE_VERSION = 1
+
+# State of the Gazebo model index: the search paths and the key of the
+# environment they were computed for, the scan results for each search
+# path with the modification times of all directories visited, and the
+# model names that could not be found since the last change of the index
+_GAZEBO_MODELS_INDEX = dict(
+    search_paths=None,
+    search_paths_key=None,
+    scans=None,
+    missing=set())
+
+# Simulation models parsed from Gazebo model SDF files, indexed by the SDF
+# file's path and stored with the file's modification time, in order of
+# last access
+_GAZEBO_MODEL_TEMPLATES = dict(
+    templates=OrderedDict(),
+    max_size=128,
+    hits=0,
+    misses=0)
+
 
 def create_object(tag, **kwargs):
     """Factory method for `Link` subclasses.
@@ -62,7 +91,6 @@ def create_object(tag, **kwargs):
 
 
 def add_custom_gazebo_resource_path(dir_path):
-    import os
     from ..log import PCG_ROOT_LOGGER
     if not os.path.isdir(dir_path):
         PCG_ROOT_LOGGER.error(
@@ -79,32 +107,41 @@ def add_custom_gazebo_resource_path(dir_path):
     return True
 
 
-def get_gazebo_model_folders(dir_path):
+def get_gazebo_model_folders(dir_path, mtimes=None):
     """Return the paths to all Gazebo model folders under the
     directory `dir_path`.
 
     > *Input arguments*
 
     * `dir_path` (*type:* `str`): Path to the search directory.
+    * `mtimes` (*type:* `dict`, *default:* `None`): If provided,
+    the modification time of each directory listed during the
+    search is stored in it, indexed by the directory's path.
 
     > *Returns*
 
     `dict`: Gazebo model paths ordered according to the
     Gazebo model names.
     """
-    import os
     assert os.path.isdir(dir_path), \
         'Invalid directory path, path={}'.format(dir_path)
 
+    if mtimes is not None:
+        mtimes[dir_path] = os.stat(dir_path).st_mtime
+
     models_paths = dict()
     for item in os.listdir(dir_path):
-        if os.path.isdir(os.path.join(dir_path, item)):
+        item_path = os.path.join(dir_path, item)
+        if os.path.isdir(item_path):
             has_config = False
             has_sdf = False
             sdf_files = list()
 
-            for subitem in os.listdir(os.path.join(dir_path, item)):
-                if os.path.isfile(os.path.join(dir_path, item, subitem)):
+            if mtimes is not None:
+                mtimes[item_path] = os.stat(item_path).st_mtime
+
+            for subitem in os.listdir(item_path):
+                if os.path.isfile(os.path.join(item_path, subitem)):
                     if '.config' in subitem:
                         has_config = True
                     if '.sdf' in subitem:
@@ -113,113 +150,250 @@ def get_gazebo_model_folders(dir_path):
 
             if has_config and has_sdf:
                 models_paths[item] = dict(
-                    path=os.path.join(dir_path, item),
+                    path=item_path,
                     sdf=sdf_files)
             else:
                 models_paths.update(
-                    get_gazebo_model_folders(
-                        os.path.join(
-                            dir_path, item)))
+                    get_gazebo_model_folders(item_path, mtimes))
     return models_paths
 
 
-def load_gazebo_models():
-    """Search for Gazebo models in the local `.gazebo/models` folder
-    and in the ROS paths.
+def _get_gazebo_model_search_paths_key():
+    return [
+        os.environ.get('GAZEBO_MODEL_PATH', None),
+        os.environ.get('ROS_PACKAGE_PATH', None),
+        os.environ.get('AMENT_PREFIX_PATH', None),
+        list(CUSTOM_GAZEBO_RESOURCE_PATHS)]
 
-    > *Returns*
 
-    `dict`: Information of all Gazebo models found
+def _get_gazebo_model_search_paths():
+    """Return the list of `(folder, ros_pkg)` tuples of the directories
+    where Gazebo models are searched for, in order of priority. For
+    ROS packages, `folder` is the package's path and `ros_pkg` is the
+    package's name, otherwise `ros_pkg` is `None`.
     """
-    import os
-    try:
-        import rospkg
-        ROS1_AVAILABLE = True
-    except ImportError:
-        ROS1_AVAILABLE = False
-
-    try:
-        import ament_index_python
-        ROS2_AVAILABLE = True
-    except ImportError:
-        ROS2_AVAILABLE = False
-
-    global GAZEBO_MODELS
-    GAZEBO_MODELS = dict()
-
-    ros_pkgs = list()
-    if ROS1_AVAILABLE:
-        ros_pkgs = ros_pkgs + list(rospkg.RosPack().list())
-    if ROS2_AVAILABLE:
-        ros_pkgs = ros_pkgs + list(
-            ament_index_python.get_packages_with_prefixes().keys())
-    if '/opt/ros/kinetic/share' not in rospkg.RosPack().ros_paths: # TEMP TEMP TEMP
-        # Load all models from catkin packages
-        for ros_pkg in ros_pkgs:
-            ros_path = None
-            # print("line 110.")
-            print(ros_pkg)
-            if ROS1_AVAILABLE:
-                try:
-                    ros_path = rospkg.RosPack().get_path(ros_pkg)
-                except rospkg.ResourceNotFound:
-                    pass
-            if ROS2_AVAILABLE and ros_path is None:
-                try:
-                    ros_path = \
-                        ament_index_python.get_package_share_directory(
-                            ros_pkg)
-                except ament_index_python.PackageNotFoundError:
-                    pass
-            
-            if ros_path: 
-                for folder in os.listdir(ros_path):
-                    if not os.path.isdir(os.path.join(ros_path, folder)):
-                        continue
-                    models = get_gazebo_model_folders(
-                        os.path.join(ros_path, folder))
-                    # print("line 110.")
-                    # print(os.path.join(ros_path, folder))
-                    # print(models)
-                    for tag in models:
-                        models[tag]['ros_pkg'] = ros_pkg
-                    GAZEBO_MODELS.update(models)
+    from ..utils import _load_ros_packages
+    search_paths = list()
+
+    ros_packages = _load_ros_packages()
+    ros_pkgs = OrderedDict()
+    # The ROS packages are not searched for models in kinetic
+    # installations
+    if '/opt/ros/kinetic/share' not in ros_packages['ros_paths']:
+        ros_pkgs.update(ros_packages['ros1'])
+    for ros_pkg in ros_packages['ros2']:
+        if ros_pkg not in ros_pkgs:
+            ros_pkgs[ros_pkg] = ros_packages['ros2'][ros_pkg]
+
+    # Load all models from catkin packages
+    for ros_pkg, ros_path in ros_pkgs.items():
+        if os.path.isdir(ros_path):
+            search_paths.append((ros_path, ros_pkg))
 
     # Load all models from ~/.gazebo/models
     home_folder = os.path.expanduser('~')
     gazebo_folder = os.path.join(home_folder, '.gazebo', 'models')
     if os.path.isdir(gazebo_folder):
-        GAZEBO_MODELS.update(get_gazebo_model_folders(gazebo_folder))
+        search_paths.append((gazebo_folder, None))
 
     gazebo_folder = None
-    for folder in os.listdir('/usr/share'):
-        if 'gazebo-' in folder:
-            gazebo_folder = os.path.join('/usr', 'share', folder, 'models')
-            break
+    if os.path.isdir('/usr/share'):
+        for folder in os.listdir('/usr/share'):
+            if 'gazebo-' in folder:
+                gazebo_folder = os.path.join('/usr', 'share', folder, 'models')
+                break
 
     if gazebo_folder is not None:
         if os.path.isdir(gazebo_folder):
-            GAZEBO_MODELS.update(get_gazebo_model_folders(gazebo_folder))
+            search_paths.append((gazebo_folder, None))
 
     # Parse the GAZEBO_MODEL_PATH, if available
     if 'GAZEBO_MODEL_PATH' in os.environ:
         for folder in os.environ['GAZEBO_MODEL_PATH'].split(':'):
             if os.path.isdir(folder):
-                GAZEBO_MODELS.update(get_gazebo_model_folders(folder))
+                search_paths.append((folder, None))
+
+    for folder in CUSTOM_GAZEBO_RESOURCE_PATHS:
+        search_paths.append((folder, None))
+    return search_paths
+
+
+def _scan_gazebo_model_search_path(folder, ros_pkg=None):
+    """Search for Gazebo models in `folder` and return the models
+    found together with the modification times of all directories
+    visited, so that the result can be reused until any of them
+    changes.
+    """
+    mtimes = dict()
+    if ros_pkg is None:
+        models = get_gazebo_model_folders(folder, mtimes)
+    else:
+        # Only the subfolders of the ROS package are searched
+        mtimes[folder] = os.stat(folder).st_mtime
+        models = dict()
+        for item in os.listdir(folder):
+            if not os.path.isdir(os.path.join(folder, item)):
+                continue
+            models.update(get_gazebo_model_folders(
+                os.path.join(folder, item), mtimes))
+        for tag in models:
+            models[tag]['ros_pkg'] = ros_pkg
+    return dict(ros_pkg=ros_pkg, mtimes=mtimes, models=models)
+
+
+def _is_gazebo_model_scan_valid(scan, ros_pkg=None):
+    if scan is None or scan.get('ros_pkg', None) != ros_pkg:
+        return False
+    for dir_path in scan['mtimes']:
+        try:
+            if os.stat(dir_path).st_mtime != scan['mtimes'][dir_path]:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _read_gazebo_models_cache():
+    from ..log import PCG_ROOT_LOGGER
+    if GAZEBO_MODELS_CACHE_FILE is None or \
+            not os.path.isfile(GAZEBO_MODELS_CACHE_FILE):
+        return dict()
+    try:
+        with open(GAZEBO_MODELS_CACHE_FILE, 'r') as cache_file:
+            cache = json.load(cache_file)
+        if cache.get('version', None) != _GAZEBO_MODELS_CACHE_VERSION:
+            return dict()
+        return cache['scans']
+    except (IOError, OSError, ValueError, KeyError) as ex:
+        PCG_ROOT_LOGGER.warning(
+            'Could not read the Gazebo models cache file {}, '
+            'message={}'.format(GAZEBO_MODELS_CACHE_FILE, ex))
+        return dict()
+
+
+def _write_gazebo_models_cache(scans):
+    from ..log import PCG_ROOT_LOGGER
+    if GAZEBO_MODELS_CACHE_FILE is None:
+        return
+    tmp_filename = '{}.{}.tmp'.format(GAZEBO_MODELS_CACHE_FILE, os.getpid())
+    try:
+        cache_dir = os.path.dirname(GAZEBO_MODELS_CACHE_FILE)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with open(tmp_filename, 'w') as cache_file:
+            json.dump(
+                dict(version=_GAZEBO_MODELS_CACHE_VERSION, scans=scans),
+                cache_file)
+        os.replace(tmp_filename, GAZEBO_MODELS_CACHE_FILE)
+    except (IOError, OSError) as ex:
+        PCG_ROOT_LOGGER.warning(
+            'Could not write the Gazebo models cache file {}, '
+            'message={}'.format(GAZEBO_MODELS_CACHE_FILE, ex))
+
+
+def load_gazebo_models(refresh=False):
+    """Search for Gazebo models in the local `.gazebo/models` folder
+    and in the ROS paths.
+
+    The results are kept in an index that is persisted in
+    `GAZEBO_MODELS_CACHE_FILE`, and a search path is only scanned again
+    if any of the directories found in its last scan has been modified.
+    The search paths themselves are recomputed when the
+    `GAZEBO_MODEL_PATH`, `ROS_PACKAGE_PATH` or `AMENT_PREFIX_PATH`
+    environment variables or the custom resource paths change.
+
+    > *Input arguments*
+
+    * `refresh` (*type:* `bool`, *default:* `False`): If `True`,
+    discard the cached index and scan all search paths again.
+
+    > *Returns*
 
-    if len(CUSTOM_GAZEBO_RESOURCE_PATHS) > 0:
-        for folder in CUSTOM_GAZEBO_RESOURCE_PATHS:
-            GAZEBO_MODELS.update(get_gazebo_model_folders(folder))
-    print("line 111.")
+    `dict`: Information of all Gazebo models found
+    """
+    from ..path import clear_path_cache
+    from ..utils import _load_ros_packages
+    index = _GAZEBO_MODELS_INDEX
+
+    if refresh:
+        index['scans'] = dict()
+        index['search_paths'] = None
+        _load_ros_packages(refresh=True)
+    elif index['scans'] is None:
+        index['scans'] = _read_gazebo_models_cache()
+
+    search_paths_key = _get_gazebo_model_search_paths_key()
+    if index['search_paths'] is None or \
+            index['search_paths_key'] != search_paths_key:
+        index['search_paths'] = _get_gazebo_model_search_paths()
+        index['search_paths_key'] = search_paths_key
+
+    is_updated = False
+    for folder, ros_pkg in index['search_paths']:
+        if not _is_gazebo_model_scan_valid(
+                index['scans'].get(folder, None), ros_pkg):
+            index['scans'][folder] = _scan_gazebo_model_search_path(
+                folder, ros_pkg)
+            is_updated = True
+
+    if is_updated:
+        # Scans of paths that are no longer searched are discarded
+        index['scans'] = {
+            folder: index['scans'][folder]
+            for folder, _ in index['search_paths']}
+
+    models = dict()
+    for folder, _ in index['search_paths']:
+        models.update(index['scans'][folder]['models'])
+
+    if is_updated or refresh or models != GAZEBO_MODELS:
+        index['missing'] = set()
+        clear_path_cache()
+    if is_updated:
+        _write_gazebo_models_cache(index['scans'])
+
+    GAZEBO_MODELS.clear()
+    GAZEBO_MODELS.update(models)
     return GAZEBO_MODELS
 
 
+def _update_gazebo_models():
+    """Load the index of Gazebo models if it has not been loaded yet
+    or if its search paths have changed, otherwise the current index
+    is used as is.
+    """
+    index = _GAZEBO_MODELS_INDEX
+    if index['search_paths'] is None or \
+            index['search_paths_key'] != \
+            _get_gazebo_model_search_paths_key():
+        load_gazebo_models()
+
+
+def _find_gazebo_model(name):
+    """Return the index entry for the Gazebo model `name`. The search
+    paths are only checked for changes if `name` is not in the index,
+    and names that could not be found are not searched again until
+    the index changes or is refreshed.
+    """
+    _update_gazebo_models()
+    if name in GAZEBO_MODELS:
+        return GAZEBO_MODELS[name]
+    if name in _GAZEBO_MODELS_INDEX['missing']:
+        return None
+    # Try reloading the models
+    load_gazebo_models()
+    if name in GAZEBO_MODELS:
+        return GAZEBO_MODELS[name]
+    _GAZEBO_MODELS_INDEX['missing'].add(name)
+    return None
+
+
 def get_gazebo_models():
     """Return the information of all Gazebo models found in the
     local `.gazebo/models` folder and in the catkin workspace as
     a dictionary.
     """
-    load_gazebo_models()
+    _update_gazebo_models()
     return GAZEBO_MODELS
 
 
@@ -227,7 +401,7 @@ def get_gazebo_model_names():
     """Return the names of all Gazebo models that can be found
     is the local `.gazebo/models` folders and catkin workspace.
     """
-    load_gazebo_models()
+    _update_gazebo_models()
     return GAZEBO_MODELS.keys()
 
 
@@ -235,9 +409,6 @@ def get_gazebo_model_ros_pkg(name):
     """Return name of the ROS package where the Gazebo model is
     located, None if it was found in .gazebo/models.
     """
-    if name not in GAZEBO_MODELS:
-        # Try reloading the models
-        load_gazebo_models()
     if not is_gazebo_model(name):
         raise ValueError('{} is not a Gazebo model'.format(name))
     if 'ros_pkg' in GAZEBO_MODELS[name]:
@@ -258,13 +429,10 @@ def is_gazebo_model(name, include_custom_paths=False):
 
     `True` if `name` refers to a Gazebo model.
     """
-    if name not in GAZEBO_MODELS:
-        # Try reloading the models
-        load_gazebo_models()
-    if name in GAZEBO_MODELS:
+    model = _find_gazebo_model(name)
+    if model is not None:
         if not include_custom_paths and \
-                is_in_custom_gazebo_resources_path(
-                    GAZEBO_MODELS[name]['path']):
+                is_in_custom_gazebo_resources_path(model['path']):
             return False
         else:
             return True
@@ -281,14 +449,12 @@ def is_in_custom_gazebo_resources_path(dir_path):
 
 def get_gazebo_model_sdf_filenames(model_name):
     from ..log import PCG_ROOT_LOGGER
-    if model_name not in GAZEBO_MODELS:
-        # Try reloading the models
-        load_gazebo_models()
-        if model_name not in GAZEBO_MODELS:
-            PCG_ROOT_LOGGER.error(
-                'Model {} could not be found'.format(model_name))
-            return None
-    return GAZEBO_MODELS[model_name]['sdf']
+    model = _find_gazebo_model(model_name)
+    if model is None:
+        PCG_ROOT_LOGGER.error(
+            'Model {} could not be found'.format(model_name))
+        return None
+    return model['sdf']
 
 
 def get_gazebo_model_path(model_name):
@@ -303,14 +469,12 @@ def get_gazebo_model_path(model_name):
     `str`: Path of the Gazebo model folder
     """
     from ..log import PCG_ROOT_LOGGER
-    if model_name not in GAZEBO_MODELS:
-        # Try reloading the models
-        load_gazebo_models()
-        if model_name not in GAZEBO_MODELS:
-            PCG_ROOT_LOGGER.error(
-                'Model {} could not be found'.format(model_name))
-            return None
-    return GAZEBO_MODELS[model_name]['path']
+    model = _find_gazebo_model(model_name)
+    if model is None:
+        PCG_ROOT_LOGGER.error(
+            'Model {} could not be found'.format(model_name))
+        return None
+    return model['path']
 
 
 def get_gazebo_model_sdf(model_name, sdf_file='model.sdf'):
@@ -327,26 +491,136 @@ def get_gazebo_model_sdf(model_name, sdf_file='model.sdf'):
 
     `pcg_gazebo.parsers.types.XMLBase` instance as an SDF element.
     """
-    import os
     from ..log import PCG_ROOT_LOGGER
     from ..parsers import parse_sdf
 
-    if model_name not in GAZEBO_MODELS:
-        # Try reloading the models
-
-        load_gazebo_models()
-        if model_name not in GAZEBO_MODELS:
-            PCG_ROOT_LOGGER.error(
-                'Model {} could not be found'.format(model_name))
-            return None
+    model = _find_gazebo_model(model_name)
+    if model is None:
+        PCG_ROOT_LOGGER.error(
+            'Model {} could not be found'.format(model_name))
+        return None
 
-    if sdf_file not in GAZEBO_MODELS[model_name]['sdf']:
+    if sdf_file not in model['sdf']:
         PCG_ROOT_LOGGER.error(
             'SDF file {} not found for model {}, options are={}'.format(
-                sdf_file, model_name, GAZEBO_MODELS[model_name]['sdf']))
+                sdf_file, model_name, model['sdf']))
+        return None
+
+    return parse_sdf(os.path.join(model['path'], sdf_file))
+
+
+def get_gazebo_model_template(model_name, sdf_file='model.sdf'):
+    """Return the `SimulationModel` template parsed from the Gazebo
+    model's SDF file. Templates are cached according to the SDF file's
+    path and modification time, so the file is only parsed again
+    if it has been modified. The returned model must not be altered,
+    use `SimulationModel.from_gazebo_model` to get an independent copy.
+
+    > *Input arguments*
+
+    * `model_name` (*type:* `str`): Name of the Gazebo model.
+    * `sdf_file` (*type:* `str`, *default:* `model.sdf`): Name
+    of the SDF file to be parsed.
+
+    > *Returns*
+
+    `pcg_gazebo.simulation.SimulationModel` template, `None` if the model
+    could not be found. `ValueError` is raised if the SDF file does not
+    contain exactly one model.
+    """
+    from ..log import PCG_ROOT_LOGGER
+    cache = _GAZEBO_MODEL_TEMPLATES
+
+    model_path = get_gazebo_model_path(model_name)
+    if model_path is None:
         return None
+    filename = os.path.join(model_path, sdf_file)
+    try:
+        mtime = os.stat(filename).st_mtime
+    except OSError:
+        mtime = None
+
+    if mtime is not None and filename in cache['templates']:
+        cached_mtime, template, error_msg = cache['templates'][filename]
+        if cached_mtime == mtime:
+            cache['hits'] += 1
+            cache['templates'].move_to_end(filename)
+            if error_msg is not None:
+                raise ValueError(error_msg)
+            return template
+
+    cache['misses'] += 1
+    sdf = get_gazebo_model_sdf(model_name, sdf_file)
+    if sdf is None:
+        return None
+
+    template = None
+    error_msg = None
+    if sdf.models is None:
+        error_msg = 'No models found in Gazebo model {}'.format(model_name)
+        PCG_ROOT_LOGGER.warning(error_msg)
+    elif len(sdf.models) != 1:
+        error_msg = 'Imported SDF file should have one model only'
+        PCG_ROOT_LOGGER.error(error_msg)
+    else:
+        template = SimulationModel.from_sdf(sdf.models[0])
+        template.is_gazebo_model = True
+        template._source_model_name = model_name
+        template.name = model_name
+
+    if mtime is not None and cache['max_size'] > 0:
+        cache['templates'][filename] = (mtime, template, error_msg)
+        cache['templates'].move_to_end(filename)
+        while len(cache['templates']) > cache['max_size']:
+            cache['templates'].popitem(last=False)
+
+    if error_msg is not None:
+        raise ValueError(error_msg)
+    return template
+
 
-    return parse_sdf(os.path.join(GAZEBO_MODELS[model_name]['path'], sdf_file))
+def set_gazebo_model_templates_cache_size(max_size):
+    """Set the maximum number of Gazebo model templates kept in the
+    cache, the least recently used templates are discarded first.
+
+    > *Input arguments*
+
+    * `max_size` (*type:* `int`): Maximum number of templates, `0`
+    disables the cache.
+    """
+    assert isinstance(max_size, int) and max_size >= 0, \
+        'Cache size must be a non-negative integer, value={}'.format(
+            max_size)
+    cache = _GAZEBO_MODEL_TEMPLATES
+    cache['max_size'] = max_size
+    while len(cache['templates']) > max_size:
+        cache['templates'].popitem(last=False)
+
+
+def get_gazebo_model_templates_cache_info():
+    """Return the statistics of the Gazebo model templates cache.
+
+    > *Returns*
+
+    `dict`: Number of cache `hits` and `misses`, current number
+    of templates `size` and `max_size`.
+    """
+    cache = _GAZEBO_MODEL_TEMPLATES
+    return dict(
+        hits=cache['hits'],
+        misses=cache['misses'],
+        size=len(cache['templates']),
+        max_size=cache['max_size'])
+
+
+def clear_gazebo_model_templates_cache():
+    """Remove all templates from the Gazebo model templates cache
+    and reset its statistics.
+    """
+    cache = _GAZEBO_MODEL_TEMPLATES
+    cache['templates'].clear()
+    cache['hits'] = 0
+    cache['misses'] = 0
 
 
 __all__ = [
@@ -368,7 +642,9 @@ __all__ = [
     'World',
     'GAZEBO_MODELS',
     'CUSTOM_GAZEBO_RESOURCE_PATHS',
+    'GAZEBO_MODELS_CACHE_FILE',
     'add_custom_gazebo_resource_path',
+    'clear_gazebo_model_templates_cache',
     'create_object',
     'get_gazebo_model_folders',
     'get_gazebo_model_names',
@@ -376,8 +652,11 @@ __all__ = [
     'get_gazebo_model_ros_pkg',
     'get_gazebo_model_sdf',
     'get_gazebo_model_sdf_filenames',
+    'get_gazebo_model_template',
+    'get_gazebo_model_templates_cache_info',
     'get_gazebo_models',
     'is_gazebo_model',
     'is_in_custom_gazebo_resources_path',
-    'load_gazebo_models'
+    'load_gazebo_models',
+    'set_gazebo_model_templates_cache_size'
 ]
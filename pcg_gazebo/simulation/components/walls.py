@@ -22,7 +22,6 @@ from ...generators.shapes import rectangle, random_rectangle, \
     random_points_to_triangulation, triangulate_points, \
     random_rectangles, random_orthogonal_lines
 from ...generators.mesh import extrude
-from ...visualization import plot_shapely_geometry
 from ...log import PCG_ROOT_LOGGER
 
 
@@ -449,6 +448,7 @@ class Walls(SimulationModel):
             reference_geo_color='tab:blue',
             wall_geo_color='tab:gray',
             interior_geo_color='tab:pink'):
+        from ...visualization import plot_shapely_geometry
         for tag in self._wall_polygons:
             fig, ax = plot_shapely_geometry(
                 fig=fig,
@@ -501,6 +501,7 @@ class Walls(SimulationModel):
             line_width=2,
             line_style='solid',
             color='tab:blue'):
+        from ...visualization import plot_shapely_geometry
         for geo in self._geometries:
             fig, ax = plot_shapely_geometry(
                 fig=fig,
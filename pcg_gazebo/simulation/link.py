@@ -665,7 +665,7 @@ class Link(Entity):
                     resource_prefix=rp,
                     model_folder=model_folder,
                     copy_resources=copy_resources)
-                link.add_collision(sdf.name, sdf)
+                link.add_collision(sdf.name, sdf.transfer())
         # Add visual elements
         if self._include_in_sdf['visual']:
             for item in self._visuals:
@@ -679,19 +679,19 @@ class Link(Entity):
                     resource_prefix=rp,
                     model_folder=model_folder,
                     copy_resources=copy_resources)
-                link.add_visual(sdf.name, sdf)
+                link.add_visual(sdf.name, sdf.transfer())
 
         for tag in self._sensors:
-            link.add_sensor(tag, self._sensors[tag].to_sdf())
+            link.add_sensor(tag, self._sensors[tag].to_sdf().transfer())
 
         for tag in self._plugins:
-            link.add_plugin(tag, self._plugins[tag].to_sdf())
+            link.add_plugin(tag, self._plugins[tag].to_sdf().transfer())
 
         for tag in self._lights:
             link.add_light(tag, self._lights[tag].to_sdf())
 
         if self._inertial is not None:
-            link.inertial = self._inertial.to_sdf()
+            link.inertial = self._inertial.to_sdf().transfer()
 
         if type == 'link':
             link.pose = self.pose.to_sdf()
@@ -1008,6 +1008,31 @@ class Link(Entity):
 
         List of `trimesh` meshes.
         """
+        meshes = list()
+        for mesh, transform in self.get_mesh_transforms(
+                mesh_type, pose_offset):
+            mesh = mesh.copy()
+            mesh.apply_transform(transform)
+            meshes.append(mesh)
+        return meshes
+
+    def get_mesh_transforms(self, mesh_type='collision', pose_offset=None):
+        """Return all the meshes associated with this link in their
+        local frames and the transforms that place them in the link's
+        parent frame. The meshes are shared and must not be modified.
+
+        > *Input arguments*
+
+        * `mesh_type` (*type:* `str`, *default:* `collision`): Type of mesh
+        to be returned, options are `visual` or `collision`.
+        * `pose_offset` (*type:* `list`, *default:* `None`): Pose offset
+        to be applied to all meshes.
+
+        > *Returns*
+
+        List of `(trimesh.Trimesh, numpy.ndarray)` tuples with the
+        mesh and its 4x4 homogeneous transform.
+        """
         assert mesh_type in ['collision', 'visual'], \
             'Origin of footprints must be either collision' \
             ' or visual geometries'
@@ -1035,7 +1060,7 @@ class Link(Entity):
         for pose, geometry in zip(poses, geometries):
             geometry_pose = combined_pose + pose
 
-            geo_meshes = geometry.get_mesh(
+            geo_meshes = geometry.get_mesh_transforms(
                 geometry_pose.position, geometry_pose.quat)
             if geo_meshes is not None:
                 meshes += geo_meshes
@@ -17,7 +17,7 @@ import collections
 from copy import deepcopy
 import numpy as np
 from math import pi
-from .properties import Pose, Inertial, Footprint, Plugin, \
+from .properties import Pose, Inertial, Plugin, \
     Visual, Collision
 from .link import Link
 from .joint import Joint
@@ -188,14 +188,11 @@ class SimulationModel(Entity):
         self._is_ground_plane = True
 
     def copy(self):
-        print("line 65.")
-        model = SimulationModel.from_sdf(self.to_sdf())
-        print("line 66.")
-        model.static = self.static
-        model._is_gazebo_model = self._is_gazebo_model
-        model._source_model_name = self._source_model_name
-        print("line 67.")
-        return model
+        """Return a structural copy of the model. The mesh data is
+        immutable and shared with the copy, all other properties,
+        including the poses, are copied.
+        """
+        return deepcopy(self)
 
     def merge(self, model):
         # Merge plugins
@@ -1310,20 +1307,21 @@ class SimulationModel(Entity):
                 'link',
                 resource_prefix=resource_prefix,
                 model_folder=model_folder,
-                copy_resources=copy_resources))
+                copy_resources=copy_resources).transfer())
 
         for tag in self.joints:
-            model.add_joint(tag, self.joints[tag].to_sdf())
+            model.add_joint(tag, self.joints[tag].to_sdf().transfer())
 
         for tag in self.models:
             model.add_model(tag, self.models[tag].to_sdf(
                 sdf_version=sdf_version,
                 resource_prefix=resource_prefix,
                 model_folder=model_folder,
-                copy_resources=copy_resources))
+                copy_resources=copy_resources).transfer())
 
         for tag in self.plugins:
-            model.add_plugin(tag, plugin=self.plugins[tag].to_sdf())
+            model.add_plugin(
+                tag, plugin=self.plugins[tag].to_sdf().transfer())
 
         if type == 'model':
             return model
@@ -1333,7 +1331,7 @@ class SimulationModel(Entity):
 
         sdf.version = sdf_version
         print("line 83.")
-        sdf.add_model(model.name, model)
+        sdf.add_model(model.name, model.transfer())
         print("line 84.")
 
         return sdf
@@ -1427,34 +1425,22 @@ class SimulationModel(Entity):
 
     @staticmethod
     def from_gazebo_model(name):
-        from . import get_gazebo_model_sdf, is_gazebo_model
+        from . import get_gazebo_model_template, is_gazebo_model
         if name == 'ground_plane' and not is_gazebo_model('ground_plane'):
             from ..simulation.components import GroundPlane
             return GroundPlane()
         else:
             PCG_ROOT_LOGGER.info(
                 'Importing a Gazebo model, name={}'.format(name))
-            # Update list of Gazebo models
-            sdf = get_gazebo_model_sdf(name)
+            # The model is parsed only once and copied from the
+            # cached template afterwards
+            template = get_gazebo_model_template(name)
 
-            if sdf is None:
+            if template is None:
                 msg = 'Gazebo model {} not found in the ROS paths'.format(name)
                 PCG_ROOT_LOGGER.error(msg)
                 raise ValueError(msg)
-            if sdf.models is None:
-                msg = 'No models found in Gazebo model {}'.format(name)
-                PCG_ROOT_LOGGER.warning(msg)
-                raise ValueError(msg)
-            if len(sdf.models) != 1:
-                msg = 'Imported SDF file should have one model only'
-                PCG_ROOT_LOGGER.error(msg)
-                raise ValueError(msg)
-
-            model = SimulationModel.from_sdf(sdf.models[0])
-            model.is_gazebo_model = True
-            model._source_model_name = name
-            model.name = name
-            return model
+            return template.copy()
 
     def to_urdf(self):
         PCG_ROOT_LOGGER.info('Exporting model <{}> as URDF'.format(self.name))
@@ -1520,7 +1506,7 @@ class SimulationModel(Entity):
             mesh_type='collision',
             pose_offset=None,
             z_limits=None):
-        from ..generators.occupancy import generate_occupancy_grid
+        from ..generators.occupancy import get_model_footprint
 
         if mesh_type not in ['collision', 'visual']:
             msg = 'Mesh type to compute the footprints' \
@@ -1554,22 +1540,15 @@ class SimulationModel(Entity):
                 footprints[self.name + '::' +
                            self._models[tag].name] = footprint
 
-        gridmap_input = dict()
-        gridmap_input[self.name] = self
-        grid = generate_occupancy_grid(
-            gridmap_input,
+        # The footprint of the model's geometry is cached and only
+        # rotated and translated to the model's pose
+        footprint = get_model_footprint(
+            self,
             mesh_type=mesh_type,
-            z_limits=z_limits
-        )
-
-        if grid is not None:
-            combined_model_footprint = Footprint()
-            for tag in grid['static']:
-                combined_model_footprint.add_polygon(grid['static'][tag])
-            for tag in grid['non_static']:
-                combined_model_footprint.add_polygon(grid['non_static'][tag])
-            footprints[self.name] = \
-                combined_model_footprint.get_footprint_polygon()
+            pose_offset=pose_offset,
+            z_limits=z_limits)
+        if footprint is not None:
+            footprints[self.name] = footprint
 
         PCG_ROOT_LOGGER.info(
             'Footprint computed for model <{}>'.format(
@@ -1595,6 +1574,15 @@ class SimulationModel(Entity):
             return None
 
     def get_meshes(self, mesh_type='collision', pose_offset=None):
+        meshes = list()
+        for mesh, transform in self.get_mesh_transforms(
+                mesh_type, pose_offset):
+            mesh = mesh.copy()
+            mesh.apply_transform(transform)
+            meshes.append(mesh)
+        return meshes
+
+    def get_mesh_transforms(self, mesh_type='collision', pose_offset=None):
         if mesh_type not in ['collision', 'visual']:
             msg = 'Mesh type to compute the footprints' \
                 ' must be either collision or visual' \
@@ -1615,11 +1603,13 @@ class SimulationModel(Entity):
         meshes = list()
         for tag in self._models:
             meshes = meshes + \
-                self._models[tag].get_meshes(mesh_type, combined_pose)
+                self._models[tag].get_mesh_transforms(
+                    mesh_type, combined_pose)
 
         for tag in self._links:
             meshes = meshes + \
-                self._links[tag].get_meshes(mesh_type, combined_pose)
+                self._links[tag].get_mesh_transforms(
+                    mesh_type, combined_pose)
 
         return meshes
 
@@ -1762,7 +1752,8 @@ class SimulationModel(Entity):
             copy_resources=False):
         import os
         import getpass
-        from . import is_gazebo_model, get_gazebo_model_path
+        from . import is_gazebo_model, get_gazebo_model_path, \
+            load_gazebo_models
         from ..parsers.sdf_config import create_sdf_config_element
         PCG_ROOT_LOGGER.info(
             'Converting model <{}> into a static Gazebo model'.format(
@@ -1880,4 +1871,7 @@ class SimulationModel(Entity):
             os.path.join(full_model_dir, model_sdf_filename),
             sdf_version)
 
+        # Update the index of Gazebo models with the new model folder
+        load_gazebo_models()
+
         return full_model_dir
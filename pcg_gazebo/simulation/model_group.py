@@ -323,6 +323,15 @@ class ModelGroup(Entity):
                                 light.name, model_name))
 
     def get_meshes(self, mesh_type='collision', pose_offset=None):
+        meshes = list()
+        for mesh, transform in self.get_mesh_transforms(
+                mesh_type, pose_offset):
+            mesh = mesh.copy()
+            mesh.apply_transform(transform)
+            meshes.append(mesh)
+        return meshes
+
+    def get_mesh_transforms(self, mesh_type='collision', pose_offset=None):
         if mesh_type not in ['collision', 'visual']:
             msg = 'Mesh type to compute the footprints' \
                 ' must be either collision or visual' \
@@ -343,7 +352,8 @@ class ModelGroup(Entity):
         meshes = list()
         for tag in self._models:
             meshes = meshes + \
-                self._models[tag].get_meshes(mesh_type, combined_pose)
+                self._models[tag].get_mesh_transforms(
+                    mesh_type, combined_pose)
 
         return meshes
 
@@ -692,10 +702,10 @@ class ModelGroup(Entity):
             sdf_model_group.pose = self._pose.to_sdf()
 
             for tag in sdf_models:
-                sdf_model_group.add_model(tag, sdf_models[tag])
+                sdf_model_group.add_model(tag, sdf_models[tag].transfer())
 
             for tag in sdf_includes:
-                sdf_model_group.add_include(tag, sdf_includes[tag])
+                sdf_model_group.add_include(tag, sdf_includes[tag].transfer())
         else:
             sdf_model_group = None
 
@@ -704,7 +714,7 @@ class ModelGroup(Entity):
             for tag in sdf_lights:
                 sdf_world.add_light(tag, sdf_lights[tag])
             if sdf_model_group is not None:
-                sdf_world.add_model(self.name, sdf_model_group)
+                sdf_world.add_model(self.name, sdf_model_group.transfer())
             return sdf_world
         elif type == 'sdf':
             sdf = create_sdf_element('sdf')
@@ -712,7 +722,7 @@ class ModelGroup(Entity):
                 for tag in sdf_lights:
                     sdf.add_light(tag, sdf_lights[tag])
             elif self.n_lights == 0 and self.n_models > 0:
-                sdf.add_model(self.name, sdf_model_group)
+                sdf.add_model(self.name, sdf_model_group.transfer())
             else:
                 return None
             return sdf
@@ -795,7 +805,8 @@ class ModelGroup(Entity):
             nested=True):
         import os
         import getpass
-        from . import is_gazebo_model, get_gazebo_model_path
+        from . import is_gazebo_model, get_gazebo_model_path, \
+            load_gazebo_models
         from ..parsers.sdf_config import create_sdf_config_element
 
         PCG_ROOT_LOGGER.info(
@@ -963,6 +974,9 @@ class ModelGroup(Entity):
         # Export manifest file
         manifest.export_xml(os.path.join(full_model_dir, manifest_filename))
 
+        # Update the index of Gazebo models with the new model folder
+        load_gazebo_models()
+
         return full_model_dir
 
     def spawn(self, gazebo_proxy=None, robot_namespace=None, pos=[0, 0, 0],
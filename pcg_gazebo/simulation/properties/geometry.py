@@ -158,6 +158,24 @@ class Geometry(object):
 
         return transformed_mesh
 
+    def get_mesh_transforms(self, position=None, quat=None):
+        from ...transformations import quaternion_matrix
+        assert self._geometry_entity is not None, \
+            'No mesh found for this geometry'
+
+        if position is None:
+            position = np.array([0, 0, 0])
+
+        if quat is None:
+            quat = np.array([0, 0, 0, 1])
+
+        if self.get_type() == 'heightmap':
+            return self._geometry_entity.mesh.get_mesh_transforms(
+                position, quaternion_matrix(quat))
+        else:
+            return self._geometry_entity.get_mesh_transforms(
+                position, quaternion_matrix(quat))
+
     def get_footprint(self, position=None, quat=None, use_bounding_box=False,
                       z_limits=None):
         from ...transformations import quaternion_matrix
@@ -15,14 +15,11 @@
 import os
 import numpy as np
 import trimesh
-from shapely.ops import triangulate
-from shapely.geometry import MultiPoint
-from skimage.io import imread, imsave
 from .texture import Texture
 from .mesh import Mesh
 from ...path import Path
 from ...utils import is_array, is_scalar, is_string, \
-    is_integer, is_boolean, PCG_RESOURCES_ROOT_DIR
+    is_integer, is_boolean
 from ...log import PCG_ROOT_LOGGER
 from ...parsers.sdf import create_sdf_element
 
@@ -111,6 +108,7 @@ class Heightmap(object):
         for elem in value:
             assert is_scalar(elem), \
                 'Element in position vector is not a scalar'
+        self._mesh = None
         self._pos = value
 
     @property
@@ -160,10 +158,12 @@ class Heightmap(object):
         self._use_terrain_paging = bool(value)
 
     def load_image(self, uri=None):
+        from skimage.io import imread
         if uri is not None:
             self.image_uri = uri
         assert self._image_uri.absolute_uri is not None, \
             'Image URI is invalid, path={}'.format(uri)
+        self._mesh = None
         self._image = imread(self._image_uri.absolute_uri)
 
     def add_texture(self, **kwargs):
@@ -198,6 +198,7 @@ class Heightmap(object):
         self._blends = list()
 
     def export(self, filename, folder=None, format='png'):
+        from skimage.io import imsave
         assert is_string(filename), \
             'Image filename input must be a string'
 
@@ -215,50 +216,66 @@ class Heightmap(object):
         self.image_uri = os.path.join(folder, filename)
         return True
 
+    @staticmethod
+    def get_grid_faces(n_rows, n_cols):
+        """Return the faces of the regular grid triangulation of a
+        heightmap image. The vertices are indexed in row-major order and
+        each grid cell is split in two counter-clockwise triangles.
+
+        > *Input arguments*
+
+        * `n_rows` (*type:* `int`): Number of rows in the image
+        * `n_cols` (*type:* `int`): Number of columns in the image
+
+        > *Returns*
+
+        `numpy.ndarray`: `(2 * (n_rows - 1) * (n_cols - 1), 3)` array of
+        vertex indices.
+        """
+        corners = np.arange(n_rows * n_cols).reshape(n_rows, n_cols)
+        v00 = corners[:-1, :-1].reshape(-1)
+        v01 = corners[:-1, 1:].reshape(-1)
+        v10 = corners[1:, :-1].reshape(-1)
+        v11 = corners[1:, 1:].reshape(-1)
+        faces = np.empty((2 * v00.size, 3), dtype=np.int64)
+        faces[0::2] = np.column_stack((v00, v01, v11))
+        faces[1::2] = np.column_stack((v00, v11, v10))
+        return faces
+
     def as_mesh(self):
+        """Return the heightmap as a mesh. The vertices are the pixels of
+        the image, scaled to the heightmap's size and translated to its
+        position. Use the `mesh` property to get the cached mesh, which
+        is updated when the image, size or position change.
+
+        > *Returns*
+
+        `pcg_gazebo.simulation.properties.Mesh`
+        """
         if self._image is None:
-            PCG_RESOURCES_ROOT_DIR.error(
+            PCG_ROOT_LOGGER.error(
                 'No image found for description of heightmap')
             return None
 
-        vertices = np.zeros((np.size(self._image), 3))
+        n_rows, n_cols = self._image.shape
+        index_y, index_x = np.meshgrid(
+            np.arange(n_rows, dtype=float),
+            np.arange(n_cols, dtype=float),
+            indexing='ij')
 
-        index_x, index_y = np.meshgrid(
-            np.linspace(0, self._image.shape[0] - 1, self._image.shape[0]),
-            np.linspace(0, self._image.shape[1] - 1, self._image.shape[1])
-        )
-
-        vertices[:, 0] = np.reshape(index_x, -1)
-        vertices[:, 1] = np.reshape(index_y, -1)
-        faces = list()
-
-        polygons = triangulate(
-            MultiPoint(
-                [(xi, yi) for xi, yi in
-                 zip(index_x.flatten(), index_y.flatten())]))
-
-        for i in range(len(polygons)):
-            triangle = list()
-            for j in range(3):
-                point = polygons[i].boundary.coords[j]
-                index = np.nonzero(
-                    np.logical_and(vertices[:, 0] == point[0],
-                                   vertices[:, 1] == point[1]))[0]
-                triangle.append(index[0])
-            faces.append(triangle)
-
-        faces = np.array(faces)
-
-        vertices[:, 0] = vertices[:, 0] / vertices[:, 0].max() * \
+        vertices = np.zeros((np.size(self._image), 3))
+        vertices[:, 0] = index_x.reshape(-1) / max(n_cols - 1, 1) * \
             self._size[0] - self._size[0] / 2 + self._pos[0]
-        vertices[:, 1] = vertices[:, 1] / vertices[:, 1].max() * \
+        vertices[:, 1] = index_y.reshape(-1) / max(n_rows - 1, 1) * \
             self._size[1] - self._size[1] / 2 + self._pos[1]
         vertices[:, 2] = self._size[2] * \
             np.reshape(self._image / 255.0, -1) + \
             self._pos[2]
 
         return Mesh.from_mesh(trimesh.Trimesh(
-            vertices=vertices, faces=faces), scale=[1, 1, 1])
+            vertices=vertices,
+            faces=self.get_grid_faces(n_rows, n_cols),
+            process=False), scale=[1, 1, 1])
 
     @staticmethod
     def from_sdf(sdf):
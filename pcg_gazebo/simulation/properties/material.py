@@ -71,6 +71,13 @@ class Material(object):
         self._gazebo_material_script_default_uri = \
             'file://media/materials/scripts/gazebo.material'
 
+    def __deepcopy__(self, memo):
+        # The color table is read-only and can be shared between copies
+        output = Material.__new__(Material)
+        output.__dict__.update(self.__dict__)
+        memo[id(self)] = output
+        return output
+
     @property
     def xkcd_colors(self):
         return self._xkcd_colors
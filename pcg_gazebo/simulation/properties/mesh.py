@@ -55,14 +55,31 @@ class Mesh(object):
         self._mesh_tag = None
         self._mesh = None
         self._mesh_parameters = None
+        # Meshes in the local frame with the scaling applied, they
+        # are shared by all callers and must not be modified
+        self._local_meshes = None
 
         self.scale = scale
 
         self.load_mesh()
 
+    # Attributes that are not modified in place and can be shared
+    # between copies of the mesh property
+    _SHARED_ATTRIBUTES = ['_uri', '_mesh', '_local_meshes', '_mesh_manager']
+
     def __eq__(self, other):
         return self._uri == other._uri and self.scale == other.scale
 
+    def __deepcopy__(self, memo):
+        output = Mesh.__new__(Mesh)
+        memo[id(self)] = output
+        for key, value in self.__dict__.items():
+            if key in self._SHARED_ATTRIBUTES:
+                setattr(output, key, value)
+            else:
+                setattr(output, key, deepcopy(value, memo))
+        return output
+
     def __ne__(self, other):
         return not self.__eq__(other)
 
@@ -147,9 +164,18 @@ class Mesh(object):
         assert is_string(value), 'Input filename is not a string'
         self._uri = Path(value)
         self._filename = self._uri.absolute_uri
+        self._local_meshes = None
 
     @property
     def mesh(self):
+        # Meshes loaded from files are always requested from the mesh
+        # manager, which limits the memory used by them
+        if self._filename is not None and self._mesh_tag is not None:
+            mesh = self._mesh_manager.get(tag=self._mesh_tag)
+            assert mesh is not None, \
+                'Mesh could not be retrieved for tag {}'.format(
+                    self._mesh_tag)
+            return mesh
         if self._mesh is None:
             if self._mesh_tag is not None:
                 self._mesh = self._mesh_manager.get(tag=self._mesh_tag)
@@ -189,6 +215,8 @@ class Mesh(object):
         for elem in vec:
             assert elem > 0, 'Scale vector' \
                 ' components must be greater than zero'
+        if vec != self._scale:
+            self._local_meshes = None
         self._scale = vec
 
     @property
@@ -356,18 +384,7 @@ class Mesh(object):
             sliced_meshes.append(upper_mesh)
         return sliced_meshes
 
-    def get_meshes(self, scale=None):
-        if scale is not None:
-            assert isinstance(
-                scale, collections.Iterable), 'Input is not an array'
-            scale = list(scale)
-            assert len(scale) == 3, \
-                'Input scale array must have 3 elements,' \
-                ' provided={}'.format(scale)
-            for elem in scale:
-                assert elem > 0, 'Scale vector' \
-                    ' components must be greater than zero'
-
+    def _create_local_meshes(self, scale):
         entity = self.mesh
         meshes = list()
         if entity is not None:
@@ -378,12 +395,11 @@ class Mesh(object):
             else:
                 raise ValueError('Mesh object is not a valid trimesh object')
 
-        mesh_scale = scale if scale is not None else self._scale
-        if mesh_scale != [1, 1, 1]:
+        if scale != [1, 1, 1]:
             # Apply scaling to the meshes
             scale_matrix = np.eye(4)
             for i in range(3):
-                scale_matrix[i, i] = mesh_scale[i]
+                scale_matrix[i, i] = scale[i]
 
             for i in range(len(meshes)):
                 new_mesh = meshes[i].copy()
@@ -391,19 +407,65 @@ class Mesh(object):
                 meshes[i] = new_mesh
         return meshes
 
-    def apply_transform(self, position, rot, scale=None):
+    def get_meshes(self, scale=None):
+        """Return the meshes in the local frame. The meshes for the
+        default scale are cached and shared, they must not be
+        modified in place.
+        """
+        if scale is not None:
+            assert isinstance(
+                scale, collections.Iterable), 'Input is not an array'
+            scale = list(scale)
+            assert len(scale) == 3, \
+                'Input scale array must have 3 elements,' \
+                ' provided={}'.format(scale)
+            for elem in scale:
+                assert elem > 0, 'Scale vector' \
+                    ' components must be greater than zero'
+
+        if scale is not None and scale != self._scale:
+            return self._create_local_meshes(scale)
+
+        if self._local_meshes is None:
+            self._local_meshes = self._create_local_meshes(self._scale)
+        return list(self._local_meshes)
+
+    def get_mesh_transforms(self, position, rot, scale=None):
+        """Return the meshes in the local frame and the homogeneous
+        transform to place each of them at the input pose, without
+        copying the vertex arrays.
+
+        > *Input arguments*
+
+        * `position` (*type:* `list`): Position vector
+        * `rot` (*type:* `numpy.ndarray`): 4x4 rotation matrix
+        * `scale` (*type:* `list`, *default:* `None`): Scaling vector,
+        if `None` the mesh's scale is used.
+
+        > *Returns*
+
+        List of `(trimesh.Trimesh, numpy.ndarray)` tuples.
+        """
         meshes = self.get_meshes(scale)
 
         if len(meshes) == 0:
             PCG_ROOT_LOGGER.warning('No meshes found')
             return None
 
+        transform = np.array(rot, dtype=float)
+        transform[0:3, 3] = position
+        return [(mesh, transform) for mesh in meshes]
+
+    def apply_transform(self, position, rot, scale=None):
+        mesh_transforms = self.get_mesh_transforms(position, rot, scale)
+
+        if mesh_transforms is None:
+            return None
+
         transformed_meshes = list()
-        for mesh in self.get_meshes():
+        for mesh, transform in mesh_transforms:
             mesh = mesh.copy()
-
-            mesh.apply_transform(rot)
-            mesh.apply_translation(position)
+            mesh.apply_transform(transform)
             transformed_meshes.append(mesh)
 
         return transformed_meshes
@@ -414,6 +476,7 @@ class Mesh(object):
         if self._mesh_tag is None:
             self._mesh_tag = self._mesh_manager.add(
                 filename=self._filename)
+            self._local_meshes = None
             PCG_ROOT_LOGGER.info(
                 'Mesh successfully loaded from file, '
                 'filename={}, # vertices={}'.format(
@@ -14,7 +14,6 @@
 # limitations under the License.
 import os
 import numpy as np
-from skimage.io import imread, imsave
 from ...path import Path
 from ...utils import is_scalar, is_string, PCG_RESOURCES_ROOT_DIR, \
     generate_random_string
@@ -100,6 +99,7 @@ class Texture(object):
         return self._normal_image
 
     def load(self):
+        from skimage.io import imread
         if self.diffuse_image_uri is not None:
             self._diffuse_image = imread(self.diffuse_image_uri)
         if self.normal_image_uri is not None:
@@ -107,6 +107,7 @@ class Texture(object):
 
     def export(self, diffuse_filename, normal_filename,
                folder=None, format='png'):
+        from skimage.io import imsave
         assert is_string(diffuse_filename), \
             'Diffuse image filename input must be a string'
 
@@ -75,6 +75,13 @@ class World(Entity):
         self._states = list()
         self._atmosphere = None
         self._magnetic_field = None
+        # Footprints and bounds of the models indexed by a signature of
+        # their meshes and poses, and the last free space polygon
+        # computed, reused while the models are unchanged
+        self._footprints = dict(
+            bounds=dict(),
+            ground_plane=None,
+            free_space=None)
         print("line 90.")
         self.reset_physics(engine)
 
@@ -509,17 +516,17 @@ class World(Entity):
                 self._model_groups[group_name].to_sdf()
 
             for name in sdf_models:
-                world.add_model(name, sdf_models[name])
+                world.add_model(name, sdf_models[name].transfer())
 
             for name in sdf_lights:
                 world.add_light(name, sdf_lights[name])
 
             for name in sdf_includes:
-                world.add_include(include=sdf_includes[name])
+                world.add_include(include=sdf_includes[name].transfer())
 
         # TODO: Include plugins and actors on the exported file
         for tag in self._plugins:
-            world.add_plugin(tag, self._plugins[tag].to_sdf())
+            world.add_plugin(tag, self._plugins[tag].to_sdf().transfer())
 
         if self._wind is not None:
             world.wind = self._wind
@@ -995,12 +1002,43 @@ class World(Entity):
                     test_model)
             return no_collision
 
-    def get_bounds(self, mesh_type='collision'):
+    @staticmethod
+    def _get_model_signature(model, mesh_type='collision'):
+        # The meshes are cached and shared between copies of a model, so
+        # their identity and transforms change only if the geometry or the
+        # pose of the model change. The meshes are kept with the
+        # signature so that their ids cannot be reused.
+        meshes = list()
+        signature = [model.static, model.is_ground_plane]
+        for mesh, transform in model.get_mesh_transforms(mesh_type):
+            meshes.append(mesh)
+            signature.append((id(mesh), transform.tobytes()))
+        return tuple(signature), meshes
+
+    def _get_model_bounds(self, tag, model, mesh_type='collision'):
+        signature, meshes = self._get_model_signature(model, mesh_type)
+        cache = self._footprints['bounds']
+        if (tag, mesh_type) not in cache or \
+                cache[(tag, mesh_type)]['signature'] != signature:
+            cache[(tag, mesh_type)] = dict(
+                signature=signature,
+                meshes=meshes,
+                bounds=model.get_bounds(mesh_type))
+        return cache[(tag, mesh_type)]['bounds']
+
+    def get_bounds(self, mesh_type='collision', models=None):
         from copy import deepcopy
         bounds = None
         PCG_ROOT_LOGGER.info('Compute world <{}> bounds'.format(self.name))
-        for tag in self.models:
-            model_bounds = self.models[tag].get_bounds()
+        if models is None:
+            models = self.models
+        for key in list(self._footprints['bounds'].keys()):
+            if key[0] not in models:
+                del self._footprints['bounds'][key]
+        for tag in models:
+            model_bounds = self._get_model_bounds(tag, models[tag], mesh_type)
+            if model_bounds is None:
+                continue
             if bounds is None:
                 bounds = deepcopy(model_bounds)
             else:
@@ -1018,7 +1056,8 @@ class World(Entity):
             ignore_models=None,
             x_limits=None,
             y_limits=None,
-            free_space_min_area=5e-3):
+            free_space_min_area=5e-3,
+            n_processes=None):
         if ground_plane_models is None:
             ground_plane_models = list()
         else:
@@ -1048,7 +1087,8 @@ class World(Entity):
                     [x_limits[0], y_limits[0]]]
             )
 
-        bounds = self.get_bounds()
+        models = self.models
+        bounds = self.get_bounds(models=models)
         if x_limits is not None:
             assert is_array(x_limits), 'X limits must be an array'
             assert x_limits[0] < x_limits[1], \
@@ -1073,24 +1113,24 @@ class World(Entity):
         )
 
         if len(ground_plane_models) == 0:
-            for tag in self.models:
-                if self.models[tag].is_ground_plane:
+            for tag in models:
+                if models[tag].is_ground_plane:
                     is_ignored = False
                     for item in ignore_models:
-                        if has_string_pattern(self.models[tag].name, item):
+                        if has_string_pattern(models[tag].name, item):
                             is_ignored = True
                             break
                     if not is_ignored:
                         ground_plane_models.append(tag)
 
         filtered_models = dict()
-        for tag in self.models:
-            if self.models[tag].is_ground_plane:
-                filtered_models[tag] = self.models[tag]
+        for tag in models:
+            if models[tag].is_ground_plane:
+                filtered_models[tag] = models[tag]
             else:
                 for item in ground_plane_models:
-                    if has_string_pattern(self.models[tag].name, item):
-                        filtered_models[tag] = self.models[tag]
+                    if has_string_pattern(models[tag].name, item):
+                        filtered_models[tag] = models[tag]
                         break
 
         if len(filtered_models) == 0:
@@ -1100,13 +1140,44 @@ class World(Entity):
             'List of models to compute free space polygon={}'.format(
                 list(filtered_models.keys())))
 
-        PCG_ROOT_LOGGER.info(filtered_models)
-
-        occupancy_output = generate_occupancy_grid(
-            filtered_models,
-            n_processes=4,
-            mesh_type='collision',
-            ground_plane_models=ground_plane_models)
+        # Only the ground plane models are used to compute the free
+        # space, the remaining models only change the world bounds. The
+        # footprints are only recomputed if any of the ground plane
+        # models changed.
+        signatures = list()
+        meshes = list()
+        for tag in sorted(filtered_models.keys()):
+            signature, model_meshes = self._get_model_signature(
+                filtered_models[tag])
+            signatures.append((tag, signature))
+            meshes += model_meshes
+        ground_plane_key = (tuple(signatures), tuple(ground_plane_models))
+        free_space_key = (
+            ground_plane_key,
+            tuple(x_limits),
+            tuple(y_limits),
+            free_space_min_area)
+
+        if self._footprints['free_space'] is not None and \
+                self._footprints['free_space']['key'] == free_space_key:
+            PCG_ROOT_LOGGER.info('Reusing the cached free space polygon')
+            return self._footprints['free_space']['polygon']
+
+        if self._footprints['ground_plane'] is not None and \
+                self._footprints['ground_plane']['key'] == ground_plane_key:
+            PCG_ROOT_LOGGER.info(
+                'Reusing the cached footprints of the ground plane models')
+            occupancy_output = self._footprints['ground_plane']['output']
+        else:
+            occupancy_output = generate_occupancy_grid(
+                filtered_models,
+                n_processes=n_processes,
+                mesh_type='collision',
+                ground_plane_models=ground_plane_models)
+            self._footprints['ground_plane'] = dict(
+                key=ground_plane_key,
+                meshes=meshes,
+                output=occupancy_output)
 
         if occupancy_output is None:
             return free_space_polygon
@@ -1145,6 +1216,9 @@ class World(Entity):
         free_space_polygon = free_space_polygon.simplify(tolerance=1e-4)
         free_space_polygon = free_space_polygon.buffer(1e-3)
 
+        self._footprints['free_space'] = dict(
+            key=free_space_key,
+            polygon=free_space_polygon)
         return free_space_polygon
 
     def get_random_free_spots(
@@ -20,9 +20,10 @@ from . import random
 import string
 import os
 import re
+import hashlib
 import yaml
-from jinja2 import FileSystemLoader, Environment, \
-    BaseLoader, TemplateNotFound
+import numpy as np
+from collections import OrderedDict
 try:
     import rospkg
     ROS1_AVAILABLE = True
@@ -41,6 +42,17 @@ PCG_TEMPLATE_FOLDER = os.path.join(
     PCG_ROOT_FOLDER,
     'templates')
 
+_SHAPE_SAMPLERS = dict(samplers=OrderedDict(), max_size=256)
+
+# Paths of the ROS 1 and ROS 2 packages and the key of the environment
+# they were found for
+_ROS_PACKAGES = dict(
+    key=None,
+    ros_paths=None,
+    ros1=None,
+    ros2=None,
+    packages=None)
+
 
 def set_resources_root_dir(folder):
     if not os.path.isdir(folder):
@@ -180,23 +192,23 @@ def load_yaml(input_yaml):
         return yaml.load(input_yaml, _PCGYAMLLoader)
 
 
-class _AbsFileSystemLoader(BaseLoader):
-    def __init__(self, path):
-        self.path = path
-
-    def get_source(self, environment, template):
-        if os.path.isfile(template):
-            path = template
-        else:
-            path = os.path.join(self.path, template)
-            if not os.path.isfile(path):
-                raise TemplateNotFound(template)
-        mtime = os.path.getmtime(path)
-        with open(path) as f:
-            source = f.read()
-            if not isinstance(source, str):
-                source = source.decode('utf-8')
-        return source, path, lambda: mtime == os.path.getmtime(path)
+def _get_template_source(template, include_dir):
+    """Return the source of a Jinja template given by its absolute path
+    or its path relative to `include_dir`, `None` if it could not be
+    found.
+    """
+    if os.path.isfile(template):
+        path = template
+    else:
+        path = os.path.join(include_dir, template)
+        if not os.path.isfile(path):
+            return None
+    mtime = os.path.getmtime(path)
+    with open(path) as f:
+        source = f.read()
+        if not isinstance(source, str):
+            source = source.decode('utf-8')
+    return source, path, lambda: mtime == os.path.getmtime(path)
 
 
 def _find_ros_package(pkg_name):
@@ -257,6 +269,7 @@ def _parse_package_paths(xml):
 
 
 def process_jinja_template(template, parameters=None, include_dir=None):
+    from jinja2 import FileSystemLoader, FunctionLoader, Environment
     from .log import PCG_ROOT_LOGGER
     from .path import Path
 
@@ -314,7 +327,8 @@ def process_jinja_template(template, parameters=None, include_dir=None):
     else:
         include_dir = templates_dir
 
-    includes_loader = _AbsFileSystemLoader(include_dir)
+    includes_loader = FunctionLoader(
+        lambda name: _get_template_source(name, include_dir))
 
     base_env = Environment(loader=base_loader)
     # Add Jinja function similar to $(find <package>) in XACRO
@@ -438,19 +452,151 @@ def is_array(obj):
         obj, str)
 
 
+def _triangulate_shape(geo):
+    """Split a polygon in triangles. The constrained Delaunay
+    triangulation is used when available, otherwise the Delaunay
+    triangles of the polygon's vertices are clipped by the polygon.
+
+    > *Input arguments*
+
+    * `geo` (*type:* `shapely.geometry.Polygon` or
+    `shapely.geometry.MultiPolygon`): Input polygon
+
+    > *Returns*
+
+    `numpy.ndarray`: Vertices of the triangles as a `(n, 3, 2)` array,
+    `numpy.ndarray`: area of the triangles, zero for triangles outside
+    of the polygon, and
+    `numpy.ndarray`: flags set for triangles only partially covered by
+    the polygon.
+    """
+    try:
+        from shapely import constrained_delaunay_triangles
+        triangles = list(constrained_delaunay_triangles(geo).geoms)
+        areas = [t.area for t in triangles]
+        partial = [False for _ in triangles]
+    except ImportError:
+        from shapely.ops import triangulate
+        triangles = triangulate(geo)
+        covered = [t.intersection(geo).area for t in triangles]
+        # Partially covered triangles are still sampled by their full
+        # area, the points outside of the polygon are later rejected
+        areas = [t.area if a > 0 else 0 for t, a in zip(triangles, covered)]
+        partial = [
+            not np.isclose(a, t.area) for t, a in zip(triangles, covered)]
+
+    vertices = np.array(
+        [t.exterior.coords[:3] for t in triangles]).reshape(-1, 3, 2)
+    return vertices, np.array(areas), np.array(partial, dtype=bool)
+
+
+def _get_shape_sampler(geo):
+    """Return the triangulation of a polygon used to sample points
+    from it. The triangulations are cached by the geometry's WKB
+    representation, so that copies of the same polygon share it.
+    """
+    key = hashlib.sha1(geo.wkb).hexdigest()
+    samplers = _SHAPE_SAMPLERS['samplers']
+    if key in samplers:
+        samplers.move_to_end(key)
+        return samplers[key]
+
+    vertices, areas, partial = _triangulate_shape(geo)
+    idx = areas > 0
+    sampler = dict(
+        vertices=vertices[idx],
+        cdf=np.cumsum(areas[idx]),
+        partial=partial[idx],
+        geo=geo)
+
+    if _SHAPE_SAMPLERS['max_size'] > 0:
+        samplers[key] = sampler
+        while len(samplers) > _SHAPE_SAMPLERS['max_size']:
+            samplers.popitem(last=False)
+    return sampler
+
+
+def _sample_triangles(vertices, n_points):
+    """Sample one point uniformly from each of the `n_points` triangles
+    in `vertices`.
+    """
+    uv = random.rand(n_points, 2)
+    # Reflect the points falling outside of the triangle into it
+    outside = uv.sum(axis=1) > 1
+    uv[outside] = 1 - uv[outside]
+    return vertices[:, 0] \
+        + uv[:, 0:1] * (vertices[:, 1] - vertices[:, 0]) \
+        + uv[:, 1:2] * (vertices[:, 2] - vertices[:, 0])
+
+
+def get_random_points_from_shape(geo, n_points=1):
+    """Sample points uniformly distributed inside of a polygon. The
+    polygon is triangulated once, the triangles are then picked with a
+    probability proportional to their area and a point is sampled
+    uniformly inside of each picked triangle. The random numbers are
+    generated using `pcg_gazebo.random`.
+
+    > *Input arguments*
+
+    * `geo` (*type:* `shapely.geometry.Polygon` or
+    `shapely.geometry.MultiPolygon`): Input polygon
+    * `n_points` (*type:* `int`, *default:* `1`): Number of points
+
+    > *Returns*
+
+    `numpy.ndarray`: Points as a `(n_points, 2)` array.
+    """
+    assert n_points > 0, 'Number of points must be greater than zero,' \
+        ' provided={}'.format(n_points)
+    sampler = _get_shape_sampler(geo)
+    assert len(sampler['cdf']) > 0, \
+        'Cannot sample points from a shape with no area'
+
+    points = np.zeros((n_points, 2))
+    missing = np.arange(n_points)
+    while missing.size > 0:
+        idx = np.searchsorted(
+            sampler['cdf'],
+            random.rand(missing.size) * sampler['cdf'][-1],
+            side='right')
+        idx = np.minimum(idx, len(sampler['cdf']) - 1)
+        points[missing] = _sample_triangles(
+            sampler['vertices'][idx], missing.size)
+
+        # Points sampled from triangles only partially covered by
+        # the polygon are rejected if they fall outside of it
+        is_partial = sampler['partial'][idx]
+        if not np.any(is_partial):
+            break
+        from shapely.geometry import Point
+        rejected = [
+            i for i, p in zip(missing[is_partial], points[missing[is_partial]])
+            if not sampler['geo'].contains(Point(p))]
+        missing = np.array(rejected, dtype=int)
+    return points
+
+
 def get_random_point_from_shape(geo):
-    from shapely.geometry import Point
-    min_x, min_y, max_x, max_y = geo.bounds
-    pnt = [
-        random.uniform(min_x, max_x),
-        random.uniform(min_y, max_y)
-    ]
-    while not geo.contains(Point(pnt)):
-        pnt = [
-            random.uniform(min_x, max_x),
-            random.uniform(min_y, max_y)
-        ]
-    return pnt
+    """Sample a point uniformly distributed inside of a polygon, see
+    `get_random_points_from_shape`.
+
+    > *Input arguments*
+
+    * `geo` (*type:* `shapely.geometry.Polygon` or
+    `shapely.geometry.MultiPolygon`): Input polygon
+
+    > *Returns*
+
+    `list`: `[x, y]` coordinates of the point.
+    """
+    return get_random_points_from_shape(geo, 1)[0].tolist()
+
+
+def clear_shape_samplers():
+    """Remove all cached polygon triangulations used by
+    `get_random_points_from_shape`.
+    """
+    _SHAPE_SAMPLERS['samplers'] = OrderedDict()
 
 
 def has_string_pattern(input_str, pattern):
@@ -472,21 +618,104 @@ def has_string_pattern(input_str, pattern):
     return False
 
 
-def get_ros_path(pkg):
-    if not ROS1_AVAILABLE and not ROS2_AVAILABLE:
-        return None
+def _get_ros_packages_key():
+    return (
+        os.environ.get('ROS_ROOT', None),
+        os.environ.get('ROS_PACKAGE_PATH', None),
+        os.environ.get('AMENT_PREFIX_PATH', None))
 
-    ros_package_path = None
-    if ROS1_AVAILABLE:
-        try:
-            ros_package_path = rospkg.RosPack().get_path(pkg)
-        except rospkg.ResourceNotFound:
-            pass
 
+def _load_ros_packages(refresh=False):
+    """Return the index of ROS packages, building it if it has not
+    been built yet or if the environment variables of the ROS
+    workspaces have changed since it was built.
+    """
+    index = _ROS_PACKAGES
+    key = _get_ros_packages_key()
+    if not refresh and index['packages'] is not None and \
+            index['key'] == key:
+        return index
+
+    ros1_packages = OrderedDict()
+    ros_paths = list()
+    if ROS1_AVAILABLE:
+        finder = rospkg.RosPack()
+        ros_paths = list(finder.ros_paths)
+        for pkg in sorted(finder.list()):
+            try:
+                ros1_packages[pkg] = finder.get_path(pkg)
+            except rospkg.ResourceNotFound:
+                pass
+
+    ros2_packages = OrderedDict()
     if ROS2_AVAILABLE:
-        try:
-            ros_package_path = \
-                ament_index_python.get_package_share_directory(pkg)
-        except ament_index_python.PackageNotFoundError:
-            pass
-    return ros_package_path
+        prefixes = ament_index_python.get_packages_with_prefixes()
+        for pkg in sorted(prefixes.keys()):
+            ros2_packages[pkg] = os.path.join(prefixes[pkg], 'share', pkg)
+
+    # ROS 2 packages take precedence over ROS 1 packages with the
+    # same name
+    packages = OrderedDict(ros1_packages)
+    packages.update(ros2_packages)
+
+    index['key'] = key
+    index['ros_paths'] = ros_paths
+    index['ros1'] = ros1_packages
+    index['ros2'] = ros2_packages
+    index['packages'] = packages
+
+    # Paths resolved with the previous index could now be invalid
+    from .path import clear_path_cache
+    clear_path_cache()
+    return index
+
+
+def get_ros_packages(refresh=False):
+    """Return the paths of all ROS packages found in the ROS 1 and
+    ROS 2 workspaces. The package index is built once and reused
+    until the `ROS_ROOT`, `ROS_PACKAGE_PATH` or `AMENT_PREFIX_PATH`
+    environment variables change or `clear_ros_packages_cache` is
+    called.
+
+    > *Input arguments*
+
+    * `refresh` (*type:* `bool`, *default:* `False`): If `True`,
+    build the package index again.
+
+    > *Returns*
+
+    `dict`: Paths of the ROS packages indexed by the package names.
+    The dictionary is shared and must not be modified.
+    """
+    return _load_ros_packages(refresh)['packages']
+
+
+def get_ros_path(pkg):
+    """Return the path of the ROS package `pkg`, `None` if it
+    could not be found.
+    """
+    return get_ros_packages().get(pkg, None)
+
+
+def get_ros_package_name(filename):
+    """Return the name of the ROS package containing `filename`,
+    `None` if it is not located in any ROS package. If packages are
+    nested, the innermost package is returned.
+    """
+    pkg_name = None
+    pkg_path_len = 0
+    for pkg, pkg_path in get_ros_packages().items():
+        if pkg_path in filename and len(pkg_path) > pkg_path_len:
+            pkg_name = pkg
+            pkg_path_len = len(pkg_path)
+    return pkg_name
+
+
+def clear_ros_packages_cache():
+    """Discard the index of ROS packages, that is built again the
+    next time a ROS package is searched for.
+    """
+    _ROS_PACKAGES['key'] = None
+    _ROS_PACKAGES['packages'] = None
+    from .path import clear_path_cache
+    clear_path_cache()
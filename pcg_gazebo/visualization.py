@@ -573,29 +573,19 @@ def plot_occupancy_grid(
     if ground_plane_models is None:
         ground_plane_models = list()
 
-    # Create internal function to check if a model should be ignored from the
-    # map
-    def is_excluded(model_name):
-        for item in exclude_contains:
-            if item in model_name:
-                return True
-        return False
-
     PCG_ROOT_LOGGER.info(
         'Plotting occupancy grid, models={}'.format(
             models.keys()))
 
-    from .generators.occupancy import generate_occupancy_grid
+    from .generators.occupancy import generate_occupancy_grid, \
+        filter_occupancy_models
 
-    filtered_models = dict()
-    for tag in models:
-        if not is_excluded(tag):
-            if (models[tag].is_ground_plane or tag in ground_plane_models) \
-                    and not with_ground_plane:
-                continue
-            if not models[tag].static and static_models_only:
-                continue
-            filtered_models[tag] = models[tag]
+    filtered_models = filter_occupancy_models(
+        models,
+        static_models_only=static_models_only,
+        with_ground_plane=with_ground_plane,
+        exclude_contains=exclude_contains,
+        ground_plane_models=ground_plane_models)
 
     PCG_ROOT_LOGGER.info('Computing model footprints using ray tracing')
     occupancy_output = generate_occupancy_grid(
@@ -873,17 +863,7 @@ def plot_occupancy_grid(
 
 
 def store_fig_as_pgm(output_folder, output_filename, canvas):
-    if not '.pgm' == output_filename[-4::]:
-        PCG_ROOT_LOGGER.error(
-            'Map filename must have a PGM extension,'
-            ' provided={}'.format(output_filename))
-        return False
-    if not os.path.isdir(output_folder):
-        PCG_ROOT_LOGGER.error(
-            'Invalid output folder, provided={}'.format(output_folder))
-        return False
-
-    import yaml
+    from .generators.occupancy import store_occupancy_grid
 
     canvas = plt.get_current_fig_manager().canvas
     ax = plt.gca()
@@ -891,53 +871,14 @@ def store_fig_as_pgm(output_folder, output_filename, canvas):
     x_lims = ax.get_xlim()
     y_lims = ax.get_ylim()
 
-    # Retrieve the figure's size
-    ncols, nrows = canvas.get_width_height()
-    print(type(canvas))
-    canvas_string_length = np.fromstring(
-        canvas.tostring_rgb(),
-        dtype=np.uint8).size
-    print("get_width_height:  ",ncols,nrows)
-    print(canvas_string_length)
-
-    # Read the RGB values from the plot image
-    # TEMP TEMP TEMP
-    if canvas_string_length>ncols*nrows*3:
-        ncols = ncols+40
-        nrows = nrows+40
-    im = np.fromstring(
-        canvas.tostring_rgb(),
-        dtype=np.uint8).reshape(
-        nrows,
-        ncols,
-        3)
-
-    with open(os.path.join(output_folder, output_filename), 'wb') as pgm_file:
-        # Write magic number
-        pgm_file.write('P2\n'.encode())
-        # Write the size of the image (width and height)
-        pgm_file.write(('{} {}\n'.format(ncols, nrows)).encode())
-        # Write the maximum gray value
-        pgm_file.write(('{}\n'.format(im.max())).encode())
-
-        # Write the pixels
-        for i in range(nrows):
-            for j in range(ncols):
-                pgm_file.write(('{} '.format(im[i, j].max())).encode())
-            pgm_file.write('\n'.encode())
-
-    # Write the map's information on the yaml file
-    with open(os.path.join(
-            output_folder, output_filename.replace(
-                '.pgm', '.yaml')), 'w+') as pgm_info_file:
-        pgm_info = dict(
-            image=str(output_filename),
-            resolution=float((x_lims[1] - x_lims[0]) / im.shape[0]),
-            origin=[float(x_lims[0]), float(y_lims[0]), 0.000000],
-            negate=0,
-            occupied_thresh=0.65,
-            free_thresh=0.196)
-
-        yaml.dump(pgm_info, pgm_info_file)
-
-    return True
+    # Read the RGB values from the plot image, the buffer already has
+    # the size of the rendered canvas
+    canvas.draw()
+    im = np.asarray(canvas.buffer_rgba())[:, :, :3]
+
+    return store_occupancy_grid(
+        im.max(axis=2),
+        [x_lims[0], y_lims[0]],
+        (x_lims[1] - x_lims[0]) / im.shape[1],
+        output_folder,
+        output_filename)
@@ -41,6 +41,7 @@ requirements_required = set([
     'pycollada==0.6',
     'triangle',
     'python-fcl',
+    'rtree',
     'jsonschema',
     'scikit-image',
     'rospkg',
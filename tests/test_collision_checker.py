@@ -17,6 +17,7 @@ import unittest
 import numpy as np
 from pcg_gazebo.generators.creators import sphere
 from pcg_gazebo.generators import CollisionChecker, SingletonCollisionChecker
+from pcg_gazebo.simulation.properties import Pose
 
 
 class TestCollisionChecker(unittest.TestCase):
@@ -53,6 +54,98 @@ class TestCollisionChecker(unittest.TestCase):
         self.assertEqual(cc.n_fixed_models, 1)
         self.assertEqual(cc.n_meshes, 1)
 
+    def test_incremental_collision_manager(self):
+        cc = CollisionChecker()
+        manager = cc.get_collision_manager()
+
+        fixed_sphere = sphere(mass=1, radius=0.5, name='fixed')
+        cc.add_fixed_model(fixed_sphere)
+        self.assertEqual(cc.n_collision_objects, 1)
+
+        for i in range(5):
+            cc.add_model(
+                sphere(mass=1, radius=0.1, name='sphere_{}'.format(i),
+                       pose=[2 * (i + 1), 0, 0, 0, 0, 0]))
+        self.assertEqual(cc.n_meshes, 6)
+        self.assertEqual(cc.n_collision_objects, 6)
+        # The collision manager is not rebuilt for each check
+        self.assertTrue(cc.check_collision_with_current_scene(
+            sphere(mass=1, radius=0.1, name='test', pose=[4, 0, 0, 0, 0, 0])))
+        self.assertIs(cc.get_collision_manager(), manager)
+
+        # Only the non-fixed models are removed from the manager
+        cc.reset_to_fixed_model_scenario()
+        self.assertIs(cc.get_collision_manager(), manager)
+        self.assertEqual(cc.n_meshes, 1)
+        self.assertEqual(cc.n_collision_objects, 1)
+        self.assertFalse(cc.check_collision_with_current_scene(
+            sphere(mass=1, radius=0.1, name='test', pose=[4, 0, 0, 0, 0, 0])))
+
+        # Model already in the scene flagged as fixed is not duplicated
+        model = sphere(mass=1, radius=0.1, name='sphere',
+                       pose=[-2, 0, 0, 0, 0, 0])
+        cc.add_model(model)
+        cc.add_fixed_model(model)
+        self.assertEqual(cc.n_fixed_models, 2)
+        self.assertEqual(cc.n_collision_objects, 2)
+        cc.reset_to_fixed_model_scenario()
+        self.assertEqual(cc.n_collision_objects, 2)
+
+    def test_spatial_index_candidates(self):
+        cc = CollisionChecker()
+        for i in range(10):
+            cc.add_model(
+                sphere(mass=1, radius=0.5, name='sphere_{}'.format(i),
+                       pose=[2 * i, 0, 0, 0, 0, 0]))
+
+        self.assertEqual(
+            len(cc.get_scene_meshes_in_bounds([[-1, -1, -1], [1, 1, 1]])), 1)
+        self.assertEqual(
+            len(cc.get_scene_meshes_in_bounds([[1, -1, -1], [5, 1, 1]])), 2)
+        self.assertEqual(
+            len(cc.get_scene_meshes_in_bounds(
+                [[-5, 5, -1], [25, 6, 1]])), 0)
+
+        cc.reset_to_fixed_model_scenario()
+        self.assertEqual(
+            len(cc.get_scene_meshes_in_bounds(
+                [[-1, -1, -1], [25, 1, 1]])), 0)
+
+    def test_check_poses(self):
+        cc = CollisionChecker()
+        cc.add_model(sphere(mass=1, radius=0.5, name='sphere'))
+
+        model = sphere(mass=1, radius=0.2, name='test',
+                       pose=[5, 5, 0, 0, 0, 0])
+        poses = [
+            Pose(pos=[0, 0, 0]),
+            Pose(pos=[0.6, 0, 0]),
+            Pose(pos=[2, 0, 0]),
+            Pose(pos=[0, -3, 0], rot=[0, 0, 1.5])]
+        collisions = cc.check_poses(model, poses)
+        self.assertEqual(collisions.tolist(), [True, True, False, False])
+
+        # Minimum distance to the scene objects
+        collisions = cc.check_poses(model, poses, min_distance=1.5)
+        self.assertEqual(collisions.tolist(), [True, True, True, False])
+
+        # Poses given as homogeneous transforms
+        transform = np.eye(4)
+        transform[0, 3] = 0.1
+        self.assertTrue(cc.check_poses(model, [transform])[0])
+
+        # The model pose is not modified
+        self.assertEqual(model.pose.position.tolist(), [5, 5, 0])
+
+        # Removed models are not checked anymore
+        cc.add_fixed_model(sphere(mass=1, radius=0.5, name='fixed',
+                                  pose=[10, 0, 0, 0, 0, 0]))
+        cc.reset_to_fixed_model_scenario()
+        self.assertEqual(cc.n_collision_objects, 1)
+        collisions = cc.check_poses(model, poses, min_distance=1.5)
+        self.assertEqual(collisions.tolist(), [False, False, False, False])
+        self.assertTrue(cc.check_poses(model, [Pose(pos=[9.5, 0, 0])])[0])
+
     def test_singleton_collision_checker(self):
         cc1 = SingletonCollisionChecker.get_instance()
         self.assertIsNotNone(cc1)
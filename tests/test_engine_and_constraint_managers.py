@@ -16,6 +16,9 @@
 import unittest
 import numpy as np
 import os
+import trimesh
+from copy import deepcopy
+from shapely.geometry import Point, box
 from pcg_gazebo.simulation import add_custom_gazebo_resource_path
 from pcg_gazebo.collection_managers import EngineManager
 from pcg_gazebo.generators.engines import FixedPoseEngine, RandomPoseEngine
@@ -169,6 +172,27 @@ class TestEnginesConstraintsManagers(unittest.TestCase):
         self.assertIsInstance(models, list)
         self.assertEqual(len(models), 2)
 
+    def test_run_random_engine_with_pose_batch(self):
+        add_custom_gazebo_resource_path(
+            os.path.join(
+                os.path.dirname(os.path.abspath(__file__)),
+                'gazebo_models'))
+        manager = EngineManager()
+        manager.add_constraint(**WORKSPACE_CONSTRAINT)
+        manager.add_constraint(**TANGENT_CONSTRAINT)
+
+        engine_config = dict(RANDOM_ENGINE)
+        engine_config['pose_batch_size'] = 5
+        manager.add(**engine_config)
+
+        engine = manager.get('add_random_objects')
+        self.assertIsInstance(engine, RandomPoseEngine)
+
+        models = engine.run()
+        self.assertIsNotNone(models)
+        self.assertEqual(len(models), 2)
+        self.assertFalse(engine.collision_checker.check_for_collisions())
+
     def test_run_fixed_pose_engine(self):
         add_custom_gazebo_resource_path(
             os.path.join(
@@ -192,6 +216,47 @@ class TestEnginesConstraintsManagers(unittest.TestCase):
         self.assertEqual(np.sum(models[0].pose.position), 0)
         self.assertEqual(np.sum(models[0].pose.quat[0:3]), 0)
 
+    def test_workspace_geometry_cache(self):
+        workspace = WorkspaceConstraint(
+            geometry_type='area',
+            points=[[-2, -2, 0], [2, -2, 0], [2, 2, 0], [-2, 2, 0]],
+            holes=[dict(type='circle', center=[0, 0, 0], radius=0.5)])
+        geo = workspace.get_geometry()
+        self.assertIs(geo, workspace.get_geometry())
+        self.assertAlmostEqual(geo.area, 16 - np.pi * 0.25, places=1)
+
+        self.assertTrue(workspace.contains_point([1, 1]))
+        self.assertFalse(workspace.contains_point([0, 0]))
+        self.assertTrue(workspace.contains_points([[1, 1], [-1, -1]]))
+        self.assertFalse(workspace.contains_points([[1, 1], [0, 0]]))
+        self.assertTrue(workspace.contains_points([Point(1, 1)]))
+        self.assertTrue(workspace.contains_polygons([box(1, 1, 1.5, 1.5)]))
+        self.assertFalse(workspace.contains_polygons([box(1, 1, 3, 3)]))
+
+        mesh = trimesh.creation.box(extents=[0.5, 0.5, 0.5])
+        transform = np.eye(4)
+        transform[0:2, 3] = [1, 1]
+        self.assertTrue(workspace.contains_mesh(mesh, transform))
+        transform[0:2, 3] = [0, 0]
+        self.assertFalse(workspace.contains_mesh(mesh, transform))
+
+        # Changing the pose or the holes updates the geometry
+        workspace.pose = [10, 0, 0, 0, 0, 0]
+        self.assertTrue(workspace.contains_point([11, 1]))
+        self.assertFalse(workspace.contains_point([1, 1]))
+        workspace.pose.x = 0
+        self.assertTrue(workspace.contains_point([1, 1]))
+        workspace.add_hole(type='circle', center=[1, 1, 0], radius=0.5)
+        self.assertFalse(workspace.contains_point([1, 1]))
+
+        copied = deepcopy(workspace)
+        self.assertFalse(copied.contains_point([1, 1]))
+        self.assertTrue(copied.contains_point([-1, -1]))
+        for _ in range(20):
+            self.assertTrue(
+                workspace.contains_point(
+                    workspace.get_random_position().coords[0]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -25,6 +25,9 @@ from pcg_gazebo.simulation import add_custom_gazebo_resource_path, \
     SimulationModel
 from pcg_gazebo.simulation.properties import Heightmap
 from pcg_gazebo.generators import HeightmapGenerator
+from pcg_gazebo.generators.gradient_noise import generate_noise_image, \
+    get_permutation_table, fbm_noise
+from pcg_gazebo import random
 from pcg_gazebo.generators.biomes import Biome, WhittakerBiome
 
 CUR_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -369,6 +372,63 @@ class TestHeightmap(unittest.TestCase):
                 self.assertTrue(normal.endswith('.png'))
                 os.remove(paths['normal'])
 
+    def test_heightmap_as_mesh(self):
+        image = np.zeros((3, 5), dtype=np.uint8)
+        image[1, 2] = 255
+        heightmap = Heightmap(size=[4, 2, 1], pos=[1, 0, 0], image=image)
+
+        mesh = heightmap.mesh.mesh
+        self.assertEqual(mesh.vertices.shape, (15, 3))
+        self.assertEqual(mesh.faces.shape, (2 * 2 * 4, 3))
+        self.assertTrue(np.allclose(mesh.bounds, [[-1, -1, 0], [3, 1, 1]]))
+        self.assertTrue(np.allclose(mesh.vertices[7], [1, 0, 1]))
+        self.assertTrue(np.all(heightmap.mesh.mesh.face_normals[:, 2] > 0))
+
+        # The mesh is cached until the heightmap changes
+        self.assertIs(heightmap.mesh, heightmap.mesh)
+        heightmap.position = [0, 0, 2]
+        self.assertTrue(np.allclose(
+            heightmap.mesh.mesh.bounds, [[-2, -1, 2], [2, 1, 3]]))
+        heightmap.size = [4, 2, 3]
+        self.assertTrue(np.allclose(
+            heightmap.mesh.mesh.bounds, [[-2, -1, 2], [2, 1, 5]]))
+        heightmap.image = np.zeros((3, 5))
+        self.assertTrue(np.allclose(
+            heightmap.mesh.mesh.bounds, [[-2, -1, 2], [2, 1, 2]]))
+
+    def test_gradient_noise(self):
+        perm = get_permutation_table(seed=2)
+        x = np.linspace(0, 10, 101)
+        y = np.linspace(5, 15, 51)
+        grid_x, grid_y = np.meshgrid(x, y, indexing='ij')
+        for noise_type in ['perlin', 'simplex']:
+            noise = fbm_noise(
+                x, y, perm, octaves=3, noise_type=noise_type, grid=True)
+            self.assertEqual(noise.shape, (101, 51))
+            self.assertLessEqual(np.abs(noise).max(), 1)
+            self.assertTrue(np.allclose(noise, fbm_noise(
+                grid_x, grid_y, perm, octaves=3, noise_type=noise_type),
+                atol=1e-4))
+
+            image = generate_noise_image(
+                [65, 33], scale=8, octaves=4, noise_type=noise_type,
+                seed=3)
+            self.assertEqual(image.shape, (65, 33))
+            self.assertEqual(image.dtype, np.uint8)
+            self.assertEqual(image.min(), 0)
+            self.assertEqual(image.max(), 255)
+            # The tiling does not change the output
+            self.assertTrue(np.array_equal(image, generate_noise_image(
+                [65, 33], scale=8, octaves=4, noise_type=noise_type,
+                seed=3, tile_size=10, n_processes=2)))
+
+        hg = HeightmapGenerator(image_size=[33, 33])
+        random.init_random_state(4)
+        ref = hg.get_perlin_noise(8.0, 2)
+        random.init_random_state(4)
+        self.assertTrue(np.array_equal(ref, hg.get_perlin_noise(8.0, 2)))
+        self.assertFalse(np.array_equal(ref, hg.get_perlin_noise(8.0, 2)))
+
 
 if __name__ == '__main__':
     unittest.main()
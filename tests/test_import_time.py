@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# Copyright (c) 2020 - The Procedural Generation for Gazebo authors
+# For information on the respective copyright owner see the NOTICE file
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+import os
+import sys
+import json
+import subprocess
+import pcg_gazebo
+
+HEAVY_MODULES = [
+    'bokeh',
+    'jinja2',
+    'matplotlib',
+    'networkx',
+    'noise',
+    'scipy',
+    'shapely',
+    'skimage',
+    'trimesh'
+]
+
+IMPORT_SCRIPT = '''
+import json
+import sys
+import time
+start = time.time()
+import {module}
+elapsed = time.time() - start
+print(json.dumps(dict(
+    elapsed=elapsed,
+    modules=sorted(set(m.split('.')[0] for m in sys.modules)))))
+'''
+
+
+def import_module(module):
+    # Each import is measured in a new interpreter, so that it is not
+    # affected by the modules already loaded by the test runner
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(os.path.abspath(
+            pcg_gazebo.__file__)))] +
+        [p for p in env.get('PYTHONPATH', '').split(os.pathsep) if p])
+    output = subprocess.check_output(
+        [sys.executable, '-c', IMPORT_SCRIPT.format(module=module)],
+        env=env)
+    return json.loads(output.decode('utf-8').strip().split('\n')[-1])
+
+
+class TestImportTime(unittest.TestCase):
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     'Lazy imports require Python 3.7 or later')
+    def test_import_package(self):
+        result = import_module('pcg_gazebo')
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, result['modules'])
+        self.assertLess(result['elapsed'], 0.5)
+
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     'Lazy imports require Python 3.7 or later')
+    def test_import_parsers(self):
+        for module in ['pcg_gazebo.parsers.sdf',
+                       'pcg_gazebo.parsers.urdf',
+                       'pcg_gazebo.parsers.sdf_config']:
+            result = import_module(module)
+            for heavy_module in HEAVY_MODULES:
+                self.assertNotIn(heavy_module, result['modules'])
+            # The target is 200 ms, the limit allows for slower machines
+            self.assertLess(result['elapsed'], 1.0)
+
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     'Lazy imports require Python 3.7 or later')
+    def test_import_subpackages(self):
+        # Subpackages must not depend on the order in which the package
+        # root used to import them
+        for module in ['pcg_gazebo.collection_managers',
+                       'pcg_gazebo.generators.engines',
+                       'pcg_gazebo.generators.item_pickers',
+                       'pcg_gazebo.generators.rules',
+                       'pcg_gazebo.task_manager']:
+            import_module(module)
+
+    def test_lazy_attributes(self):
+        from pcg_gazebo import Path, simulation, parsers
+        self.assertIs(Path, pcg_gazebo.path.Path)
+        self.assertTrue(hasattr(simulation, 'World'))
+        self.assertTrue(hasattr(parsers, 'parse_sdf'))
+        self.assertIn('generators', dir(pcg_gazebo))
+        with self.assertRaises(AttributeError):
+            pcg_gazebo.invalid_submodule
+
+
+if __name__ == '__main__':
+    unittest.main()
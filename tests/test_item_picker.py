@@ -90,6 +90,55 @@ class TestItemPicker(unittest.TestCase):
             temp_counter += counter[tag]
         self.assertEqual(temp_counter, total_items)
 
+    def test_roulette_picker_selections(self):
+        if sys.version_info.major == 2:
+            return
+        random.init_random_state(0)
+        fitness = dict(a=1, b=2, c=3, d=4)
+        picker = create_picker(
+            tag='roulette',
+            items=list(fitness.keys()),
+            max_num=None,
+            fitness=fitness)
+
+        n_selections = 20000
+        selections = picker.get_selections(n_selections)
+        self.assertEqual(len(selections), n_selections)
+        for tag in fitness:
+            self.assertEqual(picker.get_counter(tag), selections.count(tag))
+            self.assertAlmostEqual(
+                selections.count(tag) / float(n_selections),
+                fitness[tag] / 10.0, delta=0.02)
+
+        # Items that reached their maximum number are not selected
+        # even if they hold most of the probability mass
+        picker = create_picker(
+            tag='roulette',
+            items=['a', 'b'],
+            max_num=dict(a=1, b=None),
+            fitness=dict(a=1e9, b=1))
+        selections = picker.get_selections(10)
+        self.assertEqual(selections.count('a'), 1)
+        self.assertEqual(selections.count('b'), 9)
+
+        max_num = dict(a=2, b=3, c=1)
+        picker = create_picker(
+            tag='roulette',
+            items=list(max_num.keys()),
+            max_num=max_num,
+            fitness=dict(a=1, b=10, c=100))
+        selections = picker.get_selections(100)
+        self.assertEqual(len(selections), 6)
+        for tag in max_num:
+            self.assertEqual(selections.count(tag), max_num[tag])
+        self.assertIsNone(picker.get_selection())
+        self.assertEqual(picker.get_selections(5), list())
+
+        picker.reset()
+        self.assertEqual(len(picker.get_selections(100)), 6)
+        picker.add_item('d', fitness=5, max_num=2)
+        self.assertEqual(picker.get_selections(100), ['d', 'd'])
+
     def test_size_picker(self):
         if sys.version_info.major == 2:
             return
@@ -13,9 +13,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import gc
 import os
+import shutil
+import tempfile
 import unittest
+import numpy as np
+from copy import deepcopy
 from pcg_gazebo.collection_managers import MeshManager
+from pcg_gazebo.simulation.properties import Mesh
 from pcg_gazebo.utils import generate_random_string
 from pcg_gazebo import random
 
@@ -230,6 +236,123 @@ class TestMeshManager(unittest.TestCase):
             mesh_manager.add(filename=os.path.join(CWD, 'meshes', 'cube.stl')),
             tag_2)
 
+    def test_mesh_indexes(self):
+        mesh_manager = MeshManager.get_instance()
+        mesh_manager.reset()
+
+        tags = [mesh_manager.add(type='sphere', radius=1 + i)
+                for i in range(100)]
+        self.assertEqual(len(set(tags)), 100)
+        self.assertEqual(tags[0], 'mesh_0')
+        for i, tag in enumerate(tags):
+            self.assertEqual(
+                mesh_manager.find_by_parameters(type='sphere', radius=1 + i),
+                tag)
+        # Equal parameters with different types share the same mesh
+        tag = mesh_manager.add(tag='box', type='box', size=[1, 2, 3])
+        self.assertEqual(
+            mesh_manager.add(type='box', size=np.array([1.0, 2.0, 3.0])),
+            tag)
+        self.assertIsNone(
+            mesh_manager.find_by_parameters(type='box', size=[2, 1, 3]))
+
+        # Primitive meshes are generated once and copies are returned
+        mesh = mesh_manager.get(tag='box')
+        self.assertTrue(np.allclose(mesh.extents, [1, 2, 3]))
+        mesh.apply_scale(2)
+        self.assertIsNot(mesh, mesh_manager.get(tag='box'))
+        self.assertTrue(
+            np.allclose(mesh_manager.get(tag='box').extents, [1, 2, 3]))
+
+        # Tags are not reused after an element is removed
+        self.assertTrue(mesh_manager.remove(tags[-1]))
+        self.assertIsNone(
+            mesh_manager.find_by_parameters(type='sphere', radius=100))
+        self.assertNotIn(
+            mesh_manager.add(type='sphere', radius=100), tags)
+
+        filename = os.path.join(CWD, 'meshes', 'monkey.stl')
+        tag = mesh_manager.add(filename=filename)
+        self.assertEqual(mesh_manager.find_by_filename(filename), tag)
+        self.assertEqual(mesh_manager.add(filename=filename), tag)
+        self.assertIsNotNone(mesh_manager.get(filename=filename))
+        self.assertTrue(mesh_manager.remove(tag))
+        self.assertIsNone(mesh_manager.find_by_filename(filename))
+
+    def test_mesh_store(self):
+        mesh_manager = MeshManager.get_instance()
+        mesh_manager.reset()
+        memory_budget = mesh_manager.memory_budget
+        cache_dir = tempfile.mkdtemp()
+        mesh_manager.cache_dir = cache_dir
+        try:
+            filenames = [
+                os.path.join(CWD, 'meshes', name)
+                for name in ['monkey.stl', 'cube.stl', 'monkey.dae']]
+            tags = [mesh_manager.add(filename=f) for f in filenames]
+            arrays = list()
+            for tag in tags:
+                mesh = mesh_manager.get(tag=tag)
+                arrays.append((mesh.vertices.copy(), mesh.faces.copy()))
+            del mesh
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+            # Only the most recently used meshes are kept in memory
+            mesh_manager.memory_budget = 100000
+            self.assertLessEqual(mesh_manager.memory_usage, 100000)
+            self.assertGreater(mesh_manager.memory_usage, 0)
+
+            # Evicted meshes are reloaded from the disk cache
+            for tag, (vertices, faces) in zip(tags, arrays):
+                loaded = mesh_manager.get(tag=tag)
+                self.assertTrue(np.allclose(loaded.vertices, vertices))
+                self.assertTrue(np.array_equal(loaded.faces, faces))
+                self.assertLessEqual(mesh_manager.memory_usage, 100000)
+
+            mesh_manager.clear_disk_cache()
+            self.assertEqual(len(os.listdir(cache_dir)), 0)
+        finally:
+            mesh_manager.memory_budget = memory_budget
+            mesh_manager.cache_dir = None
+            mesh_manager.reset()
+            shutil.rmtree(cache_dir)
+
+    def test_mesh_store_shared_meshes(self):
+        mesh_manager = MeshManager.get_instance()
+        mesh_manager.reset()
+        memory_budget = mesh_manager.memory_budget
+        cache_dir = tempfile.mkdtemp()
+        mesh_manager.cache_dir = cache_dir
+        try:
+            mesh_manager.memory_budget = 1
+            monkey = Mesh(os.path.join(CWD, 'meshes', 'monkey.stl'))
+            monkey_mesh = monkey.mesh
+            cube = Mesh(os.path.join(CWD, 'meshes', 'cube.stl'))
+            self.assertEqual(
+                mesh_manager.memory_usage,
+                cube.mesh.vertices.nbytes + cube.mesh.faces.nbytes)
+
+            # Evicted meshes still referenced by a mesh property are
+            # reused instead of loaded again
+            other_monkey = Mesh(os.path.join(CWD, 'meshes', 'monkey.stl'))
+            self.assertIs(other_monkey.mesh, monkey_mesh)
+            self.assertIs(monkey.mesh, monkey_mesh)
+            self.assertIs(deepcopy(monkey).mesh, monkey_mesh)
+            self.assertEqual(
+                mesh_manager.memory_usage,
+                monkey_mesh.vertices.nbytes + monkey_mesh.faces.nbytes)
+
+            # Meshes without references are released
+            cube_tag = cube.tag
+            del cube
+            gc.collect()
+            self.assertNotIn(cube_tag, mesh_manager._evicted_meshes)
+        finally:
+            mesh_manager.memory_budget = memory_budget
+            mesh_manager.cache_dir = None
+            mesh_manager.reset()
+            shutil.rmtree(cache_dir)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -17,7 +17,9 @@ import os
 import sys
 import unittest
 import numpy as np
-from pcg_gazebo.simulation.properties import Mesh
+import trimesh
+from pcg_gazebo.simulation.properties import Mesh, Pose
+from pcg_gazebo.transformations import quaternion_matrix
 
 
 CUR_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -130,6 +132,29 @@ class TestSimulationObjectProperties(unittest.TestCase):
         self.assertIsNotNone(mesh.mesh, 'Mesh object was not loaded')
         self.assertIsNotNone(mesh.bounds, 'Mesh bounds were not computed')
 
+    def test_mesh_transforms(self):
+        mesh = Mesh(filename=MONKEY_FILENAME_PREFIX + '.stl', load_mesh=True)
+
+        position = [1, 2, 3]
+        rot = quaternion_matrix(Pose.rpy2quat(0.1, 0.2, 0.3))
+        mesh_transforms = mesh.get_mesh_transforms(position, rot)
+        self.assertEqual(len(mesh_transforms), len(mesh.get_meshes()))
+
+        # The meshes in the local frame are shared, no copies are made
+        # when placing the mesh at another pose
+        other_transforms = mesh.get_mesh_transforms(
+            [0, 0, 0], np.eye(4))
+        for (m1, t1), (m2, t2) in zip(mesh_transforms, other_transforms):
+            self.assertIs(m1, m2)
+            self.assertFalse(np.allclose(t1, t2))
+
+        transformed_meshes = mesh.apply_transform(position, rot)
+        for (m, t), transformed in zip(
+                mesh_transforms, transformed_meshes):
+            self.assertTrue(np.allclose(
+                trimesh.transformations.transform_points(m.vertices, t),
+                transformed.vertices))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -14,10 +14,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import unittest
+import os
 import random
+import shutil
+import tempfile
+import yaml
+import numpy as np
+import trimesh
+from shapely.geometry import Point, box as shapely_box
 from pcg_gazebo.generators import WorldGenerator
-from pcg_gazebo.generators.creators import box
-from pcg_gazebo.generators.occupancy import generate_occupancy_grid
+from pcg_gazebo.generators.creators import box, sphere
+from pcg_gazebo.generators.occupancy import generate_occupancy_grid, \
+    get_occupancy_executor, close_occupancy_executor, get_occupied_area, \
+    rasterize_occupancy_grid, store_occupancy_grid, get_model_footprint, \
+    get_footprints_cache_info, clear_footprints_cache
 
 
 STATIC_CYL = dict(
@@ -186,6 +196,164 @@ class TestOccupancyGrid(unittest.TestCase):
 
             del world_gen
 
+    def test_occupied_area_interior_polygons(self):
+        box_mesh = trimesh.creation.box(extents=[1, 2, 1])
+        annulus_mesh = trimesh.creation.annulus(
+            r_min=0.5, r_max=1, height=1, sections=64)
+        annulus_area = np.pi * (1 - 0.25)
+
+        for n_rays in [8, 360]:
+            footprint = get_occupied_area(box_mesh, n_rays=n_rays)
+            self.assertAlmostEqual(footprint.area, 2, delta=0.02)
+
+            # The hole of the annulus must not be part of the footprint
+            footprint = get_occupied_area(annulus_mesh, n_rays=n_rays)
+            self.assertAlmostEqual(footprint.area, annulus_area, delta=0.05)
+            self.assertFalse(footprint.contains(Point(0, 0)))
+
+    def test_occupancy_executor(self):
+        models = dict()
+        for i in range(3):
+            model = box(
+                size=[0.5, 0.5, 0.5],
+                mass=1,
+                name='box_{}'.format(i))
+            model.pose = [2 * i, 0, 0.25, 0, 0, 0]
+            models[model.name] = model
+        models['box_0'].static = True
+
+        pool = get_occupancy_executor(2)
+        self.assertEqual(get_occupancy_executor(), pool)
+        self.assertEqual(get_occupancy_executor(2), pool)
+
+        for _ in range(2):
+            occupancy_output = generate_occupancy_grid(models, n_processes=2)
+            self.assertIsNotNone(occupancy_output)
+            self.assertEqual(list(occupancy_output['static'].keys()),
+                             ['box_0'])
+            self.assertEqual(
+                sorted(occupancy_output['non_static'].keys()),
+                ['box_1', 'box_2'])
+            for tag in occupancy_output['non_static']:
+                self.assertAlmostEqual(
+                    occupancy_output['non_static'][tag].area, 0.25,
+                    places=2)
+            # The pool is reused between calls
+            self.assertEqual(get_occupancy_executor(), pool)
+
+        self.assertNotEqual(get_occupancy_executor(1), pool)
+        close_occupancy_executor()
+
+    def test_rasterize_occupancy_grid(self):
+        occupancy_output = dict(
+            static=dict(
+                disk=Point(1, 1).buffer(0.5),
+                ring=Point(3, 1).buffer(0.5).difference(
+                    Point(3, 1).buffer(0.25))),
+            non_static=dict(box=shapely_box(1.5, 2.5, 2, 3)),
+            ground_plane=shapely_box(0, 0, 4, 3))
+
+        grid, origin = rasterize_occupancy_grid(
+            occupancy_output,
+            resolution=0.02,
+            x_limits=[-1, 5],
+            y_limits=[-1, 4])
+        self.assertEqual(grid.dtype, np.uint8)
+        self.assertEqual(grid.shape, (250, 300))
+        self.assertEqual(origin, [-1, -1])
+        self.assertEqual(sorted(np.unique(grid)), [0, 128, 255])
+
+        # Compare the cells with the footprints at the cell centers
+        xs = origin[0] + (np.arange(grid.shape[1]) + 0.5) * 0.02
+        ys = origin[1] + (grid.shape[0] - np.arange(grid.shape[0]) - 0.5) \
+            * 0.02
+        for i in range(0, grid.shape[0], 7):
+            for j in range(0, grid.shape[1], 7):
+                point = Point(xs[j], ys[i])
+                if any([occupancy_output['static'][tag].contains(point)
+                        for tag in occupancy_output['static']]):
+                    self.assertEqual(grid[i, j], 0)
+                elif occupancy_output['ground_plane'].contains(point):
+                    self.assertEqual(grid[i, j], 255)
+                else:
+                    self.assertEqual(grid[i, j], 128)
+
+        # Non-static footprints and map limits from the footprints
+        grid, origin = rasterize_occupancy_grid(
+            occupancy_output,
+            resolution=0.1,
+            static_models_only=False,
+            with_ground_plane=False,
+            margin=0)
+        self.assertEqual(grid.shape, (25, 30))
+        self.assertEqual(origin, [0.5, 0.5])
+        self.assertEqual(sorted(np.unique(grid)), [0, 255])
+        self.assertEqual(np.sum(grid[:5, 10:15] == 0), 25)
+
+        output_dir = tempfile.mkdtemp()
+        try:
+            self.assertTrue(store_occupancy_grid(
+                grid, origin, 0.1, output_dir, 'map.pgm'))
+            with open(os.path.join(output_dir, 'map.pgm'), 'rb') as f:
+                self.assertEqual(f.readline(), b'P5\n')
+                self.assertEqual(f.readline(), b'30 25\n')
+                self.assertEqual(f.readline(), b'255\n')
+                image = np.frombuffer(f.read(), dtype=np.uint8)
+            self.assertTrue(np.array_equal(image.reshape(grid.shape), grid))
+
+            with open(os.path.join(output_dir, 'map.yaml'), 'r') as f:
+                map_info = yaml.safe_load(f)
+            self.assertEqual(map_info['image'], 'map.pgm')
+            self.assertAlmostEqual(map_info['resolution'], 0.1)
+            self.assertEqual(map_info['origin'], [0.5, 0.5, 0.0])
+        finally:
+            shutil.rmtree(output_dir)
+
+    def test_footprints_cache(self):
+        clear_footprints_cache()
+        model = box(size=[1, 2, 0.5], name='box')
+        for i in range(10):
+            model.pose = [
+                random.uniform(-5, 5),
+                random.uniform(-5, 5),
+                random.uniform(0, 2),
+                0,
+                0,
+                random.uniform(-np.pi, np.pi)]
+            footprint = model.get_footprint()['box']
+            expected = get_occupied_area(model.get_meshes('collision'))
+            self.assertAlmostEqual(footprint.area, 2, delta=0.05)
+            self.assertLess(
+                footprint.symmetric_difference(expected).area, 1e-3)
+
+        info = get_footprints_cache_info()
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['hits'], 9)
+        self.assertEqual(info['size'], 1)
+
+        # Roll and pitch change the footprint
+        model.pose = [0, 0, 1, np.pi / 2, 0, 0]
+        footprint = get_model_footprint(model)
+        self.assertAlmostEqual(footprint.area, 0.5, delta=0.05)
+        self.assertEqual(get_footprints_cache_info()['misses'], 2)
+
+        # Z limits are given in the world frame
+        model = sphere(mass=1, radius=0.5, name='sphere')
+        model.pose = [1, 0, 2, 0, 0, 0]
+        footprint = get_model_footprint(model)
+        self.assertAlmostEqual(footprint.area, np.pi * 0.25, delta=0.02)
+        footprint = get_model_footprint(model, z_limits=[2.3, 2.6])
+        self.assertAlmostEqual(footprint.area, np.pi * 0.16, delta=0.02)
+        self.assertAlmostEqual(footprint.centroid.x, 1, delta=1e-3)
+        model.pose = [1, 0, 5, 0, 0, 0]
+        self.assertIsNone(get_model_footprint(model, z_limits=[2.3, 2.6]))
+
+        clear_footprints_cache()
+        info = get_footprints_cache_info()
+        self.assertEqual(info['size'], 0)
+        self.assertEqual(info['hits'], 0)
+        self.assertEqual(info['misses'], 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -16,11 +16,17 @@
 import unittest
 import random
 import os
+import inspect
+import shutil
+import tempfile
+import xmltodict
+from time import time
+import pcg_gazebo.parsers.sdf
 from pcg_gazebo.utils import generate_random_string
-from pcg_gazebo.parsers import parse_sdf
-from pcg_gazebo.parsers.sdf import create_sdf_element
+from pcg_gazebo.parsers import parse_sdf, convert_to_dict, _iterparse_xml
+from pcg_gazebo.parsers.sdf import create_sdf_element, create_sdf_type
 from pcg_gazebo.parsers.types import XMLScalar, XMLVector, XMLString, \
-    XMLInteger, XMLBoolean
+    XMLInteger, XMLBoolean, XMLBase
 
 CUR_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -287,6 +293,86 @@ class TestParseSDF(unittest.TestCase):
                 sdf.world,
                 'No world element was parsed from file {}'.format(world_file))
 
+    def test_sdf_element_classes_lookup(self):
+        def find_sdf_type(tag):
+            # Linear search over the module's members
+            for _, obj in inspect.getmembers(pcg_gazebo.parsers.sdf):
+                if inspect.isclass(obj) and issubclass(obj, XMLBase):
+                    if tag == obj._NAME and obj._TYPE == 'sdf':
+                        return obj
+            return None
+
+        tags = [
+            obj._NAME for _, obj in inspect.getmembers(pcg_gazebo.parsers.sdf)
+            if inspect.isclass(obj) and issubclass(obj, XMLBase) and
+            obj._TYPE == 'sdf']
+        tags.append(generate_random_string(5))
+
+        for tag in tags:
+            self.assertEqual(create_sdf_type(tag), find_sdf_type(tag))
+
+        world_file = os.path.join(CUR_DIR, 'worlds', 'cafe_gazebo_9_13.world')
+        with open(world_file, 'r') as f:
+            world_str = f.read()
+        world_tags = [tag for tag in tags if '<{}'.format(tag) in world_str]
+        self.assertGreater(len(world_tags), 0)
+
+        start = time()
+        for tag in world_tags:
+            find_sdf_type(tag)
+        search_time = time() - start
+
+        start = time()
+        for tag in world_tags:
+            create_sdf_type(tag)
+        lookup_time = time() - start
+        self.assertLess(lookup_time, search_time)
+
+        sdf = parse_sdf(world_file)
+        self.assertIsNotNone(sdf.world)
+
+    def test_streaming_parser(self):
+        xml_files = list()
+        for folder in ['sdf', 'worlds']:
+            for item in sorted(os.listdir(os.path.join(CUR_DIR, folder))):
+                if item.endswith('.sdf') or item.endswith('.world'):
+                    xml_files.append(os.path.join(CUR_DIR, folder, item))
+
+        for xml_file in xml_files:
+            with open(xml_file, 'r') as f:
+                xml_str = f.read()
+            try:
+                xml_dict = xmltodict.parse(xml_str)
+            except Exception:
+                # Invalid XML files must fail with both parsers
+                with self.assertRaises(Exception):
+                    _iterparse_xml(xml_file)
+                continue
+            name = list(xml_dict.keys())[0]
+            self.assertEqual(
+                _iterparse_xml(xml_file),
+                (name, convert_to_dict(xml_dict)[name]),
+                'Invalid output for file {}'.format(xml_file))
+
+    def test_export_xml(self):
+        output_dir = tempfile.mkdtemp()
+        world_dir = os.path.join(CUR_DIR, 'worlds')
+        try:
+            for item in sorted(os.listdir(world_dir)):
+                if not item.endswith('.world'):
+                    continue
+                sdf = parse_sdf(os.path.join(world_dir, item))
+                filename = os.path.join(output_dir, item)
+                sdf.export_xml(filename)
+
+                with open(filename, 'r') as f:
+                    self.assertEqual(
+                        f.read(),
+                        '<?xml version="1.0" ?>\n' +
+                        sdf.to_xml_as_str(pretty_print=True))
+        finally:
+            shutil.rmtree(output_dir)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -14,7 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import unittest
-from pcg_gazebo.utils import is_scalar, is_array, is_integer
+import numpy as np
+from shapely.geometry import Point, box
+from pcg_gazebo.utils import is_scalar, is_array, is_integer, \
+    get_random_point_from_shape, get_random_points_from_shape
 from pcg_gazebo import random
 
 
@@ -105,6 +108,39 @@ class TestRandom(unittest.TestCase):
             self.assertGreaterEqual(item, -5)
             self.assertLessEqual(item, 5)
 
+    def test_random_state(self):
+        random.init_random_state(10)
+        state = random.get_state()
+        ref = random.rand(5)
+        random.rand(3)
+        random.set_state(state)
+        self.assertTrue(np.array_equal(ref, random.rand(5)))
+
+    def test_random_points_from_shape(self):
+        # L-shaped corridor with a separate square
+        geo = box(0, 0, 20, 0.5).union(box(0, 0, 0.5, 20)).union(
+            box(10, 10, 12, 12))
+
+        point = get_random_point_from_shape(geo)
+        self.assertEqual(len(point), 2)
+        self.assertTrue(geo.intersects(Point(point)))
+
+        points = get_random_points_from_shape(geo, 20000)
+        self.assertEqual(points.shape, (20000, 2))
+        for point in points[:500]:
+            self.assertTrue(geo.intersects(Point(point)))
+
+        # Points are uniformly distributed over the area
+        in_square = np.mean((points[:, 0] >= 10) & (points[:, 1] >= 10))
+        self.assertAlmostEqual(in_square, 4 / geo.area, delta=0.01)
+
+        # Points are generated with the seeded random state
+        random.init_random_state(10)
+        ref = get_random_points_from_shape(geo, 5)
+        random.init_random_state(10)
+        self.assertTrue(
+            np.array_equal(ref, get_random_points_from_shape(geo, 5)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -15,7 +15,15 @@
 # limitations under the License.
 import unittest
 import os
+import shutil
+import tempfile
+from unittest import mock
 from pcg_gazebo import Path
+from pcg_gazebo.path import clear_path_cache, _PATH_CACHE
+from pcg_gazebo.simulation import add_custom_gazebo_resource_path, \
+    load_gazebo_models
+from pcg_gazebo.utils import ROS1_AVAILABLE, get_ros_path, \
+    get_ros_packages
 
 CWD = os.path.dirname(os.path.abspath(__file__))
 
@@ -118,6 +126,89 @@ class TestResolvePaths(unittest.TestCase):
             p = Path(uri)
             self.assertFalse(p.is_valid)
 
+    def test_resolved_uris_cache(self):
+        add_custom_gazebo_resource_path(os.path.join(CWD, 'gazebo_models'))
+        load_gazebo_models()
+        clear_path_cache()
+        absolute_uri = os.path.join(CWD, 'meshes', 'cube.dae')
+        uris = [
+            'file://' + absolute_uri,
+            'model://test_joint_fixed/model.sdf',
+            absolute_uri
+        ]
+        for uri in uris:
+            self.assertTrue(Path(uri).is_valid)
+        self.assertEqual(len(_PATH_CACHE['uris']), len(uris))
+
+        # Resolved URIs are not resolved again
+        with mock.patch.object(
+                Path, 'resolve_uri', wraps=Path.resolve_uri) as resolve_uri:
+            for _ in range(10):
+                for uri in uris:
+                    p = Path(uri)
+            self.assertEqual(resolve_uri.call_count, 0)
+        self.assertEqual(len(_PATH_CACHE['uris']), len(uris))
+        self.assertEqual(p.absolute_uri, absolute_uri)
+        self.assertIsNone(p.gazebo_model)
+
+        p = Path('model://test_joint_fixed/model.sdf')
+        self.assertEqual(p.gazebo_model, 'test_joint_fixed')
+        self.assertEqual(p.model_uri, 'model://test_joint_fixed/model.sdf')
+
+        # Files removed after being resolved are not valid anymore
+        temp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(temp_dir, 'mesh.stl')
+            open(filename, 'w').close()
+            self.assertTrue(Path('file://' + filename).is_valid)
+            os.remove(filename)
+            self.assertFalse(Path('file://' + filename).is_valid)
+        finally:
+            shutil.rmtree(temp_dir)
+
+        clear_path_cache()
+        self.assertEqual(len(_PATH_CACHE['uris']), 0)
+
+    @unittest.skipIf(not ROS1_AVAILABLE, 'rospkg is not available')
+    def test_ros_packages_index(self):
+        temp_dir = tempfile.mkdtemp()
+        ros_package_path = os.environ.get('ROS_PACKAGE_PATH', None)
+        try:
+            pkg_path = os.path.join(temp_dir, 'pcg_test_pkg')
+            os.makedirs(os.path.join(pkg_path, 'meshes'))
+            with open(os.path.join(pkg_path, 'package.xml'), 'w') as f:
+                f.write(
+                    '<package format="2"><name>pcg_test_pkg</name>'
+                    '<version>0.0.0</version><description>Test'
+                    '</description><maintainer email="a@b.c">a'
+                    '</maintainer><license>Apache</license></package>')
+            filename = os.path.join(pkg_path, 'meshes', 'mesh.stl')
+            open(filename, 'w').close()
+
+            os.environ['ROS_PACKAGE_PATH'] = temp_dir
+            # The index is rebuilt when the environment changes
+            self.assertIn('pcg_test_pkg', get_ros_packages())
+            self.assertEqual(get_ros_path('pcg_test_pkg'), pkg_path)
+
+            for uri in ['package://pcg_test_pkg/meshes/mesh.stl',
+                        '$(find pcg_test_pkg)/meshes/mesh.stl',
+                        'file://' + filename]:
+                p = Path(uri)
+                self.assertEqual(p.absolute_uri, filename)
+                self.assertEqual(p.ros_package, 'pcg_test_pkg')
+                self.assertEqual(
+                    p.package_uri,
+                    'package://pcg_test_pkg/meshes/mesh.stl')
+        finally:
+            if ros_package_path is None:
+                del os.environ['ROS_PACKAGE_PATH']
+            else:
+                os.environ['ROS_PACKAGE_PATH'] = ros_package_path
+            shutil.rmtree(temp_dir)
+        self.assertIsNone(get_ros_path('pcg_test_pkg'))
+        self.assertFalse(
+            Path('package://pcg_test_pkg/meshes/mesh.stl').is_valid)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3404,6 +3404,29 @@ class TestSDFParser(unittest.TestCase):
                 obj.reset(with_optional_elements=True)
                 self.assertTrue(obj.is_valid())
 
+    def test_transfer_child_element(self):
+        model = create_sdf_element('model')
+
+        # Child elements are copied by default
+        link = create_sdf_element('link')
+        link_name = link.name
+        model.add_link('link_1', link)
+        self.assertIsNot(model.links[0], link)
+        self.assertEqual(link.name, link_name)
+
+        # Transferred elements are adopted without a copy
+        link = create_sdf_element('link')
+        link.add_collision('collision')
+        model.add_link('link_2', link.transfer())
+        self.assertIs(model.get_link_by_name('link_2'), link)
+        self.assertEqual(len(link.collisions), 1)
+
+        # The ownership transfer is only valid once
+        other_model = create_sdf_element('model')
+        other_model.add_link('link_3', link)
+        self.assertIsNot(other_model.links[0], link)
+        self.assertEqual(model.get_link_by_name('link_2'), link)
+
 
 if __name__ == '__main__':
     unittest.main()
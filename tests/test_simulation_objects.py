@@ -19,12 +19,18 @@ import numpy as np
 from random import random, choice, randint
 import shutil
 import getpass
+import tempfile
+from time import time
+import pcg_gazebo.simulation
 from pcg_gazebo.utils import generate_random_string
 from pcg_gazebo.simulation import load_gazebo_models, get_gazebo_model_sdf, \
     get_gazebo_model_names, get_gazebo_model_path, \
-    get_gazebo_model_sdf_filenames
+    get_gazebo_model_sdf_filenames, is_gazebo_model, \
+    clear_gazebo_model_templates_cache, \
+    get_gazebo_model_templates_cache_info, \
+    set_gazebo_model_templates_cache_size
 from pcg_gazebo.simulation import Box, Cylinder, Sphere, Joint, \
-    SimulationModel
+    SimulationModel, add_custom_gazebo_resource_path
 from pcg_gazebo.simulation.properties import Pose
 from pcg_gazebo.parsers import parse_sdf, parse_sdf_config
 from pcg_gazebo.parsers.urdf import create_urdf_element
@@ -469,6 +475,107 @@ class TestSimulationObjects(unittest.TestCase):
                 get_gazebo_model_path(model_name),
                 'Function should return None for non-existent model')
 
+    def test_gazebo_model_index(self):
+        def create_model(root, name):
+            os.makedirs(os.path.join(root, name))
+            for filename in ['model.config', 'model.sdf']:
+                with open(os.path.join(root, name, filename), 'w') as f:
+                    f.write('')
+
+        root = tempfile.mkdtemp()
+        models_dir = os.path.join(root, 'models')
+        os.makedirs(models_dir)
+        cache_file = pcg_gazebo.simulation.GAZEBO_MODELS_CACHE_FILE
+        pcg_gazebo.simulation.GAZEBO_MODELS_CACHE_FILE = os.path.join(
+            root, 'cache', 'gazebo_models.json')
+        try:
+            create_model(models_dir, 'index_model_1')
+            add_custom_gazebo_resource_path(models_dir)
+            self.assertTrue(
+                is_gazebo_model('index_model_1', include_custom_paths=True))
+            self.assertTrue(os.path.isfile(
+                pcg_gazebo.simulation.GAZEBO_MODELS_CACHE_FILE))
+
+            # Missing models are cached until the index changes
+            self.assertFalse(
+                is_gazebo_model('index_model_2', include_custom_paths=True))
+            self.assertIn(
+                'index_model_2',
+                pcg_gazebo.simulation._GAZEBO_MODELS_INDEX['missing'])
+
+            # Only the modified search path is scanned again
+            scans = pcg_gazebo.simulation._GAZEBO_MODELS_INDEX['scans']
+            unchanged_scans = [
+                scans[folder] for folder in scans if folder != models_dir]
+            create_model(models_dir, 'index_model_2')
+            load_gazebo_models()
+            self.assertIn('index_model_2', get_gazebo_model_names())
+            self.assertNotIn(
+                'index_model_2',
+                pcg_gazebo.simulation._GAZEBO_MODELS_INDEX['missing'])
+            scans = pcg_gazebo.simulation._GAZEBO_MODELS_INDEX['scans']
+            for scan in unchanged_scans:
+                self.assertTrue(
+                    any([scan is scans[folder] for folder in scans]))
+
+            # The index is restored from the cache file
+            pcg_gazebo.simulation._GAZEBO_MODELS_INDEX['scans'] = None
+            load_gazebo_models()
+            self.assertEqual(
+                get_gazebo_model_path('index_model_2'),
+                os.path.join(models_dir, 'index_model_2'))
+
+            shutil.rmtree(os.path.join(models_dir, 'index_model_2'))
+            load_gazebo_models(refresh=True)
+            self.assertNotIn('index_model_2', get_gazebo_model_names())
+        finally:
+            pcg_gazebo.simulation.CUSTOM_GAZEBO_RESOURCE_PATHS.remove(
+                models_dir)
+            pcg_gazebo.simulation.GAZEBO_MODELS_CACHE_FILE = cache_file
+            load_gazebo_models()
+            shutil.rmtree(root)
+
+    def test_gazebo_model_templates_cache(self):
+        add_custom_gazebo_resource_path(
+            os.path.join(CUR_DIR, 'gazebo_models'))
+        clear_gazebo_model_templates_cache()
+
+        model_1 = SimulationModel.from_gazebo_model('test_static_model')
+        model_2 = SimulationModel.from_gazebo_model('test_static_model')
+        info = get_gazebo_model_templates_cache_info()
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['size'], 1)
+
+        # Instances are independent copies of the template
+        self.assertIsNot(model_1, model_2)
+        self.assertEqual(model_1.to_sdf(), model_2.to_sdf())
+        self.assertTrue(model_2.is_gazebo_model)
+        model_1.pose = [1, 2, 3, 0, 0, 0]
+        self.assertNotEqual(model_1.pose, model_2.pose)
+
+        # A modified SDF file is parsed again
+        sdf_filename = os.path.join(
+            get_gazebo_model_path('test_static_model'), 'model.sdf')
+        stat = os.stat(sdf_filename)
+        os.utime(sdf_filename, (stat.st_atime, stat.st_mtime + 1))
+        try:
+            SimulationModel.from_gazebo_model('test_static_model')
+        finally:
+            os.utime(sdf_filename, (stat.st_atime, stat.st_mtime))
+        info = get_gazebo_model_templates_cache_info()
+        self.assertEqual(info['misses'], 2)
+        self.assertEqual(info['size'], 1)
+
+        set_gazebo_model_templates_cache_size(0)
+        try:
+            SimulationModel.from_gazebo_model('test_static_model')
+            info = get_gazebo_model_templates_cache_info()
+            self.assertEqual(info['misses'], 3)
+            self.assertEqual(info['size'], 0)
+        finally:
+            set_gazebo_model_templates_cache_size(128)
+
     def test_model(self):
         pass
 
@@ -958,6 +1065,41 @@ class TestSimulationObjects(unittest.TestCase):
                         name,
                         sdf.name))
 
+    def test_copy_model(self):
+        add_custom_gazebo_resource_path(
+            os.path.join(CUR_DIR, 'gazebo_models'))
+        model = SimulationModel.from_gazebo_model('test_static_model')
+        model.is_ground_plane = True
+
+        model_copy = model.copy()
+        self.assertEqual(model.to_sdf(), model_copy.to_sdf())
+        self.assertTrue(model_copy.is_ground_plane)
+
+        # Poses are not shared between the copies
+        model_copy.pose = [1, 2, 3, 0, 0, 0]
+        model_copy.links[model_copy.link_names[0]].pose.position = [1, 1, 1]
+        self.assertNotEqual(model.to_sdf(), model_copy.to_sdf())
+        self.assertEqual(np.sum(model.pose.position), 0)
+
+        # The mesh data is shared between the copies
+        for mesh, copy_mesh in zip(
+                model.get_mesh_transforms('visual'),
+                model_copy.get_mesh_transforms('visual')):
+            self.assertIs(mesh[0], copy_mesh[0])
+
+        # Benchmark against the copy through the SDF description
+        n_copies = 10
+        start = time()
+        for _ in range(n_copies):
+            SimulationModel.from_sdf(model.to_sdf())
+        sdf_copy_time = time() - start
+
+        start = time()
+        for _ in range(n_copies):
+            model.copy()
+        copy_time = time() - start
+        self.assertLess(copy_time, sdf_copy_time)
+
     def test_export_model_to_sdf(self):
         box = self.create_random_box()
 
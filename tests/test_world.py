@@ -58,6 +58,50 @@ class TestWorld(unittest.TestCase):
         self.assertIsNotNone(free_space_polygon)
         self.assertGreater(free_space_polygon.area, 0)
 
+    def test_free_space_cache(self):
+        walls = extrude(
+            polygon=random_rectangle(
+                delta_x_min=10,
+                delta_y_min=10),
+            extrude_boundaries=True,
+            height=2,
+            thickness=0.1
+        )
+        walls.pose = [0, 0, 1, 0, 0, 0]
+        world = World()
+        world.add_model(tag='walls', model=walls)
+
+        free_space_polygon = world.get_free_space_polygon(
+            ground_plane_models=['walls'],
+            x_limits=[-20, 20],
+            y_limits=[-20, 20])
+        self.assertGreater(free_space_polygon.area, 0)
+
+        # Adding a model that is not part of the ground plane
+        # does not change the free space polygon
+        world.add_model(
+            tag='box',
+            model=box(size=[0.5, 0.5, 0.5], pose=[0, 0, 0.25, 0, 0, 0]))
+        self.assertIs(
+            world.get_free_space_polygon(
+                ground_plane_models=['walls'],
+                x_limits=[-20, 20],
+                y_limits=[-20, 20]),
+            free_space_polygon)
+
+        # Moving the walls invalidates the cached footprints
+        world.model_groups['default'].models['walls'].pose = \
+            [1, 0, 1, 0, 0, 0]
+        moved_free_space_polygon = world.get_free_space_polygon(
+            ground_plane_models=['walls'],
+            x_limits=[-20, 20],
+            y_limits=[-20, 20])
+        self.assertIsNot(moved_free_space_polygon, free_space_polygon)
+        self.assertAlmostEqual(
+            moved_free_space_polygon.bounds[0],
+            free_space_polygon.bounds[0] + 1,
+            places=2)
+
     def test_find_random_spots(self):
         walls = extrude(
             polygon=random_rectangle(